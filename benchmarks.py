@@ -0,0 +1,327 @@
+"""
+Canadian Election Simulator - Benchmark Suite
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+This module times the simulation and rendering hot paths without network access, records the results
+as JSON together with a description of the machine, and compares them against a stored baseline.
+
+Usage:
+    python benchmarks.py                              # run everything, compare to the baseline if one exists
+    python benchmarks.py --save-baseline              # store this run as the new baseline
+    python benchmarks.py --only run_simulation --threshold 0.5 --threshold make_choropleth=1.0
+"""
+
+import argparse
+import html
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from config import SEATS_BY_PROVINCE, BENCHMARK_BASELINE_PATH, BENCHMARK_RESULTS_PATH, BENCHMARK_THRESHOLD
+
+# Trial counts at which run_simulation is timed, per engine
+SIMULATION_TRIALS = {"vectorized": [1000, 10000], "tree": [100]}
+
+# Trial count at which every variance-reduction sampling method of run_simulation is timed
+SAMPLING_TRIALS = 250
+
+# Grid of the parameter sweep benchmark
+SWEEP_GRID_MARGINS = [0.01, 0.02, 0.03, 0.04, 0.05]
+SWEEP_GRID_INFLUENCE_FACTORS = [0.0, 0.1, 0.2, 0.3, 0.4]
+
+# Matches a province heading and the aria-label of its chart in the poll tracker markup
+_FIXTURE_ENTRY = re.compile(r'BreakDownsChartHeading">([^<]*)<.*?aria-label="([^"]*)"', re.DOTALL)
+
+
+def synthetic_polls(seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """
+    Generate reproducible polling data for every province.
+
+    Args:
+        seed (int, optional): Seed of the generator. Defaults to 0.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Polling data by province, each summing to 1
+    """
+    from scraper import PARTIES
+
+    rng = np.random.default_rng(seed)
+    polls = {}
+    for province in SEATS_BY_PROVINCE:
+        parties = [p for p in PARTIES if p != "BQ" or province == "Quebec"]
+        shares = rng.dirichlet(np.linspace(8.0, 1.0, len(parties)))
+        polls[province] = dict(zip(parties, shares.tolist()))
+    return polls
+
+
+def fixture_polls() -> Dict[str, Dict[str, float]]:
+    """
+    Read the polling data in the offline poll tracker fixture, without launching a browser.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Polling data by province
+    """
+    from scraper import FIXTURE_PATH, parse_province_entry
+
+    markup = FIXTURE_PATH.read_text(encoding="utf-8")
+    polls = {}
+    for heading, aria_label in _FIXTURE_ENTRY.findall(markup):
+        entry = parse_province_entry(html.unescape(heading), html.unescape(aria_label))
+        if entry is not None:
+            polls[entry[0]] = entry[1]
+    return polls
+
+
+def build_benchmarks(polls: Dict[str, Dict[str, float]]) -> Dict[str, Callable[[], Any]]:
+    """
+    Prepare the inputs of every benchmark and return the timed calls.
+
+    Args:
+        polls (Dict[str, Dict[str, float]]): Polling data by province
+
+    Returns:
+        Dict[str, Callable[[], Any]]: Zero-argument function of each benchmark, by name
+    """
+    import pandas as pd
+    from data_loader import clean_and_merge, discover_election_files, load_historical_data
+    from election_model import run_simulation, simulate_trial_range, simulate_single_seat, adjust_polling_graph
+    from graph import build_historical_voter_graph, make_voter_graph_figure
+    from incremental_simulation import IncrementalSimulator
+    from parameter_sweep import run_parameter_sweep
+    from visualization import make_choropleth
+
+    elections = load_historical_data()
+    voter_graph = build_historical_voter_graph(*elections)
+    latest_csv = pd.read_csv(list(discover_election_files().values())[-1], index_col=0)
+    ontario = polls["Ontario"]
+
+    benchmarks = {}
+    for engine, trial_counts in SIMULATION_TRIALS.items():
+        for trials in trial_counts:
+            benchmarks[f"run_simulation[{engine},{trials}]"] = (
+                lambda e=engine, t=trials: run_simulation(polls, trials=t, voter_graph=voter_graph, engine=e, seed=0))
+    for sampling in ("antithetic", "lhs", "sobol"):
+        benchmarks[f"run_simulation[{sampling},{SAMPLING_TRIALS}]"] = (
+            lambda s=sampling: run_simulation(polls, trials=SAMPLING_TRIALS, voter_graph=voter_graph,
+                                              engine="vectorized", seed=0, sampling=s))
+    benchmarks["incremental_update[1 province]"] = _one_province_update(
+        IncrementalSimulator(voter_graph), polls)
+    benchmarks["run_parameter_sweep[5x5,1000]"] = lambda: run_parameter_sweep(
+        polls, SWEEP_GRID_MARGINS, SWEEP_GRID_INFLUENCE_FACTORS, trials=1000, voter_graph=voter_graph, seed=0)
+    benchmarks["simulate_trial_range[100 from 10^6]"] = lambda: simulate_trial_range(
+        polls, 0, 10 ** 6, 100, voter_graph)
+    benchmarks["simulate_single_seat"] = lambda: simulate_single_seat(ontario, voter_graph)
+    benchmarks["adjust_polling_graph"] = lambda: adjust_polling_graph(ontario, voter_graph)
+    benchmarks["clean_and_merge"] = lambda: clean_and_merge(latest_csv)
+    benchmarks["build_historical_voter_graph"] = lambda: build_historical_voter_graph(*elections)
+    benchmarks["make_voter_graph_figure"] = lambda: make_voter_graph_figure(voter_graph)
+    benchmarks["make_choropleth"] = lambda: make_choropleth(polls)
+    return benchmarks
+
+
+def _one_province_update(simulator: Any, polls: Dict[str, Dict[str, float]]) -> Callable[[], Any]:
+    """
+    Return a call that nudges one province's poll and simulates the snapshot again, so that every call
+    re-simulates exactly that province.
+    """
+    province = next(iter(polls))
+    party = next(iter(polls[province]))
+    simulator.run(polls)
+    calls = iter(range(1, 10 ** 9))
+
+    def update() -> Any:
+        snapshot = dict(polls)
+        snapshot[province] = {**polls[province], party: polls[province][party] + 1e-9 * next(calls)}
+        return simulator.run(snapshot)
+    return update
+
+
+def time_call(func: Callable[[], Any], repeat: int = 5, min_time: float = 0.2) -> Dict[str, float]:
+    """
+    Time a function, calling it enough times per measurement to get above timer resolution.
+
+    The function is called twice before timing: once so that one-off costs like lazy imports and cache
+    warm-up are not counted, and once to choose the number of calls per measurement.
+
+    Args:
+        func (Callable[[], Any]): Function to time
+        repeat (int, optional): Number of measurements. Defaults to 5.
+        min_time (float, optional): Minimum seconds per measurement. Defaults to 0.2.
+
+    Returns:
+        Dict[str, float]: Seconds per call (min, median and mean over the measurements), with the
+        number of calls per measurement and the number of measurements
+    """
+    func()
+    timer = timeit.Timer(func)
+    start = time.perf_counter()
+    func()
+    single = time.perf_counter() - start
+    number = max(1, int(min_time / single)) if single > 0 else 1
+    per_call = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    return {"min": min(per_call), "median": statistics.median(per_call), "mean": statistics.fmean(per_call),
+            "number": number, "repeat": repeat}
+
+
+def machine_metadata() -> Dict[str, Any]:
+    """
+    Describe the machine and code version a benchmark run happened on.
+
+    Returns:
+        Dict[str, Any]: Platform, CPU, interpreter, library versions, git commit and time of the run
+    """
+    import pandas as pd
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def run_benchmarks(polls: Dict[str, Dict[str, float]], only: Optional[List[str]] = None,
+                   repeat: int = 5) -> Dict[str, Any]:
+    """
+    Run the benchmark suite.
+
+    Args:
+        polls (Dict[str, Dict[str, float]]): Polling data by province
+        only (Optional[List[str]], optional): Only run benchmarks whose name starts with one of these.
+         Defaults to running everything.
+        repeat (int, optional): Number of measurements per benchmark. Defaults to 5.
+
+    Returns:
+        Dict[str, Any]: The machine metadata and the timings of each benchmark
+    """
+    results = {}
+    for name, func in build_benchmarks(polls).items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        results[name] = time_call(func, repeat=repeat)
+        print(f"{name:<36} {1000 * results[name]['median']:10.3f} ms")
+    return {"metadata": machine_metadata(), "results": results}
+
+
+def compare_to_baseline(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = BENCHMARK_THRESHOLD,
+                        thresholds: Optional[Dict[str, float]] = None) -> List[Tuple[str, float, float, bool]]:
+    """
+    Compare the median timings of a run against a baseline run.
+
+    Args:
+        current (Dict[str, Any]): Results of run_benchmarks
+        baseline (Dict[str, Any]): Results of an earlier run_benchmarks
+        threshold (float, optional): Allowed slowdown as a fraction, e.g. 0.2 for 20%. Defaults to
+         BENCHMARK_THRESHOLD.
+        thresholds (Optional[Dict[str, float]], optional): Allowed slowdown of specific benchmarks,
+         overriding threshold. Defaults to None.
+
+    Returns:
+        List[Tuple[str, float, float, bool]]: For every benchmark in both runs, its name, baseline and
+        current median in seconds, and whether it regressed
+    """
+    thresholds = thresholds or {}
+    comparison = []
+    for name, timing in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before, after = baseline["results"][name]["median"], timing["median"]
+        allowed = thresholds.get(name, threshold)
+        comparison.append((name, before, after, after > before * (1 + allowed)))
+    return comparison
+
+
+def _parse_thresholds(values: List[str]) -> Tuple[float, Dict[str, float]]:
+    """
+    Split --threshold arguments into the default threshold and per-benchmark overrides.
+    """
+    default, overrides = BENCHMARK_THRESHOLD, {}
+    for value in values:
+        if "=" in value:
+            name, _, limit = value.rpartition("=")
+            overrides[name] = float(limit)
+        else:
+            default = float(value)
+    return default, overrides
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the benchmarks from the command line.
+
+    Returns:
+        int: Exit status, 1 if any benchmark regressed against the baseline
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the election simulator")
+    parser.add_argument("--polls", choices=["synthetic", "fixture"], default="synthetic",
+                        help="polling data to benchmark with")
+    parser.add_argument("--only", nargs="*", help="only run benchmarks whose name starts with these")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements per benchmark")
+    parser.add_argument("--output", default=BENCHMARK_RESULTS_PATH, help="where to write the results")
+    parser.add_argument("--baseline", default=BENCHMARK_BASELINE_PATH, help="results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", action="append", default=[],
+                        help="allowed slowdown, e.g. 0.2, or NAME=0.5 for one benchmark; may be repeated")
+    args = parser.parse_args(argv)
+
+    polls = synthetic_polls() if args.polls == "synthetic" else fixture_polls()
+    current = run_benchmarks(polls, only=args.only, repeat=args.repeat)
+    current["metadata"]["polls"] = args.polls
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    threshold, overrides = _parse_thresholds(args.threshold)
+    comparison = compare_to_baseline(current, baseline, threshold, overrides)
+    print(f"\nCompared with baseline from commit {baseline['metadata'].get('commit')}:")
+    for name, before, after, regressed in comparison:
+        print(f"{name:<36} {1000 * before:10.3f} -> {1000 * after:10.3f} ms  "
+              f"{after / before:6.2f}x{'  REGRESSION' if regressed else ''}")
+    return 1 if any(regressed for _, _, _, regressed in comparison) else 0
+
+
+if __name__ == "__main__":
+    # The exit status is held back until the checks below have run
+    exit_status = main()
+
+
+if __name__ == '__main__':
+    import doctest
+    import python_ta
+
+    doctest.testmod()
+
+    python_ta.check_all(config={
+        'extra-imports': [],
+        'allowed-io': ['run_benchmarks', 'main'],
+        'max-line-length': 120
+    })
+
+    sys.exit(exit_status)
@@ -18,6 +18,9 @@ SEATS_BY_PROVINCE = {
 # Parliament majority threshold
 MAJORITY_THRESHOLD = 172
 
+# Majority probabilities are counted for every coalition of parties when there are at most this many parties
+COALITION_MAX_PARTIES = 12
+
 # Party color scheme for visualization
 PARTY_COLORS = {
     "LIB": "red",
@@ -29,6 +32,50 @@ PARTY_COLORS = {
     "OTH": "grey"
 }
 
+# Maximum number of simulation results kept in memory by the dashboard
+SIMULATION_CACHE_SIZE = 32
+
+# Seed of the dashboard's simulations, so that provinces whose polls did not change keep their simulated
+# trials, and the number of runs whose per-province blocks of trials are kept for that
+SIMULATION_SEED = 2025
+INCREMENTAL_CACHE_RUNS = 4
+
+# Background simulation jobs: how many run at once, how many finished jobs are remembered, and how often
+# the dashboard polls their progress
+SIMULATION_JOB_WORKERS = 2
+SIMULATION_JOB_HISTORY = 64
+JOB_POLL_INTERVAL_MS = 300
+
+# Grid of the dashboard's sensitivity tab: polling margins, voter graph influence factors and trials per point.
+# The sweep takes time proportional to grid points times trials, about 1 second on one core for this grid.
+SWEEP_MARGINS = [0.01, 0.015, 0.02, 0.025, 0.03, 0.035, 0.04, 0.045, 0.05, 0.055, 0.06]
+SWEEP_INFLUENCE_FACTORS = [0.0, 0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.35, 0.4, 0.45, 0.5]
+SWEEP_TRIALS = 500
+
+# Seconds between background poll scrapes, and the first retry delay after a failed scrape
+POLL_REFRESH_INTERVAL = 300
+POLL_RETRY_DELAY = 5
+
+# Whether every dashboard update also runs cProfile and shows its slowest functions in the timing breakdown
+PROFILE_DASHBOARD_RUNS = False
+
+# SQLite file where every scraped polling snapshot is archived
+POLL_ARCHIVE_PATH = "poll_archive.sqlite"
+
+# Historical election results, one CSV per year named after the year, and the cache of their cleaned form
+HISTORICAL_DATA_PATTERN = "[0-9][0-9][0-9][0-9].csv"
+HISTORICAL_CACHE_PATH = "historical_cache.pkl"
+
+# Where benchmarks.py writes its results and keeps the baseline, and the slowdown it tolerates (20%)
+BENCHMARK_RESULTS_PATH = "benchmark_results.json"
+BENCHMARK_BASELINE_PATH = "benchmark_baseline.json"
+BENCHMARK_THRESHOLD = 0.2
+
+# Ridings with their previous-election party shares, and how regional polls move them ("uniform" or
+# "proportional"). Without the CSV every riding of a province starts from the province's historical result.
+RIDINGS_PATH = "ridings.csv"
+SWING_METHOD = "uniform"
+
 # Valid parties for data cleaning
 VALID_PARTIES = {"LIB", "CON", "NDP", "GRN", "BQ", "PPC"}
 
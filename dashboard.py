@@ -5,38 +5,124 @@ Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Z
 This module handles the Dash web interface for the election simulator.
 """
 
-import time
+import importlib
+import json
+from typing import Optional
 import dash
 from dash import dcc, html
 from dash.dependencies import Input, Output, State
 
-from scraper import scrape_polling_data
-from visualization import make_bar_chart, make_choropleth
+from scraper import scrape_polling_data, default_archive
+from visualization import make_bar_chart, make_choropleth, make_sweep_heatmap
 from graph import make_voter_graph_figure
-from election_model import run_simulation
+from election_model import run_paired_simulation
+from incremental_simulation import IncrementalSimulator
+from parameter_sweep import run_parameter_sweep
+from ridings import RidingTable, load_riding_table
+from result_cache import SimulationCache, simulation_key
+from simulation_jobs import SimulationJob, SimulationJobQueue
+from poll_store import PollStore, start_poll_refresher
+from instrumentation import record
+from config import (SIMULATION_CACHE_SIZE, PROFILE_DASHBOARD_RUNS, JOB_POLL_INTERVAL_MS, SWEEP_MARGINS,
+                    SWEEP_INFLUENCE_FACTORS, SWEEP_TRIALS, SWING_METHOD)
 
 
-def create_dashboard(historical_voter_graph):
+def create_dashboard(historical_voter_graph, poll_store: Optional[PollStore] = None, offline: bool = False,
+                     ridings: Optional[RidingTable] = None):
     """
     Create the Dash app for the election simulation dashboard.
 
+    Callbacks never scrape or simulate themselves: they read the latest snapshot from poll_store, which a
+    background thread keeps up to date, and hand simulations to a background job queue whose progress the
+    page polls with a dcc.Interval. This includes the extra simulations behind the compare and sweep tabs,
+    which the tabs render once their jobs finish.
+
     Args:
         historical_voter_graph (networkx.DiGraph): Historical voter transition graph
+        poll_store (Optional[PollStore]): Source of polling snapshots. Defaults to a new store that starts
+            from the latest archived snapshot and is fed by a background refresher running scrape_polling_data.
+        offline (bool): Whether to only use the archived snapshot, without ever scraping. Defaults to False.
+        ridings (Optional[RidingTable]): Ridings the main simulation runs on. Defaults to load_riding_table().
 
     Returns:
         dash.Dash: Dash app instance
     """
     app = dash.Dash(__name__)
 
-    # Store simulation results globally
-    simulation_results = None
+    if poll_store is None:
+        poll_store = PollStore()
+        archived = default_archive().latest()
+        if archived is not None:
+            poll_store.publish(archived[1], timestamp=archived[0])
+        if not offline:
+            start_poll_refresher(scrape_polling_data, store=poll_store)
+
+    if ridings is None:
+        ridings = load_riding_table()
+    riding_fingerprint = ridings.fingerprint()
+
+    # Keeps every province's simulated trials, so a new snapshot only re-simulates the provinces that moved
+    simulator = IncrementalSimulator(historical_voter_graph, ridings=ridings, swing=SWING_METHOD)
+
+    # Shared by all callbacks, so tab switches reuse results unless the polls actually changed
+    simulation_cache = SimulationCache(SIMULATION_CACHE_SIZE)
+
+    # Sweep jobs load pandas on their own thread, while Plotly serializes figures with whatever pandas module
+    # is in sys.modules, even one that is only half imported; loading it here first closes that race
+    importlib.import_module("pandas")
+
+    # Simulations run here in the background; each browser keeps the id of its own job in "job-id"
+    job_queue = SimulationJobQueue(simulation_cache, profile=PROFILE_DASHBOARD_RUNS)
+
+    def submit_simulation(polls, trials=1000):
+        """
+        Start a background simulation, or join the identical one already running, and return its job id.
+        """
+        key = simulation_key(polls, trials, simulator.margin, historical_voter_graph, "incremental",
+                             riding_fingerprint, SWING_METHOD, simulator.seed)
+        return job_queue.submit(key, lambda progress: simulator.run(polls, trials, progress),
+                                total=trials, inputs=polls)
+
+    # The compare tab simulates both scenarios with the settings of the main simulation
+    variants = {"graph": {"voter_graph": historical_voter_graph, "influence_factor": simulator.influence_factor,
+                          "margin": simulator.margin},
+                "raw": {"voter_graph": None, "margin": simulator.margin}}
+
+    def tab_simulation(tab, polls):
+        """
+        Return the cache key, computation and number of trials of the simulation a tab shows, or None if the
+        tab only needs the main simulation.
+        """
+        if tab == 'compare':
+            # Both scenarios come from one paired run sharing random draws, so their difference is not noise
+            key = simulation_key(polls, 1000, simulator.margin, historical_voter_graph, "paired", riding_fingerprint,
+                                 SWING_METHOD, simulator.seed)
+            return key, lambda progress: run_paired_simulation(polls, variants, 1000, seed=simulator.seed,
+                                                               progress=progress, ridings=ridings,
+                                                               swing=SWING_METHOD), 1000
+        if tab == 'sweep':
+            # The whole grid comes from one batched run sharing random draws, so it changes smoothly
+            key = simulation_key(polls, SWEEP_TRIALS, tuple(SWEEP_MARGINS), historical_voter_graph, "sweep",
+                                 tuple(SWEEP_INFLUENCE_FACTORS), riding_fingerprint, SWING_METHOD)
+            return key, lambda progress: run_parameter_sweep(polls, SWEEP_MARGINS, SWEEP_INFLUENCE_FACTORS,
+                                                             SWEEP_TRIALS, historical_voter_graph,
+                                                             progress=progress, ridings=ridings,
+                                                             swing=SWING_METHOD), SWEEP_TRIALS
+        return None
 
     app.layout = html.Div([
         html.H1("Canadian Federal Election Simulator"),
         html.Div([
             html.Button("Run Simulation", id="run-btn", n_clicks=0),
             html.Span("Simulations: 1000", style={"marginLeft": "10px"}),
+            html.Span(id="job-progress", style={"marginLeft": "10px"}),
         ]),
+        dcc.Store(id="job-id"),
+        dcc.Store(id="finished-job-id"),
+        dcc.Interval(id="job-poll", interval=JOB_POLL_INTERVAL_MS, disabled=True),
+        dcc.Store(id="tab-job-id"),
+        dcc.Store(id="finished-tab-job-id"),
+        dcc.Interval(id="tab-job-poll", interval=JOB_POLL_INTERVAL_MS, disabled=True),
 
         dcc.Loading(
             id="loading-simulation",
@@ -49,102 +135,267 @@ def create_dashboard(historical_voter_graph):
                     dcc.Tab(label='Seat Bar Chart', value='bar'),
                     dcc.Tab(label='Voter Transition Graph', value='graph'),
                     dcc.Tab(label='Compare Predictions', value='compare'),
+                    dcc.Tab(label='Sensitivity', value='sweep'),
                 ]),
                 html.Div(id="tab-content")
             ]
         ),
+        html.Div(id="tab-job-progress", style={"marginTop": "10px"}),
         html.Div(id="status-message", style={"marginTop": "10px", "color": "gray"})
     ])
 
+    @app.callback(
+        [Output("job-id", "data"),
+         Output("job-poll", "disabled"),
+         Output("job-progress", "children")],
+        [Input("run-btn", "n_clicks")],
+        [State("job-id", "data")]
+    )
+    def start_simulation(n, previous_job_id):
+        """
+        Submit a simulation of the latest polls when the button is clicked, and start polling its progress.
+
+        Args:
+            n (int): Number of button clicks
+            previous_job_id (Optional[str]): Job this browser submitted before, which it no longer needs
+
+        Returns:
+            tuple: (job id, whether polling is disabled, progress text)
+        """
+        if n == 0:
+            return dash.no_update, dash.no_update, dash.no_update
+
+        snapshot, _ = poll_store.latest()
+        if snapshot is None:
+            return dash.no_update, dash.no_update, f"Waiting for polling data. {poll_store.describe()}"
+
+        # Submitting first and releasing after keeps a job that both ids name alive, with one reference
+        job_id = submit_simulation(snapshot)
+        job_queue.release(previous_job_id)
+        return job_id, False, job_progress(job_queue.get(job_id))
+
+    @app.callback(
+        [Output("job-progress", "children", allow_duplicate=True),
+         Output("job-poll", "disabled", allow_duplicate=True),
+         Output("finished-job-id", "data")],
+        [Input("job-poll", "n_intervals")],
+        [State("job-id", "data")],
+        prevent_initial_call=True
+    )
+    def poll_simulation(_, job_id):
+        """
+        Report the progress of this browser's job, and announce it once it has finished.
+
+        Args:
+            job_id (Optional[str]): Job this browser is waiting for
+
+        Returns:
+            tuple: (progress text, whether polling is disabled, id of the finished job)
+        """
+        job = job_queue.get(job_id)
+        if job is None:
+            return "", True, dash.no_update
+        if job.active:
+            return job_progress(job), False, dash.no_update
+        return job_progress(job), True, job_id
+
+    @app.callback(
+        [Output("tab-job-progress", "children", allow_duplicate=True),
+         Output("tab-job-poll", "disabled", allow_duplicate=True),
+         Output("finished-tab-job-id", "data")],
+        [Input("tab-job-poll", "n_intervals")],
+        [State("tab-job-id", "data")],
+        prevent_initial_call=True
+    )
+    def poll_tab_simulation(_, tab_job_id):
+        """
+        Report the progress of the simulation behind the selected tab, and announce it once it has finished.
+
+        Args:
+            tab_job_id (Optional[str]): Job the selected tab is waiting for
+
+        Returns:
+            tuple: (progress text, whether polling is disabled, id of the finished job)
+        """
+        job = job_queue.get(tab_job_id)
+        if job is None:
+            return "", True, dash.no_update
+        if job.active:
+            return job_progress(job), False, dash.no_update
+        return "", True, tab_job_id
+
     @app.callback(
         [Output("summary", "children"),
          Output("tab-content", "children"),
-         Output("status-message", "children")],
-        [Input("run-btn", "n_clicks"),
-         Input("tabs", "value")],
-        [State("summary", "children")]
+         Output("status-message", "children"),
+         Output("tab-job-id", "data"),
+         Output("tab-job-poll", "disabled"),
+         Output("tab-job-progress", "children")],
+        [Input("finished-job-id", "data"),
+         Input("tabs", "value"),
+         Input("finished-tab-job-id", "data")],
+        [State("summary", "children"),
+         State("tab-job-id", "data")]
     )
-    def update_dashboard(n, tab, current_summary):
+    def update_dashboard(job_id, tab, _, current_summary, tab_job_id):
         """
-        Update the dashboard based on button clicks and tab selections.
+        Update the dashboard when a simulation finishes or a tab is selected.
+
+        Tabs that need a simulation of their own show its cached result, or submit it as a background job
+        and are rendered again when "finished-tab-job-id" announces that the job is done.
 
         Args:
-            n (int): Number of button clicks
+            job_id (Optional[str]): Most recent finished job of this browser
             tab (str): Selected tab
             current_summary (html.Element): Current summary HTML
+            tab_job_id (Optional[str]): Job the previously selected tab was waiting for
 
         Returns:
-            tuple: (summary, content, status_message)
+            tuple: (summary, content, status_message, tab job id, whether tab polling is disabled,
+            tab progress text)
         """
-        nonlocal simulation_results
-
         ctx = dash.callback_context
         if not ctx.triggered:
             trigger_id = 'No triggers'
         else:
             trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
 
-        if n == 0:
-            return dash.no_update, dash.no_update, "Ready to run simulation"
-
-        status_message = ""
-        if trigger_id == "run-btn":
-            status_message = "Starting simulation with 1,000 trials..."
-            polls = scrape_polling_data()
-            start_time = time.time()
-            simulation_results = run_simulation(polls, 1000, historical_voter_graph)
-            end_time = time.time()
-
-            seats, probs = simulation_results
-            lines = [
-                (f"{p}: {100 * probs[p]['majority']:.1f}% majority, {100 * probs[p]['minority']:.1f}% minority, "
-                 f"{100 * probs[p]['no_win']:.1f}% no win")
-                for p in probs]
-            summary = html.Ul([html.Li(l) for l in lines])
-            status_message = f"Simulation completed in {end_time - start_time:.2f} seconds."
-        else:
-            if simulation_results is None:
-                polls = scrape_polling_data()
-                simulation_results = run_simulation(polls, 1000, historical_voter_graph)
-                status_message = "Initial simulation complete."
-            seats, probs = simulation_results
-            summary = current_summary
-            status_message = "Displaying existing simulation results."
-
-        if tab == 'bar':
-            content = dcc.Graph(figure=make_bar_chart(seats))
-        elif tab == 'graph':
-            content = dcc.Graph(figure=make_voter_graph_figure(historical_voter_graph))
-        elif tab == 'compare':
-            polls = scrape_polling_data()
-            seats_graph, _ = run_simulation(polls, 1000, historical_voter_graph)
-            seats_raw, _ = run_simulation(polls, 1000, None)
-
-            fig1 = make_bar_chart(seats_graph)
-            fig2 = make_bar_chart(seats_raw)
-            fig1.update_layout(title="With Voter Transition Graph")
-            fig2.update_layout(title="Without Transition Modeling")
-
-            content = html.Div([
-                html.Div([dcc.Graph(figure=fig1)], style={"width": "48%", "display": "inline-block"}),
-                html.Div([dcc.Graph(figure=fig2)], style={"width": "48%", "display": "inline-block", "float": "right"})
-            ])
-        else:
-            polls = scrape_polling_data()
-            content = dcc.Graph(figure=make_choropleth(polls))
+        if job_id is None:
+            return (dash.no_update, dash.no_update, f"Ready to run simulation. {poll_store.describe()}",
+                    dash.no_update, dash.no_update, dash.no_update)
+
+        job = job_queue.get(job_id)
+        if job is None or job.status != "done":
+            message = "Simulation results expired." if job is None else job.describe()
+            return (dash.no_update, dash.no_update, f"{message} Run the simulation again. {job_queue.describe()}",
+                    dash.no_update, dash.no_update, dash.no_update)
+        latest_polls = job.inputs
+        tab_job = job_queue.get(tab_job_id)
+        simulation = tab_simulation(tab, latest_polls)
+        tab_outputs = (None, True, "")
 
-        return summary, content, status_message
+        # Time every stage of this update, so a slow run shows where the time went; the simulation itself ran on
+        # the job's thread, which recorded its own stages
+        with record(profile=PROFILE_DASHBOARD_RUNS) as recorder:
+            seats, probs = job.result
+            if trigger_id == "finished-job-id":
+                lines = [
+                    (f"{p}: {100 * probs[p]['majority']:.1f}% majority, {100 * probs[p]['minority']:.1f}% minority, "
+                     f"{100 * probs[p]['no_win']:.1f}% no win")
+                    for p in probs]
+                if seats.outcomes is not None:
+                    coalitions = seats.outcomes.coalition_majorities(max_parties=2)
+                    likeliest = sorted(((m, p) for m, p in coalitions.items() if len(m) == 2), key=lambda c: -c[1])
+                    lines.append("Likeliest majority coalitions: " + ", ".join(
+                        f"{' + '.join(members)} {100 * prob:.1f}%" for members, prob in likeliest[:3]))
+                summary = html.Ul([html.Li(l) for l in lines])
+                status_message = f"{job.describe()}."
+            else:
+                summary = current_summary
+                status_message = "Displaying existing simulation results."
+
+            tab_result = None
+            key, compute, total = simulation if simulation is not None else (None, None, 0)
+            if simulation is not None:
+                if tab_job is not None and tab_job.key == key and tab_job.status == "done":
+                    tab_result = tab_job.result
+                else:
+                    tab_result = simulation_cache.get(key)
+
+            if simulation is not None and tab_result is None:
+                if trigger_id == "finished-tab-job-id" and tab_job is not None and tab_job.key == key:
+                    # The job failed or was cancelled; submitting it again waits until the tab is selected again
+                    content = html.P(f"{tab_job.describe()}. Select the tab again to retry.")
+                    tab_outputs = (tab_job_id, True, "")
+                else:
+                    new_job_id = job_queue.submit(key, compute, total=total)
+                    job_queue.release(tab_job_id)
+                    content = html.P("Simulating; the results appear here when they are ready.")
+                    tab_outputs = (new_job_id, False, job_progress(job_queue.get(new_job_id)))
+            elif tab == 'bar':
+                content = dcc.Graph(figure=make_bar_chart(seats))
+            elif tab == 'graph':
+                content = dcc.Graph(figure=make_voter_graph_figure(historical_voter_graph))
+            elif tab == 'compare':
+                paired, differences = tab_result
+                seats_graph, _ = paired["graph"]
+                seats_raw, _ = paired["raw"]
+
+                fig1 = make_bar_chart(seats_graph)
+                fig2 = make_bar_chart(seats_raw)
+                fig1.update_layout(title="With Voter Transition Graph")
+                fig2.update_layout(title="Without Transition Modeling")
+
+                effect = differences["raw"].mean(axis=0)
+                effect_se = differences["raw"].std(axis=0) / len(differences["raw"]) ** 0.5
+                effect_text = ", ".join(f"{p}: {-e:+.1f} ± {1.96 * se:.1f}"
+                                        for p, e, se in zip(seats_graph.parties, effect, effect_se))
+
+                content = html.Div([
+                    html.Div([dcc.Graph(figure=fig1)], style={"width": "48%", "display": "inline-block"}),
+                    html.Div([dcc.Graph(figure=fig2)],
+                             style={"width": "48%", "display": "inline-block", "float": "right"}),
+                    html.P(f"Seat effect of the voter transition graph (95% CI): {effect_text}")
+                ])
+            elif tab == 'sweep':
+                table = tab_result
+                leaders = sorted(seats.means().items(), key=lambda item: -item[1])[:2]
+                content = html.Div([
+                    html.Div([dcc.Graph(figure=make_sweep_heatmap(table, party))],
+                             style={"width": "48%", "display": "inline-block",
+                                    "float": "right" if i else "none"})
+                    for i, (party, _) in enumerate(leaders)
+                ] + [html.P("Win probability (majority or minority) of the two leading parties as the polling "
+                            "margin and the influence of the voter transition graph change. The dashboard's own "
+                            "simulation uses a margin of 0.03 and an influence factor of 0.2.")])
+            else:
+                content = dcc.Graph(figure=make_choropleth(latest_polls))
+
+        if tab_outputs[0] is None:
+            # The selected tab no longer waits for a job, so a job still running for it can be cancelled
+            job_queue.release(tab_job_id)
+
+        breakdown = recorder.report()
+        if job.timing is not None:
+            breakdown["simulation"] = job.timing
+        if tab_result is not None and tab_job is not None and tab_job.key == key and tab_job.timing is not None:
+            breakdown["tab_simulation"] = tab_job.timing
+        if poll_store.last_refresh is not None:
+            breakdown["background_refresh"] = poll_store.last_refresh
+
+        status = html.Div([
+            html.Span(f"{status_message} {poll_store.describe()}. {simulator.describe()}. "
+                      f"{simulation_cache.describe()}. {job_queue.describe()}"),
+            html.Details([html.Summary(f"Timing breakdown ({breakdown['total_ms']:.0f} ms)"),
+                          html.Pre(json.dumps(breakdown, indent=2))]),
+        ])
+        return (summary, content, status) + tab_outputs
 
     return app
 
 
+def job_progress(job: Optional[SimulationJob]) -> html.Span:
+    """
+    Render the progress bar and summary of a simulation job.
+
+    Args:
+        job (Optional[SimulationJob]): The job, or None if it is unknown
+
+    Returns:
+        html.Span: Progress bar followed by the job's status
+    """
+    if job is None:
+        return html.Span()
+    return html.Span([html.Progress(value=str(job.done), max=str(max(job.total, 1))),
+                      html.Span(f" {job.describe()}")])
+
+
 if __name__ == "__main__":
     # Test the dashboard
     from data_loader import load_historical_data
     from graph import build_historical_voter_graph
 
-    votes_2015, votes_2019, votes_2021 = load_historical_data()
-    historical_graph = build_historical_voter_graph(votes_2015, votes_2019, votes_2021)
+    historical_graph = build_historical_voter_graph(*load_historical_data())
 
     app = create_dashboard(historical_graph)
     app.run(debug=True, port=8050, use_reloader=False)
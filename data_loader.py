@@ -5,12 +5,66 @@ Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Z
 This module handles loading and cleaning historical election data.
 """
 
-from typing import Dict, Tuple
-import pandas as pd
-from config import PROVINCE_MAP, VALID_PARTIES
+import glob
+import hashlib
+import os
+import pickle
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+import numpy as np
+from config import PROVINCE_MAP, VALID_PARTIES, HISTORICAL_DATA_PATTERN, HISTORICAL_CACHE_PATH
 
+# pandas is only needed to parse CSVs that are not in the cache, so it is imported on first use
+if TYPE_CHECKING:
+    import pandas as pd
 
-def clean_and_merge(df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+# Bump whenever the cleaned format changes, so that stale caches are ignored
+_CACHE_VERSION = 1
+
+
+def province_of_columns(columns: "pd.Index") -> "pd.Series":
+    """
+    Map every column of an election results table to its province group.
+
+    A column belongs to a group when it contains one of the group's names. If several groups match,
+    the last one in PROVINCE_MAP wins.
+
+    Args:
+        columns (pd.Index): Column labels of the results table
+
+    Returns:
+        pd.Series: Province group of each column, or NaN for columns that do not belong to any group
+    """
+    import pandas as pd
+
+    labels = pd.Series(columns.astype(str), index=columns)
+    provinces = pd.Series(np.nan, index=columns, dtype=object)
+    for group, names in PROVINCE_MAP.items():
+        names = [names] if isinstance(names, str) else names
+        matches = np.zeros(len(labels), dtype=bool)
+        for name in names:
+            matches |= labels.str.contains(name, regex=False).to_numpy()
+        provinces[matches] = group
+    return provinces
+
+
+def normalize_parties(parties: "pd.Index") -> "pd.Index":
+    """
+    Map raw party names onto the party codes used by the simulator.
+
+    Args:
+        parties (pd.Index): Party names, as in the first column of the results table
+
+    Returns:
+        pd.Index: Party code of each name, with libertarians and unknown parties as "OTH"
+    """
+    import pandas as pd
+
+    norm = parties.astype(str).str.strip().str.upper()
+    libertarian = norm.str.contains("LIBERTARIAN", regex=False) | norm.str.contains("PARTI LIBERTARIEN", regex=False)
+    return pd.Index(np.where(libertarian | ~norm.isin(VALID_PARTIES), "OTH", norm))
+
+
+def clean_and_merge(df: "pd.DataFrame") -> Dict[str, Dict[str, float]]:
     """
     Cleans and transforms election data by merging constituencies into provinces.
 
@@ -20,52 +74,123 @@ def clean_and_merge(df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
     Returns:
         dict: Dictionary of cleaned provincial voting data with parties as percentages
     """
-    cleaned: Dict[str, Dict[str, float]] = {}
-    for col in df.columns:
-        prov = None
-        for group, names in PROVINCE_MAP.items():
-            if isinstance(names, list) and any(name in col for name in names):
-                prov = group
-            elif isinstance(names, str) and names in col:
-                prov = group
-        if prov is None:
-            continue
-
-        for party, val in df[col].items():
-            norm = party.strip().upper()
-            if "LIBERTARIAN" in norm or "PARTI LIBERTARIEN" in norm:
-                norm = "OTH"
-            elif norm not in VALID_PARTIES:
-                norm = "OTH"
-
-            if prov not in cleaned:
-                cleaned[prov] = {}
-            cleaned[prov][norm] = cleaned[prov].get(norm, 0) + val
-
-    for prov in cleaned:
-        total = sum(cleaned[prov].values())
-        for key in cleaned[prov]:
-            cleaned[prov][key] /= total
-    return cleaned
-
-
-def load_historical_data() -> Tuple[Dict[str, Dict[str, float]],
-                                    Dict[str, Dict[str, float]], Dict[str, Dict[str, float]]]:
+    provinces = province_of_columns(df.columns)
+    mapped = provinces.notna().to_numpy()
+    votes = df.loc[:, mapped]
+    votes.index = normalize_parties(df.index)
+
+    by_party = votes.groupby(level=0, sort=False).sum()
+    by_province = by_party.T.groupby(provinces[mapped].to_numpy(), sort=False).sum()
+    shares = by_province.div(by_province.sum(axis=1), axis=0)
+    return {prov: {party: float(val) for party, val in row.items()} for prov, row in shares.iterrows()}
+
+
+def discover_election_files(pattern: str = HISTORICAL_DATA_PATTERN) -> Dict[int, str]:
     """
-    Loads and cleans historical election data from CSV files.
+    Find the election results CSVs, which are named after their election year.
+
+    Args:
+        pattern (str, optional): Glob pattern of the CSV files. Defaults to HISTORICAL_DATA_PATTERN.
 
     Returns:
-        tuple: A tuple containing (votes_2015, votes_2019, votes_2021)
+        Dict[int, str]: Path of each year's CSV, in chronological order
+    """
+    files = {}
+    for path in glob.glob(pattern):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if stem.isdigit():
+            files[int(stem)] = path
+    return dict(sorted(files.items()))
+
+
+def _file_signature(path: str, previous: Optional[dict] = None) -> dict:
+    """
+    Return the modification time, size and content hash of a file.
+
+    The hash is only recomputed when the modification time or size differ from previous.
     """
-    df_2015 = pd.read_csv("2015.csv", index_col=0)
-    df_2019 = pd.read_csv("2019.csv", index_col=0)
-    df_2021 = pd.read_csv("2021.csv", index_col=0)
+    stat = os.stat(path)
+    if previous is not None and previous["mtime_ns"] == stat.st_mtime_ns and previous["size"] == stat.st_size:
+        return previous
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest}
 
-    data_2015 = clean_and_merge(df_2015)
-    data_2019 = clean_and_merge(df_2019)
-    data_2021 = clean_and_merge(df_2021)
 
-    return data_2015, data_2019, data_2021
+def _read_cache(cache_path: str) -> Dict[str, dict]:
+    """
+    Read the cleaned results cache, or return an empty cache if it is missing or unreadable.
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            cache = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != _CACHE_VERSION:
+        return {}
+    return cache["entries"]
+
+
+def _write_cache(cache_path: str, entries: Dict[str, dict]) -> None:
+    """
+    Atomically replace the cleaned results cache.
+    """
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"version": _CACHE_VERSION, "entries": entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # The cache is only an optimization, so a read-only directory is not an error
+        pass
+
+
+def load_election_results(pattern: str = HISTORICAL_DATA_PATTERN,
+                          cache_path: Optional[str] = HISTORICAL_CACHE_PATH) \
+        -> Dict[int, Dict[str, Dict[str, float]]]:
+    """
+    Load and clean the results of every election whose CSV matches pattern.
+
+    Cleaned results are kept in a binary cache at cache_path. A CSV is only parsed again when its content
+    hash changes; the hash itself is only recomputed when the file's modification time or size changes.
+
+    Args:
+        pattern (str, optional): Glob pattern of the CSV files. Defaults to HISTORICAL_DATA_PATTERN.
+        cache_path (Optional[str], optional): Path of the cache file, or None to disable caching.
+         Defaults to HISTORICAL_CACHE_PATH.
+
+    Returns:
+        Dict[int, Dict[str, Dict[str, float]]]: Cleaned provincial voting data of each year, in chronological order
+    """
+    cached = _read_cache(cache_path) if cache_path else {}
+    entries = {}
+    results = {}
+    for year, path in discover_election_files(pattern).items():
+        key = os.path.abspath(path)
+        entry = cached.get(key)
+        signature = _file_signature(path, entry["signature"] if entry else None)
+        if entry is None or entry["signature"]["sha256"] != signature["sha256"]:
+            import pandas as pd
+
+            entry = {"data": clean_and_merge(pd.read_csv(path, index_col=0))}
+        entry["signature"] = signature
+        entries[key] = entry
+        results[year] = entry["data"]
+
+    if cache_path and entries != cached:
+        _write_cache(cache_path, entries)
+    return results
+
+
+def load_historical_data() -> Tuple[Dict[str, Dict[str, float]], ...]:
+    """
+    Loads and cleans historical election data from CSV files.
+
+    Returns:
+        tuple: The cleaned data of every discovered election, in chronological order
+         (votes_2015, votes_2019, votes_2021 with the bundled CSVs)
+    """
+    return tuple(load_election_results().values())
 
 
 if __name__ == "__main__":
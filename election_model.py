@@ -5,10 +5,25 @@ Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Z
 This module defines the election simulation model and logic.
 """
 
+import bisect
+import functools
+import hashlib
+import itertools
 import random
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+import weakref
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Collection, Dict, Iterator, List, Optional, Tuple, Union
+import numpy as np
 import networkx as nx
-from config import SEATS_BY_PROVINCE, MAJORITY_THRESHOLD
+from config import SEATS_BY_PROVINCE, SWING_METHOD
+from graph import VoterTransitionMatrix
+from random_streams import new_seed, trial_generator, design_generator
+from ridings import RidingTable
+from simulation_results import SeatDistribution, OutcomeStatistics, classify_trials, SEAT_DTYPE
+import instrumentation
+from instrumentation import instrumented
 
 
 class RegionNode:
@@ -28,6 +43,8 @@ class RegionNode:
     num_seats: int
     results: Dict[str, int]
 
+    __slots__ = ("name", "node_type", "children", "num_seats", "results")
+
     def __init__(self, name: str, node_type: str = "country",
                  children: Optional[List["RegionNode"]] = None, num_seats: int = 0) -> None:
         """
@@ -54,7 +71,9 @@ class RegionNode:
         """
         self.children.append(child_node)
 
-    def simulate(self, polling_data: Dict[str, Any], graph: nx.DiGraph, margin: float = 0.03) -> Dict[str, int]:
+    @instrumented("RegionNode.simulate")
+    def simulate(self, polling_data: Dict[str, Any], graph: nx.DiGraph, margin: float = 0.03,
+                 rng: Optional[np.random.Generator] = None) -> Dict[str, int]:
         """
         Recursively simulate the election for this region and all children.
 
@@ -62,40 +81,124 @@ class RegionNode:
             polling_data (dict): Polling data (either for the entire country or for a specific province)
             graph (nx.DiGraph): Voter transition graph
             margin (float, optional): Random margin to apply to polling. Defaults to 0.03.
+            rng (Optional[np.random.Generator], optional): Source of randomness for every seat of the region.
+             Defaults to None, which uses the random module.
 
         Returns:
             Dict[str, int]: Election results for this region
         """
+        return self._simulate(polling_data, graph, margin, rng)
+
+    def _simulate(self, polling_data: Dict[str, Any], graph: nx.DiGraph, margin: float,
+                  rng: Optional[np.random.Generator]) -> Dict[str, int]:
+        """
+        Simulate this region and its children. The recursion goes through this undecorated method, so that
+        only the outermost call is instrumented.
+        """
+        # Results are accumulated in a local dict and stored at the end, so that a cached tree shared
+        # between threads always returns each caller's own results
         if self.node_type == "seat":
-            self.results = simulate_single_seat(polling_data, graph, margin)
+            self.results = simulate_single_seat(polling_data, graph, margin, rng)
             return self.results
         elif self.node_type == "province":
-            self.results = {}
+            results = {}
             # Expect polling_data for a province to be a dict keyed by seat
+            child_poll = polling_data.get(self.name, {})
             for child in self.children:
-                child_poll = polling_data.get(self.name, {})
-                child_result = child.simulate(child_poll, graph, margin)
+                child_result = child._simulate(child_poll, graph, margin, rng)
                 for p, count in child_result.items():
-                    self.results[p] = self.results.get(p, 0) + count
-            return self.results
+                    results[p] = results.get(p, 0) + count
+            self.results = results
+            return results
         elif self.node_type == "country":
-            self.results = {}
+            results = {}
             # For country, polling_data is expected to be the full polling dict
             for child in self.children:
-                child_result = child.simulate(polling_data, graph, margin)
+                child_result = child._simulate(polling_data, graph, margin, rng)
                 for p, count in child_result.items():
-                    self.results[p] = self.results.get(p, 0) + count
-            return self.results
+                    results[p] = results.get(p, 0) + count
+            self.results = results
+            return results
 
         return self.results
 
+    def iter_nodes(self) -> Iterator["RegionNode"]:
+        """
+        Iterate over this region and all of its descendants, without recursion.
+
+        Yields:
+            RegionNode: Every node of the subtree, parents before children
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
     def reset_results(self) -> None:
         """
         Reset the results for this region and all children.
         """
-        self.results = {}
-        for child in self.children:
-            child.reset_results()
+        for node in self.iter_nodes():
+            node.results = {}
+
+
+class FlatElectionTree:
+    """
+    An array view of an election tree, for engines that simulate seats without walking the tree.
+
+    Seats are numbered in tree order, so the seats of provinces[i] are the ones from province_offsets[i]
+    up to province_offsets[i + 1].
+
+    Attributes:
+        root (RegionNode): Root of the election tree
+        provinces (List[str]): Province names in tree order
+        province_seats (np.ndarray): Number of seats of each province
+        province_offsets (np.ndarray): Index of the first seat of each province, followed by the total
+        seat_province (np.ndarray): Index into provinces of the province of every seat
+        nodes (List[RegionNode]): Every node of the tree
+    """
+    root: RegionNode
+    provinces: List[str]
+    province_seats: np.ndarray
+    province_offsets: np.ndarray
+    seat_province: np.ndarray
+    nodes: List[RegionNode]
+
+    __slots__ = ("root", "provinces", "province_seats", "province_offsets", "seat_province", "nodes")
+
+    def __init__(self, root: RegionNode) -> None:
+        """
+        Initialize a FlatElectionTree from the root of an election tree.
+
+        Args:
+            root (RegionNode): Root node of the election tree
+        """
+        self.root = root
+        province_nodes = [child for child in root.children if child.node_type == "province"]
+        self.provinces = [node.name for node in province_nodes]
+        self.province_seats = np.array([len(node.children) for node in province_nodes], dtype=np.int64)
+        self.province_offsets = np.concatenate([[0], np.cumsum(self.province_seats)])
+        self.seat_province = np.repeat(np.arange(len(self.provinces)), self.province_seats)
+        self.nodes = list(root.iter_nodes())
+
+    @property
+    def total_seats(self) -> int:
+        """
+        Return the number of seats in the tree.
+        """
+        return int(self.province_offsets[-1])
+
+    def reset_results(self) -> None:
+        """
+        Reset the results of every node of the tree in a single pass over the node list.
+        """
+        for node in self.nodes:
+            node.results = {}
+
+
+# Election trees built by get_flat_election_tree, keyed by seat map
+_ELECTION_TREES: Dict[Tuple[Tuple[str, int], ...], FlatElectionTree] = {}
 
 
 def build_election_tree(seats_by_province: Dict[str, int]) -> RegionNode:
@@ -118,23 +221,51 @@ def build_election_tree(seats_by_province: Dict[str, int]) -> RegionNode:
     return canada
 
 
-def simulate_single_seat(polling: Dict[str, float], graph: nx.DiGraph, margin: float = 0.03) -> Dict[str, int]:
+def get_flat_election_tree(seats_by_province: Dict[str, int]) -> FlatElectionTree:
+    """
+    Return the election tree of a seat map, building and flattening it only the first time.
+
+    Args:
+        seats_by_province (Dict[str, int]): Mapping of provinces to number of seats
+
+    Returns:
+        FlatElectionTree: Cached tree and its array view
+    """
+    key = tuple(seats_by_province.items())
+    if key not in _ELECTION_TREES:
+        _ELECTION_TREES[key] = FlatElectionTree(build_election_tree(seats_by_province))
+    return _ELECTION_TREES[key]
+
+
+@instrumented()
+def simulate_single_seat(polling: Dict[str, float], graph: nx.DiGraph, margin: float = 0.03,
+                         rng: Optional[np.random.Generator] = None) -> Dict[str, int]:
     """
     Simulate a single seat election based on polling data.
 
+    With a generator the seat consumes exactly one uniform number per polled party and one for the winner,
+    so a caller can tell where the next seat's draws start.
+
     Args:
         polling (Dict[str, float]): Polling data for parties
         graph (nx.DiGraph): Voter transition graph
         margin (float, optional): Random margin to apply to polling. Defaults to 0.03.
+        rng (Optional[np.random.Generator], optional): Source of randomness. Defaults to None, which uses the
+         random module.
 
     Returns:
         Dict[str, int]: Election result for the seat (winning party gets 1)
     """
     adjusted_polling = adjust_polling_graph(polling, graph)
 
+    if rng is None:
+        noise = [random.uniform(-margin, margin) for _ in adjusted_polling]
+    else:
+        uniforms = rng.random(len(adjusted_polling) + 1).tolist()
+        noise = [margin * (2.0 * u - 1.0) for u in uniforms[:-1]]
     sampled_poll = {
-        p: max(0, min(1, adjusted_polling[p] + random.uniform(-margin, margin)))
-        for p in adjusted_polling
+        p: max(0, min(1, adjusted_polling[p] + n))
+        for p, n in zip(adjusted_polling, noise)
     }
     total = sum(sampled_poll.values())
 
@@ -143,18 +274,57 @@ def simulate_single_seat(polling: Dict[str, float], graph: nx.DiGraph, margin: f
 
     parties = list(sampled_poll.keys())
     weights = list(sampled_poll.values())
-    winner = random.choices(parties, weights)[0]
+    if rng is None:
+        winner = random.choices(parties, weights)[0]
+    else:
+        # Same search as random.choices, from the generator's last draw
+        cumulative = list(itertools.accumulate(weights))
+        winner = parties[min(bisect.bisect(cumulative, uniforms[-1] * cumulative[-1]), len(parties) - 1)]
     return {winner: 1}
 
 
+# The matrix of every voter graph converted so far, with the nodes and edges it was converted from
+_TRANSITION_MATRICES: "weakref.WeakKeyDictionary[nx.DiGraph, Tuple[tuple, VoterTransitionMatrix]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _transition_matrix(graph: Union[nx.DiGraph, VoterTransitionMatrix]) -> VoterTransitionMatrix:
+    """
+    Return the VoterTransitionMatrix of a voter graph, converting each graph only once.
+
+    A graph's matrix is kept for as long as the graph exists, and converted again if the graph's nodes or
+    edge weights have changed since. Comparing them is cheaper than either the conversion or graph_fingerprint.
+
+    Args:
+        graph (Union[nx.DiGraph, VoterTransitionMatrix]): Voter transition graph
+
+    Returns:
+        VoterTransitionMatrix: The graph as a matrix
+    """
+    if isinstance(graph, VoterTransitionMatrix):
+        return graph
+    contents = (tuple(graph.nodes), tuple(graph.edges(data="weight")))
+    cached = _TRANSITION_MATRICES.get(graph)
+    if cached is not None and cached[0] == contents:
+        return cached[1]
+    matrix = VoterTransitionMatrix.from_graph(graph)
+    _TRANSITION_MATRICES[graph] = (contents, matrix)
+    return matrix
+
+
+@instrumented()
 def adjust_polling_graph(original_polling: Dict[str, float],
-                         graph: Optional[nx.DiGraph] = None, influence_factor: float = 0.2) -> Dict[str, float]:
+                         graph: Optional[Union[nx.DiGraph, VoterTransitionMatrix]] = None,
+                         influence_factor: float = 0.2) -> Dict[str, float]:
     """
     Adjust polling based on voter transition patterns from the graph.
 
+    The adjustment is a single matrix-vector product with the graph's VoterTransitionMatrix, which is
+    converted from a DiGraph only once per graph.
+
     Args:
         original_polling (Dict[str, float]): Original polling data
-        graph (Optional[nx.DiGraph]): Voter transition graph. Defaults to None.
+        graph (Optional[Union[nx.DiGraph, VoterTransitionMatrix]]): Voter transition graph. Defaults to None.
         influence_factor (float, optional): Factor to weight the graph influence. Defaults to 0.2.
 
     Returns:
@@ -163,106 +333,937 @@ def adjust_polling_graph(original_polling: Dict[str, float],
     if graph is None:
         return original_polling  # no adjustment
 
-    adjusted_polling: Dict[str, float] = original_polling.copy()
-    for p in original_polling:
-        if p == "OTH" or p not in graph.nodes:
+    matrix = _transition_matrix(graph)
+    # Parties outside the matrix's index are not adjusted, but still take part in the renormalization
+    outside = {p: v for p, v in original_polling.items() if p not in matrix.index}
+    present = np.array([p in original_polling for p in matrix.parties])
+    shifted = matrix.shift(matrix.poll_vector(original_polling), present, influence_factor)
+
+    total = shifted.sum() + sum(outside.values())
+    return {p: float(shifted[matrix.index[p]] if p in matrix.index else original_polling[p]) / total
+            for p in original_polling}
+
+
+def poll_fingerprint(polling: Dict[str, float]) -> str:
+    """
+    Return a fingerprint of a poll that changes whenever any party's number changes.
+
+    Args:
+        polling (Dict[str, float]): Polling data for parties
+
+    Returns:
+        str: Hex digest identifying the poll
+    """
+    return hashlib.sha1(repr(sorted(polling.items())).encode()).hexdigest()
+
+
+def graph_fingerprint(graph: Optional[Union[nx.DiGraph, VoterTransitionMatrix]]) -> str:
+    """
+    Return a fingerprint of a voter transition graph that changes whenever any edge weight changes.
+
+    Args:
+        graph (Optional[Union[nx.DiGraph, VoterTransitionMatrix]]): Voter transition graph
+
+    Returns:
+        str: Hex digest identifying the graph, or "none" when there is no graph
+    """
+    if graph is None:
+        return "none"
+    if isinstance(graph, VoterTransitionMatrix):
+        graph = graph.to_graph()
+    edges = sorted((u, v, d.get("weight", 0.0)) for u, v, d in graph.edges(data=True))
+    return hashlib.sha1(repr((sorted(graph.nodes), edges)).encode()).hexdigest()
+
+
+class AdjustedPollCache:
+    """
+    Memoizes adjust_polling_graph results by poll, graph and influence factor.
+
+    The cache is shared by the dashboard's callback, job and refresher threads, so every access to its
+    entries and counters holds a lock.
+
+    Attributes:
+        max_entries (int): Maximum number of adjusted polls kept; the oldest entry is dropped first
+        hits (int): Number of lookups answered from the cache
+        misses (int): Number of lookups that had to run adjust_polling_graph
+    """
+    max_entries: int
+    hits: int
+    misses: int
+
+    def __init__(self, max_entries: int = 256) -> None:
+        """
+        Initialize an empty AdjustedPollCache.
+
+        Args:
+            max_entries (int, optional): Maximum number of adjusted polls kept. Defaults to 256.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple[str, str, float], Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def adjust(self, polling: Dict[str, float], graph: Optional[Union[nx.DiGraph, VoterTransitionMatrix]],
+               influence_factor: float = 0.2, graph_key: Optional[str] = None) -> Dict[str, float]:
+        """
+        Return the adjusted polling, computing it only if these inputs have not been seen before.
+
+        Args:
+            polling (Dict[str, float]): Original polling data
+            graph (Optional[Union[nx.DiGraph, VoterTransitionMatrix]]): Voter transition graph
+            influence_factor (float, optional): Factor to weight the graph influence. Defaults to 0.2.
+            graph_key (Optional[str], optional): Precomputed graph_fingerprint(graph). Defaults to None.
+
+        Returns:
+            Dict[str, float]: Adjusted polling data
+        """
+        if graph_key is None:
+            graph_key = graph_fingerprint(graph)
+        key = (poll_fingerprint(polling), graph_key, influence_factor)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self.hits += 1
+                return dict(cached)
+            self.misses += 1
+
+        adjusted = dict(adjust_polling_graph(polling, graph, influence_factor))
+        with self._lock:
+            # Another thread may have stored the same key while this one was computing it
+            while key not in self._entries and len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = adjusted
+        return dict(adjusted)
+
+    def clear(self) -> None:
+        """
+        Remove every entry and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of entries, hits and misses.
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Shared by every simulation run in the process
+ADJUSTED_POLL_CACHE = AdjustedPollCache()
+
+
+@instrumented()
+def compile_simulation_plan(polling_data: Dict[str, Any], voter_graph: Optional[nx.DiGraph] = None,
+                            influence_factor: float = 0.2) -> Dict[str, Dict[str, float]]:
+    """
+    Compute the graph-adjusted poll of every province once for a simulation run.
+
+    The adjusted poll of a province does not change between seats or trials, so engines simulate
+    from the plan with no voter graph instead of adjusting the poll again for every seat.
+
+    Args:
+        polling_data (Dict[str, Any]): Polling data by province
+        voter_graph (Optional[nx.DiGraph], optional): Voter transition graph. Defaults to None.
+        influence_factor (float, optional): Factor to weight the graph influence. Defaults to 0.2.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Adjusted polling data by province
+    """
+    graph_key = graph_fingerprint(voter_graph)
+    if voter_graph is not None:
+        voter_graph = _transition_matrix(voter_graph)
+    return {province: ADJUSTED_POLL_CACHE.adjust(poll, voter_graph, influence_factor, graph_key)
+            for province, poll in polling_data.items()}
+
+
+def party_order(polling_data: Dict[str, Any]) -> List[str]:
+    """
+    Return every party in the polling data, in order of first appearance.
+
+    Args:
+        polling_data (Dict[str, Any]): Polling data by province
+
+    Returns:
+        List[str]: Party codes in a fixed order used to index seat arrays
+    """
+    parties = []
+    for province_poll in polling_data.values():
+        for party in province_poll:
+            if party not in parties:
+                parties.append(party)
+    return parties
+
+
+# Upper bound on the number of noise values drawn at once by the vectorized engine (~32 MB of float64)
+_MAX_DRAW_ELEMENTS = 2 ** 22
+
+# Ways of drawing the noise of the vectorized engine:
+#   random: independent uniform draws,
+#   antithetic: trials come in pairs whose uniforms mirror each other (u and 1 - u),
+#   lhs: Latin hypercube, every uniform is stratified over the trials of a replicate,
+#   sobol: Sobol quasi-random points, randomized by a random digital shift per replicate.
+SAMPLING_METHODS = ("random", "antithetic", "lhs", "sobol")
+
+# Independently randomized replicates per block of trials for "lhs" and "sobol"; their spread gives the
+# standard errors
+_SAMPLING_REPLICATES = 10
+
+# Bits of precision of the Sobol points, as generated by scipy
+_SOBOL_BITS = 30
+
+# Unscrambled Sobol point sets, keyed by (points, dimensions)
+_SOBOL_BASES: Dict[Tuple[int, int], np.ndarray] = {}
+
+
+def _sobol_base(points: int, dimensions: int) -> np.ndarray:
+    """
+    Return the first Sobol points of a dimension as integers, generating them only the first time.
+
+    Args:
+        points (int): Number of points
+        dimensions (int): Number of dimensions
+
+    Returns:
+        np.ndarray: A (points, dimensions) array of integers below 2 ** _SOBOL_BITS
+    """
+    key = (points, dimensions)
+    if key not in _SOBOL_BASES:
+        # SciPy takes longer to import than a simulation block, so only load it when Sobol points are used
+        import warnings
+        from scipy.stats import qmc
+
+        with warnings.catch_warnings():
+            # Replicates of 2 ** m points balance best, but any size is still a valid randomized QMC design
+            warnings.simplefilter("ignore", UserWarning)
+            points_01 = qmc.Sobol(dimensions, scramble=False, bits=_SOBOL_BITS).random(points)
+        _SOBOL_BASES[key] = (points_01 * 2 ** _SOBOL_BITS).astype(np.uint64)
+    return _SOBOL_BASES[key]
+
+
+def _unit_uniforms(rng: np.random.Generator, sampling: str, trials: int, dimensions: int) -> np.ndarray:
+    """
+    Draw uniforms on [0, 1) for every trial, each trial being one point in the given number of dimensions.
+
+    Every trial's point is uniformly distributed whatever the method; the methods only differ in how the
+    points of different trials depend on each other.
+
+    Args:
+        rng (np.random.Generator): Source of randomness
+        sampling (str): One of SAMPLING_METHODS other than "random"
+        trials (int): Number of trials
+        dimensions (int): Uniforms per trial
+
+    Returns:
+        np.ndarray: A (trials, dimensions) array of uniforms
+    """
+    if sampling == "antithetic":
+        half = rng.random(((trials + 1) // 2, dimensions))
+        uniforms = np.empty((trials, dimensions))
+        uniforms[0::2] = half
+        uniforms[1::2] = 1.0 - half[:trials // 2]
+        return uniforms
+
+    replicates = []
+    for size in _replicate_sizes(trials):
+        if sampling == "lhs":
+            strata = rng.permuted(np.broadcast_to(np.arange(size)[:, np.newaxis], (size, dimensions)), axis=0)
+            replicates.append((strata + rng.random((size, dimensions))) / size)
+        else:
+            shift = rng.integers(0, 2 ** _SOBOL_BITS, size=dimensions, dtype=np.uint64)
+            shifted = _sobol_base(size, dimensions) ^ shift
+            replicates.append((shifted + rng.random((size, dimensions))) / 2 ** _SOBOL_BITS)
+    return np.concatenate(replicates) if replicates else np.empty((0, dimensions))
+
+
+def _replicate_sizes(trials: int) -> List[int]:
+    """
+    Split a block of trials into _SAMPLING_REPLICATES replicates of nearly equal size.
+    """
+    replicates = min(_SAMPLING_REPLICATES, trials)
+    return [trials // replicates + (i < trials % replicates) for i in range(replicates)]
+
+
+def _sampling_groups(sampling: str, block_sizes: List[int]) -> np.ndarray:
+    """
+    Label every trial with the independent unit it belongs to under a sampling method.
+
+    Trials of different units are independent, so the spread of the unit means gives the standard error:
+    single trials for "random", antithetic pairs, or the replicates of "lhs" and "sobol".
+
+    Args:
+        sampling (str): One of SAMPLING_METHODS
+        block_sizes (List[int]): Number of trials of each block, in order
+
+    Returns:
+        np.ndarray: Unit label of every trial
+    """
+    labels = []
+    for size in block_sizes:
+        if sampling == "random":
+            block_labels = np.arange(size)
+        elif sampling == "antithetic":
+            block_labels = np.arange(size) // 2
+        else:
+            block_labels = np.repeat(np.arange(len(_replicate_sizes(size))), _replicate_sizes(size))
+        labels.append(block_labels + (labels[-1][-1] + 1 if labels and len(labels[-1]) else 0))
+    return np.concatenate(labels) if labels else np.zeros(0, dtype=np.int64)
+
+
+def _win_standard_errors(seat_counts: np.ndarray, groups: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Estimate the standard errors of the win probabilities from the spread between independent units.
+
+    With units of n_g trials whose outcome means are m_g, the estimate over all N trials is p = sum(n_g m_g) / N
+    and its variance is estimated by G / (G - 1) * sum(n_g ** 2 (m_g - p) ** 2) / N ** 2 over the G units.
+
+    Args:
+        seat_counts (np.ndarray): A (trials, parties) array of national seat counts
+        groups (np.ndarray): Unit label of every trial, from _sampling_groups
+
+    Returns:
+        Dict[str, np.ndarray]: Standard error of each party's "majority", "minority" and "no_win" probability
+    """
+    majority, minority = classify_trials(seat_counts)
+    outcomes = {"majority": majority, "minority": minority, "no_win": ~(majority | minority)}
+    _, labels = np.unique(groups, return_inverse=True)
+    num_units = int(labels.max()) + 1 if len(labels) else 0
+    if num_units < 2:
+        return {stat: np.full(seat_counts.shape[1], np.nan) for stat in outcomes}
+
+    unit_sizes = np.bincount(labels, minlength=num_units).astype(np.float64)
+    total = len(labels)
+    errors = {}
+    for stat, hits in outcomes.items():
+        unit_hits = np.zeros((num_units, seat_counts.shape[1]))
+        np.add.at(unit_hits, labels, hits)
+        deviations = unit_hits - unit_sizes[:, np.newaxis] * (hits.sum(axis=0) / total)
+        errors[stat] = np.sqrt(num_units / (num_units - 1) * (deviations ** 2).sum(axis=0)) / total
+    return errors
+
+
+def win_statistics(distribution: SeatDistribution, sampling: str,
+                   block_sizes: List[int]) -> Dict[str, Dict[str, float]]:
+    """
+    Return the win statistics of a run, with the standard errors of its probabilities.
+
+    Args:
+        distribution (SeatDistribution): Seat distribution of the run, with its outcomes
+        sampling (str): Sampling method of the run, one of SAMPLING_METHODS
+        block_sizes (List[int]): Number of trials of each block, in order
+
+    Returns:
+        Dict[str, Dict[str, float]]: Win statistics by party, including "majority_se", "minority_se" and
+        "no_win_se"
+    """
+    win_stats = distribution.outcomes.win_stats()
+    errors = _win_standard_errors(distribution.seat_counts, _sampling_groups(sampling, block_sizes))
+    for i, party in enumerate(distribution.parties):
+        for stat, party_errors in errors.items():
+            win_stats[party][f"{stat}_se"] = float(party_errors[i])
+    return win_stats
+
+
+@instrumented("vectorized sampling")
+def simulate_province_vectorized(poll_vectors: np.ndarray, present: np.ndarray, num_seats: int, trials: int,
+                                 margins: np.ndarray, rng: np.random.Generator,
+                                 sampling: str = "random") -> np.ndarray:
+    """
+    Simulate every seat of a province for many trials and one or more variants at once.
+
+    Each seat follows the same model as simulate_single_seat: uniform noise in [-margin, margin] is added to
+    every polled party, clipped to [0, 1], and the winner is drawn with probability proportional to the result.
+    All variants share the same random draws (common random numbers), so differences between them come
+    from their inputs rather than from sampling noise.
+
+    Args:
+        poll_vectors (np.ndarray): A (variants, parties) array of adjusted polling for the province, or a
+            (variants, seats, parties) array giving every seat its own expected shares
+        present (np.ndarray): A (variants, parties) mask of the parties that appear in the province's poll
+        num_seats (int): Number of seats in the province
+        trials (int): Number of trials to simulate
+        margins (np.ndarray): Random margin of each variant
+        rng (np.random.Generator): Source of randomness. With "random" sampling every trial takes the next
+            seats * (parties + 1) uniform numbers, so a generator positioned at any trial reproduces it.
+        sampling (str, optional): One of SAMPLING_METHODS. Every method but "random" draws all trials at once,
+            so that antithetic pairs and replicates are never split. Defaults to "random".
+
+    Returns:
+        np.ndarray: A (variants, trials, parties) array with the number of seats won by each party
+    """
+    num_variants, num_parties = poll_vectors.shape[0], poll_vectors.shape[-1]
+    seat_counts = np.zeros((num_variants, trials, num_parties), dtype=np.int64)
+    if num_seats == 0 or trials == 0:
+        return seat_counts
+
+    dimensions = num_seats * (num_parties + 1)
+    chunk = max(1, _MAX_DRAW_ELEMENTS // dimensions) if sampling == "random" else trials
+    for start in range(0, trials, chunk):
+        size = min(chunk, trials - start)
+        if sampling == "random":
+            uniforms = rng.random((size, num_seats, num_parties + 1))
+        else:
+            uniforms = _unit_uniforms(rng, sampling, size, dimensions).reshape(size, num_seats, num_parties + 1)
+        unit_draws = uniforms[:, :, num_parties]
+
+        # One contiguous (trials, seats) slab of uniforms per party, shared by all variants, so the per-party
+        # work below runs over contiguous memory
+        party_uniforms = np.ascontiguousarray(uniforms[:, :, :num_parties].transpose(2, 0, 1))
+        sampled = np.empty((size, num_seats))
+        counts = seat_counts[:, start:start + size]
+
+        for v in range(num_variants):
+            # Running totals of the clipped noisy polls, party by party; absent parties add nothing
+            running_totals = []
+            cumulative = np.zeros((size, num_seats))
+            for k in range(num_parties):
+                if present[v, k]:
+                    # poll + margin * (2u - 1), with the affine map folded into one multiply and one add
+                    np.multiply(party_uniforms[k], 2.0 * margins[v], out=sampled)
+                    sampled += poll_vectors[v, ..., k] - margins[v]
+                    np.clip(sampled, 0.0, 1.0, out=sampled)
+                    cumulative = cumulative + sampled
+                running_totals.append(cumulative)
+
+            # Same search as random.choices: the first party whose running total exceeds the draw wins. The
+            # totals never decrease, so the seats where party k or a later one wins are exactly those where the
+            # total before party k is at most the draw, and each party's seats follow by subtraction.
+            draws = unit_draws * cumulative
+            later = np.full(size, num_seats)
+            for k in range(1, num_parties):
+                if k > 1 and running_totals[k - 1] is running_totals[k - 2]:
+                    at_or_after = later
+                else:
+                    at_or_after = np.count_nonzero(running_totals[k - 1] <= draws, axis=1)
+                counts[v, :, k - 1] = later - at_or_after
+                later = at_or_after
+            counts[v, :, num_parties - 1] = later
+    return seat_counts
+
+
+# Trials are simulated in blocks of BLOCK_TRIALS, which are spread over worker processes and report progress.
+# Every region draws from its own counter-based stream (see random_streams), so with "random" sampling a
+# trial's result depends only on the master seed and the trial's number, not on the blocks.
+BLOCK_TRIALS = 1000
+
+
+def region_generator(seed: int, region: str, first_trial: int, num_seats: int, num_parties: int,
+                     sampling: str) -> np.random.Generator:
+    """
+    Return the generator of one block of trials of a region for simulate_province_vectorized.
+
+    Args:
+        seed (int): Master seed of the run
+        region (str): Province or polling region
+        first_trial (int): First trial of the block
+        num_seats (int): Number of seats in the region
+        num_parties (int): Number of parties in the party order
+        sampling (str): One of SAMPLING_METHODS
+
+    Returns:
+        np.random.Generator: Generator positioned at the block's first trial, or for the other sampling
+        methods, the generator of the block's design
+    """
+    if sampling == "random":
+        return trial_generator(seed, region, first_trial, num_seats * (num_parties + 1))
+    return design_generator(seed, region, first_trial)
+
+
+def run_vectorized_block(plans: List[Dict[str, Dict[str, float]]], parties: List[str], trials: int,
+                         margins: List[float], seed: int, first_trial: int,
+                         on_progress: Optional[Callable[[float], None]] = None,
+                         ridings: Optional[RidingTable] = None, swing: str = SWING_METHOD,
+                         sampling: str = "random", regions: Optional[Collection[str]] = None) -> np.ndarray:
+    """
+    Run a block of trials with the vectorized NumPy engine, for one or more variants sharing random draws.
+
+    Args:
+        plans (List[Dict[str, Dict[str, float]]]): Adjusted polling by province of each variant,
+            from compile_simulation_plan
+        parties (List[str]): Party order used for the columns of the result
+        trials (int): Number of trials in the block
+        margins (List[float]): Random margin of each variant
+        seed (int): Master seed of the run
+        first_trial (int): Number of the block's first trial within the run
+        on_progress (Optional[Callable[[float], None]]): Called with the fraction of the block done after
+            each province. Defaults to None.
+        ridings (Optional[RidingTable]): Ridings to simulate, each from its own swung baseline. Defaults to
+            None, which gives every seat of a province the province's poll.
+        swing (str): How polls move the riding baselines, "uniform" or "proportional". Defaults to SWING_METHOD.
+        sampling (str): How the noise is drawn, one of SAMPLING_METHODS. Defaults to "random".
+        regions (Optional[Collection[str]]): Only count the seats of these provinces or polling regions.
+            Defaults to None (every seat).
+
+    Returns:
+        np.ndarray: A (variants, trials, parties) array of national seat counts
+    """
+    if ridings is not None:
+        return _run_riding_block(plans, parties, trials, margins, seed, first_trial, on_progress, ridings, swing,
+                                 sampling, regions)
+
+    flat_tree = get_flat_election_tree(SEATS_BY_PROVINCE)
+    seat_counts = np.zeros((len(plans), trials, len(parties)), dtype=np.int64)
+    seats_done = 0
+    for province, num_seats in zip(flat_tree.provinces, flat_tree.province_seats.tolist()):
+        seats_done += num_seats
+        if regions is not None and province not in regions:
+            continue
+        if any(province not in plan or not plan[province] for plan in plans):
+            raise ValueError(f"No polling data for province: {province}")
+        poll_vectors = np.array([[plan[province].get(p, 0.0) for p in parties] for plan in plans])
+        present = np.array([[p in plan[province] for p in parties] for plan in plans])
+        rng = region_generator(seed, province, first_trial, num_seats, len(parties), sampling)
+        seat_counts += simulate_province_vectorized(poll_vectors, present, num_seats, trials,
+                                                    np.asarray(margins), rng, sampling)
+        if on_progress is not None:
+            on_progress(seats_done / flat_tree.total_seats)
+    return seat_counts
+
+
+def _run_riding_block(plans: List[Dict[str, Dict[str, float]]], parties: List[str], trials: int,
+                      margins: List[float], seed: int, first_trial: int,
+                      on_progress: Optional[Callable[[float], None]], ridings: RidingTable, swing: str, sampling: str,
+                      regions: Optional[Collection[str]]) -> np.ndarray:
+    """
+    Run a block of trials of the riding-level model with the vectorized NumPy engine.
+
+    Every riding gets its baseline moved by its region's poll, then the same noise and draw as any other
+    seat. Arguments are as for run_vectorized_block.
+
+    Returns:
+        np.ndarray: A (variants, trials, parties) array of national seat counts
+    """
+    swung = [ridings.swung_shares(plan, parties, swing) for plan in plans]
+    seat_counts = np.zeros((len(plans), trials, len(parties)), dtype=np.int64)
+    for r, (lo, hi) in enumerate(zip(ridings.region_offsets[:-1].tolist(), ridings.region_offsets[1:].tolist())):
+        if regions is not None and ridings.regions[r] not in regions:
             continue
-        incoming_influence = 0.0
-        for neighbor in graph.predecessors(p):
-            if neighbor in original_polling and graph[neighbor][p]['weight'] > 0:
-                incoming_influence += original_polling[neighbor] * graph[neighbor][p]['weight']
-        adjusted_polling[p] += influence_factor * incoming_influence
+        seat_polls = np.stack([shares[lo:hi] for shares, _ in swung])
+        present = np.stack([mask[r] for _, mask in swung])
+        rng = region_generator(seed, ridings.regions[r], first_trial, hi - lo, len(parties), sampling)
+        seat_counts += simulate_province_vectorized(seat_polls, present, hi - lo, trials, np.asarray(margins), rng,
+                                                    sampling)
+        if on_progress is not None:
+            on_progress(hi / ridings.total_seats)
+    return seat_counts
+
+
+def _run_tree_block(plan: Dict[str, Dict[str, float]], parties: List[str], trials: int, margin: float, seed: int,
+                    first_trial: int, on_progress: Optional[Callable[[float], None]] = None) -> np.ndarray:
+    """
+    Run a block of trials by walking the election tree once per trial.
+
+    Every province walks its subtree with its own generator. A seat takes one uniform number per polled
+    party and one for the winner, so the province's trials are evenly spaced along its stream.
+
+    Args:
+        plan (Dict[str, Dict[str, float]]): Adjusted polling by province, from compile_simulation_plan
+        parties (List[str]): Party order used for the columns of the result
+        trials (int): Number of trials in the block
+        margin (float): Random margin to apply to polling
+        seed (int): Master seed of the run
+        first_trial (int): Number of the block's first trial within the run
+        on_progress (Optional[Callable[[float], None]]): Called with the fraction of the block done every
+            5% of its trials. Defaults to None.
+
+    Returns:
+        np.ndarray: A (trials, parties) array of national seat counts
+    """
+    flat_tree = get_flat_election_tree(SEATS_BY_PROVINCE)
+    flat_tree.reset_results()
+    provinces = [(node, trial_generator(seed, node.name, first_trial,
+                                        len(node.children) * (len(plan.get(node.name, {})) + 1)))
+                 for node in flat_tree.root.children]
+    column = {party: i for i, party in enumerate(parties)}
+    seat_counts = np.zeros((trials, len(parties)), dtype=np.int64)
+    report_every = max(1, trials // 20)
+    # RegionNode.simulate overwrites the results of every node it visits, so the tree does not need to be
+    # reset between trials
+    for trial in range(trials):
+        for node, rng in provinces:
+            for party, count in node.simulate(plan, None, margin, rng).items():
+                seat_counts[trial, column[party]] += count
+        if on_progress is not None and (trial + 1) % report_every == 0:
+            on_progress((trial + 1) / trials)
+    return seat_counts
+
+
+def _simulate_block(task: Tuple[str, Dict[str, Dict[str, float]], List[str], float, int, int, int,
+                                Optional[RidingTable], str, str],
+                    on_progress: Optional[Callable[[float], None]] = None) \
+        -> Tuple[np.ndarray, OutcomeStatistics]:
+    """
+    Simulate one block of trials and count its outcomes. This runs inside worker processes.
 
-    total = sum(adjusted_polling.values())
-    for p in adjusted_polling:
-        adjusted_polling[p] /= total
-    return adjusted_polling
+    Args:
+        task (Tuple): (engine, plan, parties, margin, trials, seed, first_trial, ridings, swing, sampling)
+        on_progress (Optional[Callable[[float], None]]): Called with the fraction of the block done.
+            Defaults to None.
 
+    Returns:
+        Tuple[np.ndarray, OutcomeStatistics]: SEAT_DTYPE seat counts of the block and its outcome counts
+    """
+    engine, plan, parties, margin, trials, seed, first_trial, ridings, swing, sampling = task
+    if engine == "vectorized":
+        seat_counts = run_vectorized_block([plan], parties, trials, [margin], seed, first_trial, on_progress,
+                                           ridings, swing, sampling)[0]
+    else:
+        seat_counts = _run_tree_block(plan, parties, trials, margin, seed, first_trial, on_progress)
+    # Blocks leave the worker in the compact dtype, which quarters what is pickled back to the parent
+    seat_counts = seat_counts.astype(SEAT_DTYPE)
+    return seat_counts, _count_wins(seat_counts, parties)
 
-def _simulate_trial(election_tree: RegionNode, polling_data: Dict[str, Any],
-                    voter_graph: Optional[nx.DiGraph], margin: float = 0.03) -> Dict[str, int]:
+
+def _simulate_paired_block(task: Tuple[List[Dict[str, Dict[str, float]]], List[str], List[float], int, int, int,
+                                       Optional[RidingTable], str, str]) -> List[Tuple[np.ndarray, OutcomeStatistics]]:
     """
-    Helper function to simulate a single trial.
+    Simulate one block of trials for several variants from shared random draws. This runs inside worker processes.
 
     Args:
-        election_tree (RegionNode): The root of the election tree.
-        polling_data (Dict[str, Any]): Polling data.
-        voter_graph (Optional[nx.DiGraph]): Voter transition graph.
-        margin (float): Margin parameter.
+        task (Tuple): (plans, parties, margins, trials, seed, first_trial, ridings, swing, sampling)
 
     Returns:
-        Dict[str, int]: Simulation results for the trial.
+        List[Tuple[np.ndarray, OutcomeStatistics]]: SEAT_DTYPE seat counts and outcome counts of each variant
     """
-    election_tree.reset_results()
-    return election_tree.simulate(polling_data, voter_graph, margin)
+    plans, parties, margins, trials, seed, first_trial, ridings, swing, sampling = task
+    seat_counts = run_vectorized_block(plans, parties, trials, margins, seed, first_trial, None, ridings, swing,
+                                       sampling).astype(SEAT_DTYPE)
+    return [(counts, _count_wins(counts, parties)) for counts in seat_counts]
 
 
-def run_simulation(polling_data: Dict[str, Any], trials: int = 1000, voter_graph: Optional[nx.DiGraph] = None)\
-        -> Tuple[Dict[str, List[int]], Dict[str, Dict[str, float]]]:
+@instrumented("win classification")
+def _count_wins(seat_counts: np.ndarray, parties: List[str]) -> OutcomeStatistics:
+    """
+    Classify every trial of a block in one vectorized pass, with the rules of classify_trials.
+
+    Args:
+        seat_counts (np.ndarray): A (trials, parties) array of national seat counts
+        parties (List[str]): Party of each column
+
+    Returns:
+        OutcomeStatistics: Outcome counts of the block
+    """
+    return OutcomeStatistics.from_seat_counts(parties, seat_counts)
+
+
+@instrumented()
+def run_simulation(polling_data: Dict[str, Any], trials: int = 1000, voter_graph: Optional[nx.DiGraph] = None,
+                   engine: str = "tree", workers: Optional[int] = None, seed: Optional[int] = None,
+                   margin: float = 0.03, progress: Optional[Callable[[int, int], None]] = None,
+                   ridings: Optional[RidingTable] = None, swing: str = SWING_METHOD, sampling: str = "random") \
+        -> Tuple[SeatDistribution, Dict[str, Dict[str, float]]]:
     """
     Run a full election simulation with multiple trials.
 
+    Two engines are available. The "tree" engine walks the election tree once per trial, while the
+    "vectorized" engine draws the noise for all trials and seats in batched NumPy calls and is much
+    faster for large trial counts. Both use the same seat model and return results of the same shape.
+
+    Every province draws from its own counter-based random stream derived from the master seed, so any
+    range of trials can be regenerated on its own with simulate_trial_range. Trials are split into blocks
+    of BLOCK_TRIALS, and when workers is greater than 1 the blocks are spread over a process pool; the
+    output for a given seed does not depend on the number of workers.
+
     Args:
         polling_data (Dict[str, Any]): Polling data by province
         trials (int, optional): Number of simulation trials. Defaults to 1000.
         voter_graph (Optional[nx.DiGraph], optional): Voter transition graph. Defaults to None.
+        engine (str, optional): Simulation engine, either "tree" or "vectorized". Defaults to "tree".
+        workers (Optional[int], optional): Number of worker processes. Defaults to None (run in-process).
+        seed (Optional[int], optional): Master seed. Defaults to None (fresh entropy for every run).
+        margin (float, optional): Random margin to apply to polling. Defaults to 0.03.
+        progress (Optional[Callable[[int, int], None]], optional): Called with the number of trials done and
+         the total as the run advances. An exception raised by it aborts the run. Defaults to None.
+        ridings (Optional[RidingTable], optional): Ridings to simulate instead of the placeholder seats of
+         SEATS_BY_PROVINCE, each from its previous result moved by its region's poll. Only the "vectorized"
+         engine supports them. Defaults to None.
+        swing (str, optional): How polls move the riding baselines, "uniform" or "proportional".
+         Defaults to SWING_METHOD.
+        sampling (str, optional): How the vectorized engine draws its noise, one of SAMPLING_METHODS. The
+         variance-reduction methods can reach the precision of independent draws with fewer trials, by an
+         amount that depends on the polls; check the "_se" statistics. Defaults to "random".
 
     Returns:
-        Tuple[Dict[str, List[int]], Dict[str, Dict[str, float]]]:
-         A tuple containing seat distribution and win statistics.
+        Tuple[SeatDistribution, Dict[str, Dict[str, float]]]:
+         A tuple containing seat distribution and win statistics. The seat distribution can be used like
+         the dictionary of per-trial seat counts by party; call its to_dict() for plain lists. Besides the
+         "majority", "minority" and "no_win" probabilities, each party's win statistics hold its
+         probabilities of finishing "first" and "second" and the estimated standard errors "majority_se",
+         "minority_se" and "no_win_se". The seed, engine and sampling method are recorded in the seat
+         distribution's metadata, and its outcomes give coalition majority probabilities and seat quantiles.
     """
-    election_tree = build_election_tree(SEATS_BY_PROVINCE)
-    all_parties = {party for province_poll in polling_data.values() for party in province_poll.keys()}
+    if engine not in ("tree", "vectorized"):
+        raise ValueError(f"Unknown simulation engine: {engine}")
+    if ridings is not None and engine != "vectorized":
+        raise ValueError("Riding-level simulation needs the vectorized engine")
+    if sampling not in SAMPLING_METHODS:
+        raise ValueError(f"Unknown sampling method: {sampling}")
+    if sampling != "random" and engine != "vectorized":
+        raise ValueError(f"The {sampling} sampling method needs the vectorized engine")
+    if seed is None:
+        seed = new_seed()
 
-    seat_distribution = {party: [] for party in all_parties}
-    win_stats = {party: {"majority": 0, "minority": 0, "no_win": 0} for party in all_parties}
+    instrumentation.count("trials", trials)
+    all_parties = party_order(polling_data)
+    plan = compile_simulation_plan(polling_data, voter_graph)
+    tasks = [(engine, plan, all_parties, margin, min(BLOCK_TRIALS, trials - start), seed, start, ridings, swing,
+              sampling) for start in range(0, trials, BLOCK_TRIALS)]
 
-    def update_win_stats(results: Dict[str, int]) -> None:
-        """
-            Update the win statistics based on the election results.
+    # Every block is copied into its rows of one preallocated array as it arrives, so the whole run is never
+    # held twice
+    seat_counts = np.empty((trials, len(all_parties)), dtype=SEAT_DTYPE)
+    outcomes = OutcomeStatistics(all_parties)
+    if workers is not None and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            for task, (block_counts, block_outcomes) in zip(tasks, executor.map(_simulate_block, tasks)):
+                seat_counts[task[6]:task[6] + task[4]] = block_counts
+                outcomes.merge(block_outcomes)
+                if progress is not None:
+                    progress(task[6] + task[4], trials)
+    else:
+        def report_block(fraction: float, done: int, size: int) -> None:
+            progress(done + int(fraction * size), trials)
 
-            Args:
-                results (Dict[str, int]): The election results mapping each party to its seat count.
-            Returns:
-                None: Updates the `win_stats` dictionary in place.
-        """
-        top_party = max(results, key=results.get)
-        top_seats = results[top_party]
-        ties = [party for party, count in results.items() if count == top_seats]
+        for task in tasks:
+            on_progress = None if progress is None else functools.partial(report_block, done=task[6], size=task[4])
+            block_counts, block_outcomes = _simulate_block(task, on_progress)
+            seat_counts[task[6]:task[6] + task[4]] = block_counts
+            outcomes.merge(block_outcomes)
 
-        if len(ties) == 1:
-            if top_seats >= MAJORITY_THRESHOLD:
-                win_stats[top_party]["majority"] += 1
-            else:
-                win_stats[top_party]["minority"] += 1
+    seat_distribution = SeatDistribution(all_parties, seat_counts,
+                                         {"seed": seed, "engine": engine, "sampling": sampling})
+    seat_distribution.outcomes = outcomes
 
-    for _ in range(trials):
-        results = _simulate_trial(election_tree, polling_data, voter_graph, margin=0.03)
-        for y, count in results.items():
-            seat_distribution[y].append(count)
-        update_win_stats(results)
+    return seat_distribution, win_statistics(seat_distribution, sampling, [task[4] for task in tasks])
 
-    for x in all_parties:
-        maj, minr = win_stats[x]["majority"], win_stats[x]["minority"]
-        win_stats[x]["no_win"] = trials - maj - minr
 
-        for stat in win_stats[x]:
-            win_stats[x][stat] /= trials
+@instrumented()
+def simulate_trial_range(polling_data: Dict[str, Any], seed: int, first_trial: int, trials: int,
+                         voter_graph: Optional[nx.DiGraph] = None, margin: float = 0.03,
+                         regions: Optional[Collection[str]] = None, ridings: Optional[RidingTable] = None,
+                         swing: str = SWING_METHOD) -> SeatDistribution:
+    """
+    Regenerate a range of trials of a seeded vectorized run, without simulating the trials before it.
+
+    The result equals rows first_trial to first_trial + trials of the seat distribution of
+    run_simulation(polling_data, engine="vectorized", seed=seed) with the same arguments, and takes time
+    proportional to the range alone.
 
-    return seat_distribution, win_stats
+    Args:
+        polling_data (Dict[str, Any]): Polling data by province
+        seed (int): Master seed of the run, from the metadata of its seat distribution
+        first_trial (int): First trial to regenerate
+        trials (int): Number of trials to regenerate
+        voter_graph (Optional[nx.DiGraph], optional): Voter transition graph. Defaults to None.
+        margin (float, optional): Random margin to apply to polling. Defaults to 0.03.
+        regions (Optional[Collection[str]], optional): Only count the seats of these provinces, or polling
+         regions when simulating ridings. Defaults to None (every seat).
+        ridings (Optional[RidingTable], optional): Ridings to simulate. Defaults to None.
+        swing (str, optional): How polls move the riding baselines. Defaults to SWING_METHOD.
+
+    Returns:
+        SeatDistribution: Seat counts of the regenerated trials
+    """
+    all_parties = party_order(polling_data)
+    plan = compile_simulation_plan(polling_data, voter_graph)
+    seat_counts = run_vectorized_block([plan], all_parties, trials, [margin], seed, first_trial, None, ridings,
+                                       swing, "random", regions)[0]
+    return SeatDistribution(all_parties, seat_counts, {"seed": seed, "engine": "vectorized", "sampling": "random",
+                                                       "first_trial": first_trial})
+
+
+@instrumented()
+def run_paired_simulation(polling_data: Dict[str, Any], variants: Dict[str, Dict[str, Any]], trials: int = 1000,
+                          workers: Optional[int] = None, seed: Optional[int] = None,
+                          progress: Optional[Callable[[int, int], None]] = None, ridings: Optional[RidingTable] = None,
+                          swing: str = SWING_METHOD, sampling: str = "random") \
+        -> Tuple[Dict[str, Tuple[SeatDistribution, Dict[str, Dict[str, float]]]], Dict[str, np.ndarray]]:
+    """
+    Simulate several scenario variants in a single pass from one shared set of random draws.
+
+    Each variant is a dictionary with any of the keys "voter_graph" (default None), "influence_factor"
+    (default 0.2) and "margin" (default 0.03). Because every variant sees the same noise in every trial,
+    the per-trial seat differences between variants isolate the effect of the changed inputs, which gives
+    much tighter estimates than comparing two independent runs, at a fraction of the cost.
+
+    Args:
+        polling_data (Dict[str, Any]): Polling data by province
+        variants (Dict[str, Dict[str, Any]]): Variant parameters keyed by variant name. The first variant
+            is the baseline that the others are compared with.
+        trials (int, optional): Number of simulation trials. Defaults to 1000.
+        workers (Optional[int], optional): Number of worker processes. Defaults to None (run in-process).
+        seed (Optional[int], optional): Master seed. Defaults to None (fresh entropy for every run).
+        progress (Optional[Callable[[int, int], None]], optional): Called with the number of trials done and
+         the total after every block. An exception raised by it aborts the run. Defaults to None.
+        ridings (Optional[RidingTable], optional): Ridings to simulate, as in run_simulation. Defaults to None.
+        swing (str, optional): How polls move the riding baselines. Defaults to SWING_METHOD.
+        sampling (str, optional): How the noise is drawn, one of SAMPLING_METHODS. Every variant uses the
+         same design. Defaults to "random".
+
+    Returns:
+        Tuple[Dict[str, Tuple[SeatDistribution, Dict[str, Dict[str, float]]]], Dict[str, np.ndarray]]:
+         The seat distribution and win statistics of each variant, in the format of run_simulation, and for
+         each variant the (trials, parties) array of its seat counts minus the baseline's in the same trial.
+    """
+    if not variants:
+        raise ValueError("At least one variant is required")
+    if sampling not in SAMPLING_METHODS:
+        raise ValueError(f"Unknown sampling method: {sampling}")
+    if seed is None:
+        seed = new_seed()
+
+    names = list(variants)
+    all_parties = party_order(polling_data)
+    plans = [compile_simulation_plan(polling_data, variants[name].get("voter_graph"),
+                                     variants[name].get("influence_factor", 0.2)) for name in names]
+    margins = [variants[name].get("margin", 0.03) for name in names]
+    tasks = [(plans, all_parties, margins, min(BLOCK_TRIALS, trials - start), seed, start, ridings, swing, sampling)
+             for start in range(0, trials, BLOCK_TRIALS)]
+
+    seat_counts = np.empty((len(names), trials, len(all_parties)), dtype=SEAT_DTYPE)
+    outcomes = [OutcomeStatistics(all_parties) for _ in names]
+
+    def collect(task: Tuple, block: List[Tuple[np.ndarray, OutcomeStatistics]]) -> None:
+        for v, (block_counts, block_outcomes) in enumerate(block):
+            seat_counts[v, task[5]:task[5] + task[3]] = block_counts
+            outcomes[v].merge(block_outcomes)
+        if progress is not None:
+            progress(task[5] + task[3], trials)
+
+    if workers is not None and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            for task, block in zip(tasks, executor.map(_simulate_paired_block, tasks)):
+                collect(task, block)
+    else:
+        for task in tasks:
+            collect(task, _simulate_paired_block(task))
+
+    results = {}
+    for v, name in enumerate(names):
+        distribution = SeatDistribution(all_parties, seat_counts[v],
+                                        {"seed": seed, "engine": "vectorized", "sampling": sampling})
+        distribution.outcomes = outcomes[v]
+        results[name] = (distribution, win_statistics(distribution, sampling, [task[3] for task in tasks]))
+
+    baseline = results[names[0]][0].seat_counts.astype(np.int32)
+    differences = {name: results[name][0].seat_counts.astype(np.int32) - baseline for name in names}
+    return results, differences
+
+
+def _wilson_width(successes: float, trials: int, z: float) -> float:
+    """
+    Return the width of the Wilson score interval for a binomial proportion.
+
+    Unlike the normal approximation, the Wilson interval does not collapse to zero width when no
+    successes have been seen yet, so lopsided races still need a reasonable number of trials.
+
+    Args:
+        successes (float): Number of trials in which the event happened
+        trials (int): Number of trials
+        z (float): Standard normal quantile of the confidence level
+
+    Returns:
+        float: Width of the interval
+    """
+    p = successes / trials
+    denominator = 1 + z ** 2 / trials
+    return 2 * z * (p * (1 - p) / trials + z ** 2 / (4 * trials ** 2)) ** 0.5 / denominator
+
+
+def iter_simulation(polling_data: Dict[str, Any], voter_graph: Optional[nx.DiGraph] = None,
+                    max_trials: int = 100000, batch_size: int = 1000, engine: str = "vectorized",
+                    seed: Optional[int] = None, target_width: Optional[float] = None,
+                    confidence: float = 0.95, margin: float = 0.03, ridings: Optional[RidingTable] = None,
+                    swing: str = SWING_METHOD) -> Iterator[Dict[str, Any]]:
+    """
+    Run the simulation in batches and yield running results after every batch.
+
+    Every yielded summary is a dictionary with the keys
+        "trials": number of trials simulated so far,
+        "seed": master seed of the run,
+        "win_stats": win probabilities in the same format as run_simulation,
+        "seat_means": mean seat count of each party,
+        "seat_ranges": 5th and 95th percentile seat counts of each party,
+        "ci_width": widest confidence interval over every party's majority and minority probability,
+        "converged": whether ci_width is below target_width.
+
+    When target_width is given the generator stops by itself once converged, otherwise it runs until
+    max_trials. Every trial draws the same random numbers as the same trial of run_simulation with the
+    same seed and engine, whatever the batch size.
+
+    Args:
+        polling_data (Dict[str, Any]): Polling data by province
+        voter_graph (Optional[nx.DiGraph], optional): Voter transition graph. Defaults to None.
+        max_trials (int, optional): Maximum number of trials. Defaults to 100000.
+        batch_size (int, optional): Number of trials between summaries. Defaults to 1000.
+        engine (str, optional): Simulation engine, either "tree" or "vectorized". Defaults to "vectorized".
+        seed (Optional[int], optional): Master seed. Defaults to None (fresh entropy).
+        target_width (Optional[float], optional): Confidence interval width to stop at. Defaults to None.
+        confidence (float, optional): Confidence level of the intervals. Defaults to 0.95.
+        margin (float, optional): Random margin to apply to polling. Defaults to 0.03.
+        ridings (Optional[RidingTable], optional): Ridings to simulate, as in run_simulation. Only the
+         "vectorized" engine supports them. Defaults to None.
+        swing (str, optional): How polls move the riding baselines, "uniform" or "proportional".
+         Defaults to SWING_METHOD.
+
+    Yields:
+        Dict[str, Any]: Running summary of the simulation
+    """
+    if engine not in ("tree", "vectorized"):
+        raise ValueError(f"Unknown simulation engine: {engine}")
+    if ridings is not None and engine != "vectorized":
+        raise ValueError("Riding-level simulation needs the vectorized engine")
+    if seed is None:
+        seed = new_seed()
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    all_parties = party_order(polling_data)
+    plan = compile_simulation_plan(polling_data, voter_graph)
+    outcomes = OutcomeStatistics(all_parties)
+    seat_totals = np.zeros(len(all_parties), dtype=np.int64)
+    done = 0
+
+    # Only running totals are kept, so every summary costs the same however many trials came before
+    while done < max_trials:
+        size = min(batch_size, max_trials - done)
+        seat_counts, block_outcomes = _simulate_block(
+            (engine, plan, all_parties, margin, size, seed, done, ridings, swing, "random"))
+        outcomes.merge(block_outcomes)
+        seat_totals += seat_counts.sum(axis=0)
+        done += size
+
+        ci_width = max(_wilson_width(int(wins), done, z)
+                       for counts in (outcomes.majority, outcomes.minority) for wins in counts)
+
+        converged = target_width is not None and ci_width <= target_width
+        yield {
+            "trials": done,
+            "seed": seed,
+            "win_stats": outcomes.win_stats(),
+            "seat_means": dict(zip(all_parties, (seat_totals / done).tolist())),
+            "seat_ranges": outcomes.seat_quantiles([0.05, 0.95]),
+            "ci_width": ci_width,
+            "converged": converged,
+        }
+        if converged:
+            return
 
 
 if __name__ == "__main__":
-    # Test the election model with sample data
+    # Test the election model with sample data; pass --offline to use the latest archived polls
+    import sys
     from scraper import scrape_polling_data
     from graph import build_historical_voter_graph
     from data_loader import load_historical_data
 
     # Get sample data
-    sample_polling = scrape_polling_data()
+    sample_polling = scrape_polling_data(offline="--offline" in sys.argv)
     if sample_polling:
-        votes_2015, votes_2019, votes_2021 = load_historical_data()
-        historical_graph = build_historical_voter_graph(votes_2015, votes_2019, votes_2021)
+        historical_graph = build_historical_voter_graph(*load_historical_data())
 
         # Run a small test simulation
         seats, stats = run_simulation(sample_polling, trials=100, voter_graph=historical_graph)
@@ -272,6 +1273,19 @@ if __name__ == "__main__":
         for party, prob in stats.items():
             print(f"{party}: {100 * prob['majority']:.1f}% majority, {100 * prob['minority']:.1f}% minority")
 
+        # Two-party coalitions most likely to hold a majority together, and every party's 90% seat range
+        coalitions = seats.outcomes.coalition_majorities(max_parties=2)
+        for members, prob in sorted(coalitions.items(), key=lambda item: -item[1])[:3]:
+            print(f"{' + '.join(members)}: {100 * prob:.1f}% majority together")
+        print(f"Seat ranges (5th, 50th, 95th percentile): {seats.outcomes.seat_quantiles()}")
+
+        # Compare the standard errors of the sampling methods with those of 1000 independent trials
+        for method, method_trials in [("random", 1000)] + [(m, 250) for m in SAMPLING_METHODS]:
+            _, stats = run_simulation(sample_polling, trials=method_trials, voter_graph=historical_graph,
+                                      engine="vectorized", sampling=method)
+            worst = max(stats[p][f"{stat}_se"] for p in stats for stat in ("majority", "minority"))
+            print(f"{method} ({method_trials} trials): largest standard error {100 * worst:.2f} points")
+
 
 if __name__ == '__main__':
     import doctest
@@ -0,0 +1,185 @@
+"""
+Canadian Election Simulator - Exact Seat Distribution Model
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+This module computes seat distributions and win probabilities analytically instead of by Monte Carlo.
+
+Within a province every seat gets the same polling input and independent noise, so every seat has the
+same chance of going to each party. The seat count of a province is then multinomial, and the national
+seat count is the sum of independent provincial counts, which can be computed by convolution.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import networkx as nx
+from config import SEATS_BY_PROVINCE, MAJORITY_THRESHOLD
+from election_model import compile_simulation_plan, get_flat_election_tree, party_order
+
+
+def seat_win_probabilities(poll_vector: np.ndarray, present: np.ndarray, margin: float = 0.03,
+                           samples: int = 20000, seed: int = 0) -> np.ndarray:
+    """
+    Estimate the probability that a single seat is won by each party.
+
+    Uses a fixed sample over the noise model of simulate_single_seat: for every noise draw the chance
+    of each party winning is its noisy share divided by the total, and these chances are averaged.
+
+    Args:
+        poll_vector (np.ndarray): Adjusted polling for the province, one entry per party
+        present (np.ndarray): Boolean mask of the parties that appear in the province's poll
+        margin (float, optional): Random margin to apply to polling. Defaults to 0.03.
+        samples (int, optional): Number of noise draws to average over. Defaults to 20000.
+        seed (int, optional): Seed of the fixed sample. Defaults to 0.
+
+    Returns:
+        np.ndarray: Win probability of each party, summing to 1
+    """
+    rng = np.random.default_rng(seed)
+    noise = rng.uniform(-margin, margin, size=(samples, poll_vector.shape[0]))
+    sampled = np.clip(poll_vector + noise, 0.0, 1.0) * present
+    totals = sampled.sum(axis=1, keepdims=True)
+    shares = np.divide(sampled, totals, out=np.zeros_like(sampled), where=totals > 0)
+    return shares.mean(axis=0)
+
+
+def _province_joint(num_seats: int, q_first: float, q_second: float) -> np.ndarray:
+    """
+    Compute the joint seat distribution of two parties in a province by dynamic programming.
+
+    Seats are added one at a time: each new seat goes to the first party, the second party or
+    anyone else with the given probabilities.
+
+    Args:
+        num_seats (int): Number of seats in the province
+        q_first (float): Probability that a seat goes to the first party
+        q_second (float): Probability that a seat goes to the second party
+
+    Returns:
+        np.ndarray: A (num_seats + 1, num_seats + 1) array where entry [i, j] is the probability that
+        the first party wins i seats and the second party wins j seats
+    """
+    q_rest = max(0.0, 1.0 - q_first - q_second)
+    joint = np.zeros((num_seats + 1, num_seats + 1))
+    joint[0, 0] = 1.0
+    for _ in range(num_seats):
+        step = joint * q_rest
+        step[1:, :] += joint[:-1, :] * q_first
+        step[:, 1:] += joint[:, :-1] * q_second
+        joint = step
+    return joint
+
+
+def _province_marginal(num_seats: int, q: float) -> np.ndarray:
+    """
+    Compute the seat distribution of one party in a province by dynamic programming.
+
+    Args:
+        num_seats (int): Number of seats in the province
+        q (float): Probability that a seat goes to the party
+
+    Returns:
+        np.ndarray: Array of length num_seats + 1 with the probability of each seat count
+    """
+    marginal = np.zeros(num_seats + 1)
+    marginal[0] = 1.0
+    for _ in range(num_seats):
+        step = marginal * (1 - q)
+        step[1:] += marginal[:-1] * q
+        marginal = step
+    return marginal
+
+
+def exact_seat_distribution(polling_data: Dict[str, Any], voter_graph: Optional[nx.DiGraph] = None,
+                            margin: float = 0.03, samples: int = 20000) \
+        -> Tuple[Dict[str, np.ndarray], Dict[str, Dict[str, float]]]:
+    """
+    Compute the national seat distribution and win statistics without per-trial sampling.
+
+    The national seat distribution of every party is exact given the per-seat win probabilities.
+    Majority probabilities follow directly from it. Deciding who finishes first needs the joint
+    distribution of all parties, which is too large to enumerate, so the joint distribution of the
+    two parties with the most expected seats is computed exactly and every other party is assumed
+    never to finish first short of a majority. In Canadian elections this is the case in practice,
+    and the results match the Monte Carlo win_stats of run_simulation within sampling error.
+
+    Args:
+        polling_data (Dict[str, Any]): Polling data by province
+        voter_graph (Optional[nx.DiGraph], optional): Voter transition graph. Defaults to None.
+        margin (float, optional): Random margin to apply to polling. Defaults to 0.03.
+        samples (int, optional): Noise draws used to estimate per-seat win probabilities. Defaults to 20000.
+
+    Returns:
+        Tuple[Dict[str, np.ndarray], Dict[str, Dict[str, float]]]:
+         The probability of each national seat count for every party, and win statistics in the
+         same format as run_simulation.
+    """
+    parties = party_order(polling_data)
+    plan = compile_simulation_plan(polling_data, voter_graph)
+
+    province_probabilities: List[Tuple[int, np.ndarray]] = []
+    flat_tree = get_flat_election_tree(SEATS_BY_PROVINCE)
+    for province, num_seats in zip(flat_tree.provinces, flat_tree.province_seats.tolist()):
+        if province not in plan or not plan[province]:
+            raise ValueError(f"No polling data for province: {province}")
+        adjusted = plan[province]
+        poll_vector = np.array([adjusted.get(p, 0.0) for p in parties])
+        present = np.array([p in adjusted for p in parties])
+        province_probabilities.append((num_seats, seat_win_probabilities(poll_vector, present, margin, samples)))
+
+    seat_pmfs = {}
+    for i, party in enumerate(parties):
+        national = np.ones(1)
+        for num_seats, q in province_probabilities:
+            national = np.convolve(national, _province_marginal(num_seats, q[i]))
+        seat_pmfs[party] = national
+
+    expected = sum(num_seats * q for num_seats, q in province_probabilities)
+    first, second = np.argsort(-expected)[:2] if len(parties) > 1 else (0, 0)
+
+    win_stats = {party: {"majority": float(seat_pmfs[party][MAJORITY_THRESHOLD:].sum()), "minority": 0.0}
+                 for party in parties}
+    if first != second:
+        # SciPy takes longer to import than the whole computation, so only load it when it is needed
+        from scipy.signal import fftconvolve
+
+        joint = np.ones((1, 1))
+        for num_seats, q in province_probabilities:
+            joint = np.clip(fftconvolve(joint, _province_joint(num_seats, q[first], q[second])), 0.0, None)
+        seats_first, seats_second = np.indices(joint.shape)
+        below_majority = (seats_first < MAJORITY_THRESHOLD) & (seats_second < MAJORITY_THRESHOLD)
+        win_stats[parties[first]]["minority"] = float(joint[below_majority & (seats_first > seats_second)].sum())
+        win_stats[parties[second]]["minority"] = float(joint[below_majority & (seats_second > seats_first)].sum())
+
+    for party in parties:
+        win_stats[party]["no_win"] = max(0.0, 1.0 - win_stats[party]["majority"] - win_stats[party]["minority"])
+    return seat_pmfs, win_stats
+
+
+if __name__ == "__main__":
+    # Compare the exact model with a Monte Carlo run
+    import time
+    from scraper import scrape_polling_data
+    from election_model import run_simulation
+
+    sample_polling = scrape_polling_data()
+    if sample_polling:
+        start = time.time()
+        _, exact_stats = exact_seat_distribution(sample_polling)
+        print(f"Exact model took {1000 * (time.time() - start):.1f} ms")
+        _, mc_stats = run_simulation(sample_polling, trials=10000, engine="vectorized")
+        for party, prob in exact_stats.items():
+            print(f"{party}: exact {100 * prob['minority']:.1f}% minority, "
+                  f"Monte Carlo {100 * mc_stats[party]['minority']:.1f}% minority")
+
+
+if __name__ == '__main__':
+    import doctest
+    import python_ta
+
+    doctest.testmod()
+
+    python_ta.check_all(config={
+        'extra-imports': [],
+        'allowed-io': [],
+        'max-line-length': 120
+    })
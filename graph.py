@@ -4,10 +4,89 @@ Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Z
 
 This module handles building and manipulating voter transition graphs.
 """
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 import numpy as np
 import networkx as nx
-import plotly.graph_objects as go
 from config import PARTY_COLORS
+from instrumentation import instrumented
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+
+def election_share_arrays(elections: Sequence[Dict[str, Dict[str, float]]]) \
+        -> Tuple[List[str], List[str], np.ndarray, np.ndarray]:
+    """
+    Stack the provincial results of several elections into one array.
+
+    Args:
+        elections (Sequence[Dict[str, Dict[str, float]]]): Provincial voting data of each election
+
+    Returns:
+        Tuple[List[str], List[str], np.ndarray, np.ndarray]: The provinces and parties in order of first
+        appearance, an (elections, provinces, parties) array of vote shares, and a boolean array of the same
+        shape marking which parties appear in which province in which election
+    """
+    provinces: Dict[str, int] = {}
+    parties: Dict[str, int] = {}
+    for votes in elections:
+        for prov, prov_votes in votes.items():
+            provinces.setdefault(prov, len(provinces))
+            for party in prov_votes:
+                parties.setdefault(party, len(parties))
+
+    shares = np.zeros((len(elections), len(provinces), len(parties)))
+    present = np.zeros(shares.shape, dtype=bool)
+    for e, votes in enumerate(elections):
+        for prov, prov_votes in votes.items():
+            columns = [parties[party] for party in prov_votes]
+            shares[e, provinces[prov], columns] = list(prov_votes.values())
+            present[e, provinces[prov], columns] = True
+    return list(provinces), list(parties), shares, present
+
+
+def voter_transition_matrix(elections: Sequence[Dict[str, Dict[str, float]]]) -> "VoterTransitionMatrix":
+    """
+    Compute the voter transition weights between every pair of consecutive elections.
+
+    For each province in both elections of a pair, the flow from party A to a different party B is half
+    of the smaller of A's share in the earlier election and B's share in the later one. Flows are summed
+    over provinces and election pairs. All flows come from one broadcast minimum over an
+    (election pairs, provinces, parties, parties) array.
+
+    Args:
+        elections (Sequence[Dict[str, Dict[str, float]]]): Provincial voting data of each election, oldest first
+
+    Returns:
+        VoterTransitionMatrix: Summed transition weights, with only parties that have a flow in the graph
+    """
+    _, parties, shares, present = election_share_arrays(elections)
+    if len(elections) < 2:
+        return VoterTransitionMatrix(parties, np.zeros((len(parties), len(parties))), np.zeros(len(parties), bool))
+
+    prev_present, curr_present = present[:-1], present[1:]
+    in_both = prev_present.any(axis=2) & curr_present.any(axis=2)
+    flows = 0.5 * np.minimum(shares[:-1, :, :, None], shares[1:, :, None, :])
+    counted = prev_present[:, :, :, None] & curr_present[:, :, None, :] & in_both[:, :, None, None]
+    counted &= ~np.eye(len(parties), dtype=bool)
+    weights = np.where(counted & (flows > 0), flows, 0.0).sum(axis=(0, 1))
+
+    has_edge = weights > 0
+    in_graph = has_edge.any(axis=0) | has_edge.any(axis=1)
+    return VoterTransitionMatrix(parties, weights, in_graph)
+
+
+def build_voter_graph(elections: Sequence[Dict[str, Dict[str, float]]]) -> nx.DiGraph:
+    """
+    Builds a voter transition graph from an ordered list of elections.
+
+    Args:
+        elections (Sequence[Dict[str, Dict[str, float]]]): Provincial voting data of each election, oldest first
+
+    Returns:
+        networkx.DiGraph: Directed graph of the voter transitions between consecutive elections
+    """
+    return voter_transition_matrix(elections).to_graph()
 
 
 def build_voter_graph_from_history(votes_prev: dict, votes_curr: dict) -> nx.DiGraph:
@@ -21,30 +100,23 @@ def build_voter_graph_from_history(votes_prev: dict, votes_curr: dict) -> nx.DiG
     Returns:
         networkx.DiGraph: Directed graph representing voter transitions
     """
-    g = nx.DiGraph()
-    for prov in votes_prev:
-        if prov not in votes_curr:
-            continue
-        prev_data = votes_prev[prov]
-        curr_data = votes_curr[prov]
-
-        for from_party in prev_data:
-            for to_party in curr_data:
-                if from_party == to_party:
-                    continue
-                flow = min(prev_data[from_party], curr_data[to_party]) * 0.5
-                if flow > 0:
-                    if g.has_edge(from_party, to_party):
-                        g[from_party][to_party]['weight'] += flow
-                    else:
-                        g.add_edge(from_party, to_party, weight=flow)
-    return g
+    return build_voter_graph([votes_prev, votes_curr])
 
 
 def merge_graphs(g1: nx.DiGraph, g2: nx.DiGraph) -> nx.DiGraph:
     """
     Merges two voter transition graphs.
 
+    The weights of edges in both graphs are added, as one sum of the graphs' VoterTransitionMatrix weights
+    over a shared party index.
+
+    >>> g1, g2 = nx.DiGraph(), nx.DiGraph()
+    >>> g1.add_edge("LIB", "CON", weight=0.1)
+    >>> g2.add_edge("LIB", "CON", weight=0.2)
+    >>> g2.add_edge("NDP", "LIB", weight=0.3)
+    >>> sorted(merge_graphs(g1, g2).edges(data="weight"))
+    [('LIB', 'CON', 0.30000000000000004), ('NDP', 'LIB', 0.3)]
+
     Args:
         g1 (networkx.DiGraph): First graph
         g2 (networkx.DiGraph): Second graph
@@ -52,36 +124,146 @@ def merge_graphs(g1: nx.DiGraph, g2: nx.DiGraph) -> nx.DiGraph:
     Returns:
         networkx.DiGraph: Merged graph
     """
-    gr = nx.DiGraph()
-    for g in [g1, g2]:
-        for u, v, data in g.edges(data=True):
-            weight = data['weight']
-            if gr.has_edge(u, v):
-                gr[u][v]['weight'] += weight
-            else:
-                gr.add_edge(u, v, weight=weight)
-    return gr
-
-
-def build_historical_voter_graph(votes_2015: dict, votes_2019: dict, votes_2021: dict) -> nx.DiGraph:
+    parties = list(dict.fromkeys(list(PARTY_COLORS) + list(g1.nodes) + list(g2.nodes)))
+    weights = sum(VoterTransitionMatrix.from_graph(g, parties).weights for g in (g1, g2))
+    has_edge = weights != 0
+    return VoterTransitionMatrix(parties, weights, has_edge.any(axis=0) | has_edge.any(axis=1)).to_graph()
+
+
+def build_historical_voter_graph(*elections: dict) -> nx.DiGraph:
     """
     Builds a comprehensive voter transition graph from all historical data.
 
     Args:
-        votes_2015 (dict): 2015 election voting data
-        votes_2019 (dict): 2019 election voting data
-        votes_2021 (dict): 2021 election voting data
+        *elections (dict): Voting data of each election, oldest first
+         (e.g. votes_2015, votes_2019, votes_2021)
 
     Returns:
         networkx.DiGraph: Combined historical voter transition graph
     """
-    graph_2015_2019 = build_voter_graph_from_history(votes_2015, votes_2019)
-    graph_2019_2021 = build_voter_graph_from_history(votes_2019, votes_2021)
-    return merge_graphs(graph_2015_2019, graph_2019_2021)
+    return build_voter_graph(elections)
+
+
+class VoterTransitionMatrix:
+    """
+    A voter transition graph stored as a dense matrix over a fixed party index.
+
+    Entry [i, j] of the weight matrix is the weight of the edge from parties[i] to parties[j], or 0 when
+    there is no such edge. The party index defaults to the parties of config.PARTY_COLORS.
+
+    Attributes:
+        parties (List[str]): Party of each row and column
+        weights (np.ndarray): A (parties, parties) array of edge weights
+        in_graph (np.ndarray): Boolean mask of the parties that are nodes of the graph
+    """
+    parties: List[str]
+    weights: np.ndarray
+    in_graph: np.ndarray
+
+    def __init__(self, parties: Sequence[str], weights: np.ndarray, in_graph: Optional[np.ndarray] = None) -> None:
+        """
+        Initialize a VoterTransitionMatrix.
+
+        Args:
+            parties (Sequence[str]): Party of each row and column
+            weights (np.ndarray): A (parties, parties) array of edge weights
+            in_graph (Optional[np.ndarray]): Mask of the parties that are nodes. Defaults to every party.
+        """
+        self.parties = list(parties)
+        self.weights = np.asarray(weights, dtype=float)
+        self.in_graph = np.ones(len(self.parties), dtype=bool) if in_graph is None else np.asarray(in_graph, bool)
+        self.index = {party: i for i, party in enumerate(self.parties)}
+
+    @classmethod
+    def from_graph(cls, graph: nx.DiGraph, parties: Optional[Sequence[str]] = None) -> "VoterTransitionMatrix":
+        """
+        Convert a voter transition DiGraph into a matrix.
+
+        Args:
+            graph (nx.DiGraph): Voter transition graph
+            parties (Optional[Sequence[str]]): Party index. Defaults to the parties of PARTY_COLORS.
+                Nodes of the graph missing from the index are appended to it.
+
+        Returns:
+            VoterTransitionMatrix: The same graph as a matrix
+        """
+        parties = list(PARTY_COLORS) if parties is None else list(parties)
+        parties += [node for node in graph.nodes if node not in parties]
+        index = {party: i for i, party in enumerate(parties)}
+
+        weights = np.zeros((len(parties), len(parties)))
+        for u, v, d in graph.edges(data=True):
+            weights[index[u], index[v]] = d["weight"]
+        in_graph = np.array([party in graph for party in parties])
+        return cls(parties, weights, in_graph)
+
+    def to_graph(self) -> nx.DiGraph:
+        """
+        Convert the matrix back into a voter transition DiGraph.
+
+        Returns:
+            networkx.DiGraph: Graph with an edge for every nonzero weight
+        """
+        g = nx.DiGraph()
+        g.add_nodes_from(p for p, present in zip(self.parties, self.in_graph) if present)
+        for i, j in zip(*np.nonzero(self.weights)):
+            g.add_edge(self.parties[i], self.parties[j], weight=float(self.weights[i, j]))
+        return g
+
+    def poll_vector(self, polling: Dict[str, float]) -> np.ndarray:
+        """
+        Return a poll as a vector over the party index, with 0 for parties that are not polled.
+
+        Args:
+            polling (Dict[str, float]): Polling data for parties
+
+        Returns:
+            np.ndarray: Vector of poll numbers ordered like self.parties
+        """
+        return np.array([polling.get(p, 0.0) for p in self.parties])
+
+    def shift(self, polls: np.ndarray, present: np.ndarray, influence_factor: float = 0.2) -> np.ndarray:
+        """
+        Add the voter transition influence to one or many poll vectors, without renormalizing.
+
+        Every polled party that is a node of the graph, other than OTH, gains influence_factor times the
+        sum of its positive incoming edge weights, each multiplied by the poll of the source party.
+
+        Args:
+            polls (np.ndarray): A poll vector, or a (polls, parties) matrix with one poll per row
+            present (np.ndarray): Mask of polled parties, with the same shape as polls
+            influence_factor (float, optional): Factor to weight the graph influence. Defaults to 0.2.
+
+        Returns:
+            np.ndarray: Shifted polls with the same shape as polls
+        """
+        polls = np.where(present, polls, 0.0)
+        receives = present & self.in_graph
+        if "OTH" in self.index:
+            receives = receives & (np.arange(len(self.parties)) != self.index["OTH"])
+
+        incoming = polls @ np.clip(self.weights, 0.0, None)
+        return polls + influence_factor * incoming * receives
+
+    def adjust(self, polls: np.ndarray, present: np.ndarray, influence_factor: float = 0.2) -> np.ndarray:
+        """
+        Adjust one or many poll vectors for voter transitions and renormalize them.
+
+        Args:
+            polls (np.ndarray): A poll vector, or a (polls, parties) matrix with one poll per row
+            present (np.ndarray): Mask of polled parties, with the same shape as polls
+            influence_factor (float, optional): Factor to weight the graph influence. Defaults to 0.2.
+
+        Returns:
+            np.ndarray: Adjusted polls with the same shape as polls, each summing to 1
+        """
+        shifted = self.shift(polls, present, influence_factor)
+        return shifted / shifted.sum(axis=-1, keepdims=True)
 
 
 # --- UPDATED VOTER TRANSITION GRAPH FUNCTION ---
-def make_voter_graph_figure(graph: nx.DiGraph) -> go.Figure:
+@instrumented()
+def make_voter_graph_figure(graph: nx.DiGraph) -> "go.Figure":
     """
     Creates a Plotly figure of the voter transition graph with split colored segments.
     For each edge from party A to party B:
@@ -90,6 +272,9 @@ def make_voter_graph_figure(graph: nx.DiGraph) -> go.Figure:
     An arrow annotation (using the target color) indicates the transition direction.
     The percentage is normalized so that for each source party, the outgoing transitions sum to 100%.
     """
+    # Plotly is only needed for drawing, so the simulation core does not import it
+    import plotly.graph_objects as go
+
     edge_weight_threshold = 0.02  # Only draw edges above 2%
     seperation = 0.2              # Offset for overlapping edges
     radius = 3.0                  # Radius for circular layout
@@ -238,8 +423,7 @@ if __name__ == "__main__":
     # Test graph building (basic example)
     from data_loader import load_historical_data
 
-    votes_2015, votes_2019, votes_2021 = load_historical_data()
-    historical_graph = build_historical_voter_graph(votes_2015, votes_2019, votes_2021)
+    historical_graph = build_historical_voter_graph(*load_historical_data())
 
     print(f"Graph has {len(historical_graph.nodes())} nodes and {len(historical_graph.edges())} edges")
     for u, v, d in list(historical_graph.edges(data=True))[:5]:
@@ -0,0 +1,234 @@
+"""
+Canadian Election Simulator - Incremental Re-simulation
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+This module re-simulates only the provinces whose polls changed since an earlier run.
+
+Provinces are independent in the seat model, so the vectorized engine's trials for one province can be
+cached on their own. Every province draws its noise from its own counter-based random stream (see
+random_streams), so a province's cached trials stay valid for as long as its poll, the voter graph, the
+margin and the seed stay the same, and a new snapshot only costs the simulation of the provinces that
+moved. The national seat counts are the sum of the provincial blocks.
+
+The provinces draw from the same streams as in run_simulation, so the seat counts equal those of
+run_simulation with the vectorized engine and the same seed.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+import networkx as nx
+from config import SEATS_BY_PROVINCE, SWING_METHOD, SIMULATION_SEED, INCREMENTAL_CACHE_RUNS
+from election_model import (compile_simulation_plan, graph_fingerprint, poll_fingerprint, party_order,
+                            region_generator, simulate_province_vectorized, win_statistics, BLOCK_TRIALS,
+                            SAMPLING_METHODS)
+from result_cache import SimulationCache
+from ridings import RidingTable
+from simulation_results import SeatDistribution, OutcomeStatistics, SEAT_DTYPE
+from instrumentation import instrumented
+import instrumentation
+
+
+class IncrementalSimulator:
+    """
+    Simulates polling snapshots with the vectorized engine, reusing the cached trials of every province
+    whose inputs did not change.
+
+    Attributes:
+        voter_graph (Optional[nx.DiGraph]): Voter transition graph
+        margin (float): Random margin applied to polling
+        influence_factor (float): Influence factor of the voter transition graph
+        seed (int): Master seed
+        ridings (Optional[RidingTable]): Ridings to simulate, or None for the seats of SEATS_BY_PROVINCE
+        swing (str): How polls move the riding baselines
+        sampling (str): How the noise is drawn, one of SAMPLING_METHODS
+        max_runs (int): Number of runs whose blocks the cache can hold at once
+        cache (SimulationCache): Cached blocks of provincial seat counts, resized to hold max_runs runs
+        last_resimulated (List[str]): Provinces that had to be simulated in the latest run
+    """
+    voter_graph: Optional[nx.DiGraph]
+    margin: float
+    influence_factor: float
+    seed: int
+    ridings: Optional[RidingTable]
+    swing: str
+    sampling: str
+    max_runs: int
+    cache: SimulationCache
+    last_resimulated: List[str]
+
+    def __init__(self, voter_graph: Optional[nx.DiGraph] = None, margin: float = 0.03, influence_factor: float = 0.2,
+                 seed: int = SIMULATION_SEED, ridings: Optional[RidingTable] = None, swing: str = SWING_METHOD,
+                 sampling: str = "random", max_runs: int = INCREMENTAL_CACHE_RUNS) -> None:
+        """
+        Initialize an IncrementalSimulator with an empty cache.
+
+        Args:
+            voter_graph (Optional[nx.DiGraph], optional): Voter transition graph. Defaults to None.
+            margin (float, optional): Random margin applied to polling. Defaults to 0.03.
+            influence_factor (float, optional): Influence factor of the voter graph. Defaults to 0.2.
+            seed (int, optional): Master seed. Defaults to SIMULATION_SEED.
+            ridings (Optional[RidingTable], optional): Ridings to simulate. Defaults to None.
+            swing (str, optional): How polls move the riding baselines. Defaults to SWING_METHOD.
+            sampling (str, optional): One of SAMPLING_METHODS. Defaults to "random".
+            max_runs (int, optional): Number of runs whose blocks are kept. Defaults to INCREMENTAL_CACHE_RUNS.
+        """
+        if sampling not in SAMPLING_METHODS:
+            raise ValueError(f"Unknown sampling method: {sampling}")
+        self.voter_graph = voter_graph
+        self.margin = margin
+        self.influence_factor = influence_factor
+        self.seed = seed
+        self.ridings = ridings
+        self.swing = swing
+        self.sampling = sampling
+        self.max_runs = max_runs
+        self.cache = SimulationCache(max_runs)
+        self.last_resimulated = []
+        self._settings = (graph_fingerprint(voter_graph), margin, influence_factor, seed, sampling,
+                          ridings.fingerprint() if ridings is not None else "provinces", swing)
+        self._lock = threading.Lock()
+
+    def _regions(self) -> List[Tuple[str, int, int]]:
+        """
+        Return every simulated region with the range of its seats.
+        """
+        if self.ridings is not None:
+            offsets = self.ridings.region_offsets.tolist()
+            return [(region, offsets[r], offsets[r + 1]) for r, region in enumerate(self.ridings.regions)]
+        offsets = np.concatenate([[0], np.cumsum(list(SEATS_BY_PROVINCE.values()))]).tolist()
+        return [(province, offsets[i], offsets[i + 1]) for i, province in enumerate(SEATS_BY_PROVINCE)]
+
+    def _block_key(self, polling_data: Dict[str, Any], parties: List[str], region: str, trials: int,
+                   first_trial: int) -> tuple:
+        """
+        Return the cache key of one block of a region: everything its seat counts depend on.
+        """
+        return (region, poll_fingerprint(polling_data.get(region, {})), tuple(parties), trials, first_trial) \
+            + self._settings
+
+    @instrumented("IncrementalSimulator.run")
+    def run(self, polling_data: Dict[str, Any], trials: int = 1000,
+            progress: Optional[Callable[[int, int], None]] = None) \
+            -> Tuple[SeatDistribution, Dict[str, Dict[str, float]]]:
+        """
+        Simulate a polling snapshot, re-simulating only the provinces whose inputs changed.
+
+        Args:
+            polling_data (Dict[str, Any]): Polling data by province
+            trials (int, optional): Number of simulation trials. Defaults to 1000.
+            progress (Optional[Callable[[int, int], None]], optional): Called with the number of trials done and
+             the total, in proportion to the seats that need simulating. An exception raised by it aborts the
+             run. Defaults to None.
+
+        Returns:
+            Tuple[SeatDistribution, Dict[str, Dict[str, float]]]: Seat distribution and win statistics, in
+            the same format as run_simulation
+        """
+        parties = party_order(polling_data)
+        blocks = [(start, min(BLOCK_TRIALS, trials - start)) for start in range(0, trials, BLOCK_TRIALS)]
+        regions = self._regions()
+
+        # A run needs every block of every region, so the cache always holds max_runs runs of this size
+        self.cache.max_entries = max(self.cache.max_entries, self.max_runs * len(regions) * len(blocks))
+
+        missing = {}
+        for region, lo, hi in regions:
+            for start, size in blocks:
+                key = self._block_key(polling_data, parties, region, size, start)
+                if key not in self.cache:
+                    missing[key] = (region, lo, hi, size, start)
+
+        # Adjusted polls are memoized per province, so this is cheap when little changed
+        plan = compile_simulation_plan(polling_data, self.voter_graph, self.influence_factor)
+        shares = {}
+        if self.ridings is not None and missing:
+            shares = dict(zip(("polls", "present"), self.ridings.swung_shares(plan, parties, self.swing)))
+
+        # Seats times trials still to simulate, for progress reports
+        work = sum((hi - lo) * size for _, lo, hi, size, _ in missing.values())
+        done = 0
+        seat_counts = np.zeros((trials, len(parties)), dtype=SEAT_DTYPE)
+        for region, lo, hi in regions:
+            for start, size in blocks:
+                key = self._block_key(polling_data, parties, region, size, start)
+                counts = self.cache.get_or_compute(
+                    key, lambda r=region, lo=lo, hi=hi, size=size, start=start:
+                    self._simulate_region(plan, shares, parties, r, lo, hi, size, start))
+                seat_counts[start:start + size] += counts
+                if key in missing:
+                    done += (hi - lo) * size
+                    if progress is not None:
+                        progress(trials * done // work, trials)
+
+        with self._lock:
+            self.last_resimulated = list(dict.fromkeys(region for region, *_ in missing.values()))
+        instrumentation.count("resimulated provinces", len(self.last_resimulated))
+        distribution = SeatDistribution(parties, seat_counts,
+                                        {"seed": self.seed, "engine": "vectorized", "sampling": self.sampling})
+        distribution.outcomes = OutcomeStatistics.from_seat_counts(parties, seat_counts)
+        return distribution, win_statistics(distribution, self.sampling, [size for _, size in blocks])
+
+    def _simulate_region(self, plan: Dict[str, Dict[str, float]], shares: Dict[str, np.ndarray],
+                         parties: List[str], region: str, lo: int, hi: int, trials: int,
+                         first_trial: int) -> np.ndarray:
+        """
+        Simulate one block of trials of one region.
+
+        Returns:
+            np.ndarray: A (trials, parties) array of the region's seat counts
+        """
+        rng = region_generator(self.seed, region, first_trial, hi - lo, len(parties), self.sampling)
+        if self.ridings is not None:
+            if not shares:
+                # Only reached when a block was evicted between the lookup and its use
+                shares.update(zip(("polls", "present"), self.ridings.swung_shares(plan, parties, self.swing)))
+            poll_vectors = shares["polls"][np.newaxis, lo:hi]
+            present = shares["present"][np.newaxis, self.ridings.regions.index(region)]
+        else:
+            if not plan.get(region):
+                raise ValueError(f"No polling data for province: {region}")
+            poll_vectors = np.array([[plan[region].get(p, 0.0) for p in parties]])
+            present = np.array([[p in plan[region] for p in parties]])
+        counts = simulate_province_vectorized(poll_vectors, present, hi - lo, trials, np.array([self.margin]), rng,
+                                              self.sampling)[0]
+        return counts.astype(SEAT_DTYPE)
+
+    def describe(self) -> str:
+        """
+        Return a one-line summary of the latest run for the dashboard status line.
+        """
+        with self._lock:
+            resimulated = list(self.last_resimulated)
+        if not resimulated:
+            return "Last run reused every province"
+        return (f"Last run re-simulated {len(resimulated)} of {len(self._regions())} regions "
+                f"({', '.join(resimulated)})")
+
+
+if __name__ == "__main__":
+    # Simulate a snapshot, then again after moving one province's poll
+    import doctest
+    import time
+    import python_ta
+    from scraper import scrape_polling_data
+
+    sample_polling = scrape_polling_data()
+    if sample_polling:
+        simulator = IncrementalSimulator()
+        for label in ("first run", "unchanged", "one province moved"):
+            if label == "one province moved":
+                province = next(iter(sample_polling))
+                party = next(iter(sample_polling[province]))
+                sample_polling[province][party] += 0.01
+            start = time.time()
+            simulator.run(sample_polling, trials=10000)
+            print(f"{label}: {1000 * (time.time() - start):.1f} ms. {simulator.describe()}")
+
+    doctest.testmod()
+
+    python_ta.check_all(config={
+        'extra-imports': [],
+        'allowed-io': [],
+        'max-line-length': 120
+    })
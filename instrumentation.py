@@ -0,0 +1,222 @@
+"""
+Canadian Election Simulator - Instrumentation
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+This module times named stages of the simulation pipeline and counts events, so that a slow run can be
+broken down into scraping, poll adjustment, sampling, aggregation and figure building.
+
+Nothing is recorded unless a recorder is active on the current thread:
+
+    with record(profile=True) as recorder:
+        run_simulation(polls)
+    print(recorder.report())
+
+Instrumented functions check a global count of active recorders and otherwise call straight through,
+so the cost when recording is off is one extra function call. Span times are inclusive: a span includes the
+time of the spans nested inside it, and recursive calls are only timed at the outermost level. Work done
+in other threads or in worker processes is not recorded.
+"""
+
+import cProfile
+import functools
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Number of functions listed in the profile section of a report
+PROFILE_TOP_FUNCTIONS = 15
+
+
+class _ThreadState(threading.local):
+    """
+    The recorder of each thread. The class attribute makes the lookup cheap when no recorder was ever set.
+    """
+    recorder: Optional["Recorder"] = None
+
+
+_state = _ThreadState()
+
+# Number of recorders active in any thread, so instrumented calls can skip the thread-local lookup entirely
+_active_recorders = 0
+_active_lock = threading.Lock()
+
+
+class Recorder:
+    """
+    Collects span timings and counters for one run.
+
+    Attributes:
+        spans (Dict[str, List[float]]): Number of calls and total seconds of each span
+        counters (Dict[str, int]): Value of each counter
+        profile (Optional[List[Dict[str, Any]]]): Slowest functions by cumulative time, if the run was profiled
+    """
+    spans: Dict[str, List[float]]
+    counters: Dict[str, int]
+    profile: Optional[List[Dict[str, Any]]]
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty Recorder.
+        """
+        self.spans = {}
+        self.counters = {}
+        self.profile = None
+        self._open: Dict[str, int] = {}
+        self._start = time.perf_counter()
+        self._elapsed: Optional[float] = None
+
+    def add_span(self, name: str, seconds: float) -> None:
+        """
+        Add one call of a span.
+        """
+        span = self.spans.setdefault(name, [0, 0.0])
+        span[0] += 1
+        span[1] += seconds
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Return the recorded timings as a JSON-serializable dictionary, with times in milliseconds.
+        """
+        elapsed = time.perf_counter() - self._start if self._elapsed is None else self._elapsed
+        report: Dict[str, Any] = {
+            "total_ms": round(1000 * elapsed, 3),
+            "spans": {name: {"calls": int(calls), "total_ms": round(1000 * seconds, 3)}
+                      for name, (calls, seconds) in sorted(self.spans.items(), key=lambda item: -item[1][1])},
+            "counters": dict(self.counters),
+        }
+        if self.profile is not None:
+            report["profile"] = self.profile
+        return report
+
+
+def active_recorder() -> Optional[Recorder]:
+    """
+    Return the recorder of the current thread, or None when nothing is being recorded.
+    """
+    return _state.recorder
+
+
+@contextmanager
+def record(profile: bool = False) -> Iterator[Recorder]:
+    """
+    Record the spans and counters of everything run on this thread inside the with statement.
+
+    Args:
+        profile (bool, optional): Whether to also run cProfile and keep the slowest functions in the
+         recorder's profile. Defaults to False.
+
+    Yields:
+        Recorder: The recorder collecting this run
+    """
+    global _active_recorders
+    recorder = Recorder()
+    previous = active_recorder()
+    _state.recorder = recorder
+    with _active_lock:
+        _active_recorders += 1
+    profiler = cProfile.Profile() if profile else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield recorder
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            recorder.profile = _top_functions(profiler)
+        recorder._elapsed = time.perf_counter() - recorder._start
+        _state.recorder = previous
+        with _active_lock:
+            _active_recorders -= 1
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time the body of the with statement as a span of the active recorder, if there is one.
+
+    Args:
+        name (str): Name of the span
+    """
+    recorder = active_recorder()
+    if recorder is None or recorder._open.get(name):
+        yield
+        return
+    recorder._open[name] = 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add_span(name, time.perf_counter() - start)
+        recorder._open[name] = 0
+
+
+def instrumented(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorate a function so that every call is timed as a span while recording.
+
+    Args:
+        name (Optional[str], optional): Name of the span. Defaults to the function's qualified name.
+
+    Returns:
+        Callable[[Callable], Callable]: The decorator
+    """
+    def decorate(func: Callable) -> Callable:
+        label = func.__qualname__ if name is None else name
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _active_recorders:
+                return func(*args, **kwargs)
+            recorder = _state.recorder
+            if recorder is None or recorder._open.get(label):
+                return func(*args, **kwargs)
+            recorder._open[label] = 1
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.add_span(label, time.perf_counter() - start)
+                recorder._open[label] = 0
+        return wrapper
+    return decorate
+
+
+def count(name: str, amount: int = 1) -> None:
+    """
+    Add to a counter of the active recorder, if there is one.
+
+    Args:
+        name (str): Name of the counter
+        amount (int, optional): Amount to add. Defaults to 1.
+    """
+    recorder = _state.recorder
+    if recorder is not None:
+        recorder.counters[name] = recorder.counters.get(name, 0) + amount
+
+
+def _top_functions(profiler: cProfile.Profile) -> List[Dict[str, Any]]:
+    """
+    Return the functions with the highest cumulative time in a profile.
+    """
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({"function": f"{function} ({filename.rsplit('/', 1)[-1]}:{line})", "calls": calls,
+                     "own_ms": round(1000 * own, 3), "cumulative_ms": round(1000 * cumulative, 3)})
+    rows.sort(key=lambda row: -row["cumulative_ms"])
+    return rows[:PROFILE_TOP_FUNCTIONS]
+
+
+if __name__ == '__main__':
+    import doctest
+    import python_ta
+
+    doctest.testmod()
+
+    python_ta.check_all(config={
+        'extra-imports': [],
+        'allowed-io': [],
+        'max-line-length': 120
+    })
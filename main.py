@@ -6,37 +6,131 @@ This module serves as the entry point for the Canadian Election Simulator applic
 It orchestrates the loading of data, building of models, and running the simulation dashboard.
 """
 
+import argparse
+import importlib
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from data_loader import load_historical_data
-from graph import build_historical_voter_graph
-from dashboard import create_dashboard
+# Project modules in the order startup imports them. The simulation core (data_loader, graph, ridings and
+# election_model) does not import Dash, Plotly or Selenium; only the dashboard does.
+STARTUP_MODULES = ["data_loader", "graph", "ridings", "election_model", "dashboard"]
 
+# Third-party packages worth reporting when profiling imports
+HEAVY_PACKAGES = {"numpy", "pandas", "networkx", "scipy", "plotly", "dash", "flask", "selenium"}
 
-def initialize_system():
+
+def profile_imports(modules: Optional[List[str]] = None) -> List[Tuple[str, float, List[str]]]:
+    """
+    Import modules one at a time, timing each import.
+
+    A module's time includes the third-party packages it is the first to import.
+
+    Args:
+        modules (Optional[List[str]], optional): Modules to import, in order. Defaults to STARTUP_MODULES.
+
+    Returns:
+        List[Tuple[str, float, List[str]]]: Each module with its import time in seconds and the heavy
+        packages that it loaded
+    """
+    results = []
+    for name in STARTUP_MODULES if modules is None else modules:
+        before = {module.split(".")[0] for module in sys.modules}
+        start = time.perf_counter()
+        importlib.import_module(name)
+        elapsed = time.perf_counter() - start
+        loaded = {module.split(".")[0] for module in sys.modules} - before
+        results.append((name, elapsed, sorted(loaded & HEAVY_PACKAGES)))
+    return results
+
+
+@contextmanager
+def _timed_stage(stage_times: Optional[Dict[str, float]], stage: str) -> Iterator[None]:
+    """
+    Record how long the body of the with statement takes in stage_times, if it is given.
+    """
+    start = time.perf_counter()
+    yield
+    if stage_times is not None:
+        stage_times[stage] = time.perf_counter() - start
+
+
+def initialize_system(offline: bool = False, stage_times: Optional[Dict[str, float]] = None):
     """
     Initialize the election simulation system by loading data and building models.
 
+    Modules are imported here rather than at the top of the file, so that importing main stays cheap
+    and the dashboard's dependencies are only loaded when the app is created.
+
+    Args:
+        offline (bool): Whether to run from the archived polling data without scraping. Defaults to False.
+        stage_times (Optional[Dict[str, float]]): If given, filled with the seconds taken by the
+         "data load", "graph build", "riding load" and "app creation" stages. Defaults to None.
+
     Returns:
         tuple: Contains the voter graph and app instance
     """
+    from data_loader import load_historical_data
+    from graph import build_historical_voter_graph
+    from ridings import load_riding_table
+
     # Load historical election data
-    votes_2015, votes_2019, votes_2021 = load_historical_data()
+    with _timed_stage(stage_times, "data load"):
+        elections = load_historical_data()
 
     # Build voter transition graph from historical data
-    historical_voter_graph = build_historical_voter_graph(votes_2015, votes_2019, votes_2021)
+    with _timed_stage(stage_times, "graph build"):
+        historical_voter_graph = build_historical_voter_graph(*elections)
+
+    # Load the ridings and their previous results, or the fallback built from the provincial results
+    with _timed_stage(stage_times, "riding load"):
+        ridings = load_riding_table()
 
     # Create Dash app
-    app = create_dashboard(historical_voter_graph)
+    with _timed_stage(stage_times, "app creation"):
+        from dashboard import create_dashboard
+        app = create_dashboard(historical_voter_graph, offline=offline, ridings=ridings)
 
     return historical_voter_graph, app
 
 
+def profile_startup() -> None:
+    """
+    Print the import time of every startup module and the time of every initialization stage.
+
+    The system is always initialized offline, so profiling never starts the background scraper or a browser
+    and the timings do not depend on the network.
+    """
+    print("Import times:")
+    for name, elapsed, loaded in profile_imports():
+        print(f"  {name:<16} {1000 * elapsed:8.1f} ms  {', '.join(loaded)}")
+
+    stage_times: Dict[str, float] = {}
+    initialize_system(offline=True, stage_times=stage_times)
+    print("Initialization stages:")
+    for stage, elapsed in stage_times.items():
+        print(f"  {stage:<16} {1000 * elapsed:8.1f} ms")
+
+
 def main():
     """
     Main function to initialize and run the election simulator.
     """
+    parser = argparse.ArgumentParser(description="Canadian Election Simulator")
+    parser.add_argument("--offline", action="store_true",
+                        help="use the latest archived polling snapshot instead of scraping")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print per-module import times and per-stage initialization times, then exit; "
+                             "always runs offline")
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        profile_startup()
+        return
+
     print("Initializing Canadian Election Simulator...")
-    historical_voter_graph, app = initialize_system()
+    _, app = initialize_system(offline=args.offline)
 
     print("Starting simulator dashboard...")
     app.run(debug=True, port=8050, use_reloader=False)
@@ -0,0 +1,160 @@
+"""
+Canadian Election Simulator - Poll Archive
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+This module stores every polling snapshot in a local SQLite table so the simulator can run offline.
+
+Snapshots are stored in long format, one row per (timestamp, province, party), with an index on the
+timestamp so that the latest snapshot and time ranges can be read without scanning the whole table.
+"""
+
+import contextlib
+import sqlite3
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config import POLL_ARCHIVE_PATH
+
+PollSnapshot = Dict[str, Dict[str, float]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS polls (
+    snapshot_ts REAL NOT NULL,
+    province TEXT NOT NULL,
+    party TEXT NOT NULL,
+    share REAL NOT NULL,
+    PRIMARY KEY (snapshot_ts, province, party)
+);
+CREATE INDEX IF NOT EXISTS polls_by_time ON polls (snapshot_ts);
+"""
+
+
+def _rows_to_snapshots(rows: List[Tuple[float, str, str, float]]) -> List[Tuple[float, PollSnapshot]]:
+    """
+    Group archive rows ordered by timestamp back into snapshots.
+
+    Args:
+        rows (List[Tuple[float, str, str, float]]): (timestamp, province, party, share) rows
+
+    Returns:
+        List[Tuple[float, PollSnapshot]]: (timestamp, snapshot) pairs in timestamp order
+    """
+    snapshots: List[Tuple[float, PollSnapshot]] = []
+    for timestamp, province, party, share in rows:
+        if not snapshots or snapshots[-1][0] != timestamp:
+            snapshots.append((timestamp, {}))
+        snapshots[-1][1].setdefault(province, {})[party] = share
+    return snapshots
+
+
+class PollArchive:
+    """
+    Append-only archive of polling snapshots keyed by timestamp, province and party.
+
+    Every operation opens its own connection, so one archive can be shared between the
+    background refresher thread and dashboard callbacks.
+
+    Attributes:
+        path (str): Path of the SQLite file
+    """
+    path: str
+
+    def __init__(self, path: str = POLL_ARCHIVE_PATH) -> None:
+        """
+        Initialize a PollArchive, creating the table if needed.
+
+        Args:
+            path (str, optional): Path of the SQLite file. Defaults to POLL_ARCHIVE_PATH.
+        """
+        self.path = path
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open a connection to the archive for one transaction, and close it afterwards.
+
+        A sqlite3 connection used as a context manager only commits or rolls back, so it is closed here.
+        """
+        with contextlib.closing(sqlite3.connect(self.path, timeout=10)) as conn, conn:
+            yield conn
+
+    def append(self, snapshot: PollSnapshot, timestamp: Optional[float] = None) -> float:
+        """
+        Add a snapshot to the archive.
+
+        Args:
+            snapshot (PollSnapshot): Polling data by province
+            timestamp (Optional[float]): When the snapshot was taken. Defaults to now.
+
+        Returns:
+            float: The timestamp the snapshot was stored under
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        rows = [(timestamp, province, party, share)
+                for province, poll in snapshot.items() for party, share in poll.items()]
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO polls VALUES (?, ?, ?, ?)", rows)
+        return timestamp
+
+    def latest(self) -> Optional[Tuple[float, PollSnapshot]]:
+        """
+        Return the most recent snapshot and its timestamp, or None if the archive is empty.
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT snapshot_ts, province, party, share FROM polls "
+                                "WHERE snapshot_ts = (SELECT MAX(snapshot_ts) FROM polls) "
+                                "ORDER BY rowid").fetchall()
+        snapshots = _rows_to_snapshots(rows)
+        return snapshots[0] if snapshots else None
+
+    def range(self, start: Optional[float] = None, end: Optional[float] = None) -> List[Tuple[float, PollSnapshot]]:
+        """
+        Return every snapshot taken between start and end, inclusive, oldest first.
+
+        Args:
+            start (Optional[float]): Earliest timestamp. Defaults to the start of the archive.
+            end (Optional[float]): Latest timestamp. Defaults to the end of the archive.
+
+        Returns:
+            List[Tuple[float, PollSnapshot]]: (timestamp, snapshot) pairs
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT snapshot_ts, province, party, share FROM polls "
+                                "WHERE snapshot_ts BETWEEN ? AND ? ORDER BY snapshot_ts, rowid",
+                                (float("-inf") if start is None else start,
+                                 float("inf") if end is None else end)).fetchall()
+        return _rows_to_snapshots(rows)
+
+    def timestamps(self) -> List[float]:
+        """
+        Return the timestamps of every archived snapshot, oldest first.
+        """
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT snapshot_ts FROM polls ORDER BY snapshot_ts")]
+
+
+if __name__ == "__main__":
+    # Show what the archive holds
+    archive = PollArchive()
+    stored = archive.timestamps()
+    print(f"{len(stored)} snapshots archived in {archive.path}")
+    newest = archive.latest()
+    if newest is not None:
+        print(f"Latest snapshot from {time.ctime(newest[0])}:")
+        for prov, data in newest[1].items():
+            print(f"{prov}: {data}")
+
+
+if __name__ == '__main__':
+    import doctest
+    import python_ta
+
+    doctest.testmod()
+
+    python_ta.check_all(config={
+        'extra-imports': [],
+        'allowed-io': [],
+        'max-line-length': 120
+    })
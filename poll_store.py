@@ -0,0 +1,215 @@
+"""
+Canadian Election Simulator - Poll Store
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+This module keeps the latest polling snapshot in memory and refreshes it from the scraper in the background.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import POLL_REFRESH_INTERVAL, POLL_RETRY_DELAY
+from instrumentation import record
+
+PollSnapshot = Dict[str, Dict[str, float]]
+
+
+class PollStore:
+    """
+    Thread-safe holder of the latest good polling snapshot and the time it was taken.
+
+    Attributes:
+        last_error (Optional[str]): Description of the most recent failed refresh, if any
+        failures (int): Number of consecutive failed refreshes
+        last_refresh (Optional[Dict[str, Any]]): Timing breakdown of the most recent refresh, if any
+    """
+    last_error: Optional[str]
+    failures: int
+    last_refresh: Optional[Dict[str, Any]]
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty PollStore.
+        """
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._snapshot: Optional[PollSnapshot] = None
+        self._timestamp: Optional[float] = None
+        self.last_error = None
+        self.failures = 0
+        self.last_refresh = None
+
+    def publish(self, snapshot: PollSnapshot, timestamp: Optional[float] = None) -> None:
+        """
+        Replace the current snapshot.
+
+        Args:
+            snapshot (PollSnapshot): Polling data by province
+            timestamp (Optional[float]): When the snapshot was taken. Defaults to now.
+        """
+        with self._lock:
+            self._snapshot = snapshot
+            self._timestamp = time.time() if timestamp is None else timestamp
+            self.last_error = None
+            self.failures = 0
+        self._ready.set()
+
+    def record_failure(self, error: str) -> None:
+        """
+        Record a failed refresh. The last good snapshot keeps being served.
+
+        Args:
+            error (str): Description of the failure
+        """
+        with self._lock:
+            self.last_error = error
+            self.failures += 1
+
+    def latest(self) -> Tuple[Optional[PollSnapshot], Optional[float]]:
+        """
+        Return the latest snapshot and its timestamp, or (None, None) if there is none yet.
+        """
+        with self._lock:
+            return self._snapshot, self._timestamp
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a first snapshot is available.
+
+        Args:
+            timeout (Optional[float]): Maximum number of seconds to wait. Defaults to no limit.
+
+        Returns:
+            bool: Whether a snapshot is available
+        """
+        return self._ready.wait(timeout)
+
+    def age(self) -> Optional[float]:
+        """
+        Return the age of the latest snapshot in seconds, or None if there is none yet.
+        """
+        with self._lock:
+            return None if self._timestamp is None else time.time() - self._timestamp
+
+    def describe(self) -> str:
+        """
+        Return a one-line summary of the snapshot age for the dashboard status line.
+        """
+        age = self.age()
+        if age is None:
+            text = "Polls: waiting for first snapshot"
+        else:
+            text = f"Polls: {age:.0f} s old"
+        if self.failures:
+            text += f" ({self.failures} failed refreshes, serving last good snapshot)"
+        return text
+
+
+class PollRefresher(threading.Thread):
+    """
+    Daemon thread that scrapes polls on an interval and publishes them to a PollStore.
+
+    Failed scrapes are retried after POLL_RETRY_DELAY seconds, doubling after every consecutive
+    failure up to the regular interval, while the store keeps serving the last good snapshot.
+
+    Attributes:
+        store (PollStore): Store receiving the snapshots
+        fetch (Callable[[], Optional[PollSnapshot]]): Function returning a fresh snapshot, or None on failure
+        interval (float): Seconds between successful scrapes
+        retry_delay (float): Seconds before the first retry after a failure
+    """
+    store: PollStore
+    fetch: Callable[[], Optional[PollSnapshot]]
+    interval: float
+    retry_delay: float
+
+    def __init__(self, store: PollStore, fetch: Callable[[], Optional[PollSnapshot]],
+                 interval: float = POLL_REFRESH_INTERVAL, retry_delay: float = POLL_RETRY_DELAY) -> None:
+        """
+        Initialize a PollRefresher. Call start() to begin refreshing.
+
+        Args:
+            store (PollStore): Store receiving the snapshots
+            fetch (Callable[[], Optional[PollSnapshot]]): Function returning a fresh snapshot, or None on failure
+            interval (float, optional): Seconds between successful scrapes. Defaults to POLL_REFRESH_INTERVAL.
+            retry_delay (float, optional): Seconds before the first retry. Defaults to POLL_RETRY_DELAY.
+        """
+        super().__init__(name="poll-refresher", daemon=True)
+        self.store = store
+        self.fetch = fetch
+        self.interval = interval
+        self.retry_delay = retry_delay
+        self._stopped = threading.Event()
+
+    def refresh_once(self) -> bool:
+        """
+        Scrape once and publish the result.
+
+        Returns:
+            bool: Whether the scrape succeeded
+        """
+        try:
+            with record() as recorder:
+                snapshot = self.fetch()
+        except Exception as e:  # The refresher must survive any scraper failure
+            logging.error("Poll refresh failed: %s", e)
+            self.store.record_failure(str(e))
+            return False
+        finally:
+            self.store.last_refresh = recorder.report()
+        if not snapshot:
+            self.store.record_failure("scraper returned no data")
+            return False
+        self.store.publish(snapshot)
+        return True
+
+    def run(self) -> None:
+        """
+        Refresh until stop() is called.
+        """
+        while not self._stopped.is_set():
+            if self.refresh_once():
+                delay = self.interval
+            else:
+                delay = min(self.interval, self.retry_delay * 2 ** (self.store.failures - 1))
+            self._stopped.wait(delay)
+
+    def stop(self) -> None:
+        """
+        Ask the thread to finish after its current scrape.
+        """
+        self._stopped.set()
+
+
+def start_poll_refresher(fetch: Callable[[], Optional[PollSnapshot]], interval: float = POLL_REFRESH_INTERVAL,
+                         store: Optional[PollStore] = None) -> Tuple[PollStore, PollRefresher]:
+    """
+    Start a background refresher feeding a PollStore.
+
+    Args:
+        fetch (Callable[[], Optional[PollSnapshot]]): Function returning a fresh snapshot, or None on failure
+        interval (float, optional): Seconds between successful scrapes. Defaults to POLL_REFRESH_INTERVAL.
+        store (Optional[PollStore], optional): Store to feed. Defaults to a new, empty store.
+
+    Returns:
+        Tuple[PollStore, PollRefresher]: The store and the running refresher thread
+    """
+    store = PollStore() if store is None else store
+    refresher = PollRefresher(store, fetch, interval)
+    refresher.start()
+    return store, refresher
+
+
+if __name__ == '__main__':
+    import doctest
+    import python_ta
+
+    doctest.testmod()
+
+    python_ta.check_all(config={
+        'extra-imports': [],
+        'allowed-io': [],
+        'max-line-length': 120
+    })
@@ -0,0 +1,90 @@
+"""
+Canadian Election Simulator - Random Streams
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+This module derives every random number of a simulation from its master seed, so that any block of
+trials of any region can be regenerated on its own.
+
+Every region (province or polling region) has its own stream, seeded from the master seed and a hash of
+the region's name, so a region keeps its numbers when others are added, removed or reordered. Within a
+region, trial t starts at draw t * draws_per_trial, where draws_per_trial is the fixed number of uniform
+numbers one trial of the region consumes. The streams are PCG64 generators, which jump ahead any number of
+draws in a fixed number of steps, so a generator for any range of trials is made in constant time without
+replaying the trials before it. (Philox, whose output is a function of a counter, would do the same but
+draws at half the speed.)
+
+The variance-reduction sampling methods draw a whole block of trials at once rather than trial by trial.
+Their designs come from a separate key for every region and block, named by the block's first trial.
+"""
+
+import hashlib
+import numpy as np
+
+
+def new_seed() -> int:
+    """
+    Return a fresh master seed from the operating system's entropy.
+    """
+    return np.random.SeedSequence().entropy
+
+
+def _region_id(region: str) -> int:
+    """
+    Return a stable 64-bit number identifying a region.
+    """
+    return int.from_bytes(hashlib.sha256(region.encode()).digest()[:8], "little")
+
+
+def trial_generator(seed: int, region: str, first_trial: int = 0, draws_per_trial: int = 1) -> np.random.Generator:
+    """
+    Return a generator positioned at the first draw of a trial of a region.
+
+    Drawing draws_per_trial uniform numbers per trial from it reproduces trials first_trial,
+    first_trial + 1, ... of every other generator of the same seed and region.
+
+    >>> whole = trial_generator(1, "Ontario", draws_per_trial=2).random(6)
+    >>> tail = trial_generator(1, "Ontario", first_trial=2, draws_per_trial=2).random(2)
+    >>> bool((whole[4:] == tail).all())
+    True
+
+    Args:
+        seed (int): Master seed
+        region (str): Province or polling region
+        first_trial (int, optional): Trial to start at. Defaults to 0.
+        draws_per_trial (int, optional): Uniform numbers consumed by one trial of the region. Defaults to 1.
+
+    Returns:
+        np.random.Generator: Generator whose next draw is the first of trial first_trial
+    """
+    # Every uniform number takes one 64-bit output of the generator
+    bit_generator = np.random.PCG64(np.random.SeedSequence(seed, spawn_key=(_region_id(region), 0)))
+    bit_generator.advance(first_trial * draws_per_trial)
+    return np.random.Generator(bit_generator)
+
+
+def design_generator(seed: int, region: str, first_trial: int) -> np.random.Generator:
+    """
+    Return the generator of the sampling design of one block of trials of a region.
+
+    Args:
+        seed (int): Master seed
+        region (str): Province or polling region
+        first_trial (int): First trial of the block
+
+    Returns:
+        np.random.Generator: Generator unique to this region and block
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(_region_id(region), 1, first_trial)))
+
+
+if __name__ == '__main__':
+    import doctest
+    import python_ta
+
+    doctest.testmod()
+
+    python_ta.check_all(config={
+        'extra-imports': [],
+        'allowed-io': [],
+        'max-line-length': 120
+    })
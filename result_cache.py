@@ -0,0 +1,160 @@
+"""
+Canadian Election Simulator - Simulation Result Cache
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+This module provides a bounded least-recently-used cache for simulation results.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+import networkx as nx
+from election_model import graph_fingerprint
+
+
+def snapshot_fingerprint(polling_data: Dict[str, Dict[str, float]]) -> str:
+    """
+    Return a fingerprint of a polling snapshot that changes whenever any number in it changes.
+
+    Args:
+        polling_data (Dict[str, Dict[str, float]]): Polling data by province
+
+    Returns:
+        str: Hex digest identifying the snapshot
+    """
+    items = sorted((province, sorted(poll.items())) for province, poll in polling_data.items())
+    return hashlib.sha1(repr(items).encode()).hexdigest()
+
+
+def simulation_key(polling_data: Dict[str, Dict[str, float]], trials: int, margin: float,
+                   voter_graph: Optional[nx.DiGraph], *extra: Hashable) -> tuple:
+    """
+    Build the cache key of a simulation run.
+
+    Args:
+        polling_data (Dict[str, Dict[str, float]]): Polling data by province
+        trials (int): Number of simulation trials
+        margin (float): Random margin applied to polling
+        voter_graph (Optional[nx.DiGraph]): Voter transition graph
+        *extra (Hashable): Any other parameters that change the result
+
+    Returns:
+        tuple: Key identifying the run
+    """
+    return (snapshot_fingerprint(polling_data), trials, margin, graph_fingerprint(voter_graph)) + extra
+
+
+class SimulationCache:
+    """
+    A bounded, thread-safe LRU cache of simulation results.
+
+    Attributes:
+        max_entries (int): Maximum number of results kept
+        hits (int): Number of lookups answered from the cache
+        misses (int): Number of lookups that had to compute the result
+        evictions (int): Number of results dropped to make room
+    """
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, max_entries: int = 32) -> None:
+        """
+        Initialize an empty SimulationCache.
+
+        Args:
+            max_entries (int, optional): Maximum number of results kept. Defaults to 32.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for key, computing and storing it if it is missing.
+
+        Args:
+            key (Hashable): Key of the result, usually from simulation_key
+            compute (Callable[[], Any]): Function producing the result
+
+        Returns:
+            Any: The cached or freshly computed result
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+
+        result = compute()
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached result for key, or None if it is missing.
+
+        Args:
+            key (Hashable): Key of the result, usually from simulation_key
+
+        Returns:
+            Optional[Any]: The cached result, or None
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def __contains__(self, key: Hashable) -> bool:
+        """
+        Return whether a result is cached for key, without counting a lookup.
+        """
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        """
+        Return the number of cached results.
+        """
+        return len(self._entries)
+
+    def hit_rate(self) -> float:
+        """
+        Return the fraction of lookups answered from the cache.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def describe(self) -> str:
+        """
+        Return a one-line summary of the cache for the dashboard status line.
+        """
+        return (f"Cache: {len(self)}/{self.max_entries} results, {100 * self.hit_rate():.0f}% hit rate, "
+                f"{self.evictions} evictions")
+
+
+if __name__ == '__main__':
+    import doctest
+    import python_ta
+
+    doctest.testmod()
+
+    python_ta.check_all(config={
+        'extra-imports': [],
+        'allowed-io': [],
+        'max-line-length': 120
+    })
@@ -0,0 +1,292 @@
+"""
+Canadian Election Simulator - Riding Table
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+This module holds the electoral districts (ridings) and each riding's party shares at the previous
+election, so that seats can be simulated from their own baseline instead of one province-wide poll.
+
+Ridings are read from a CSV with one row per riding: a riding_id column, a province column, an optional
+name column and one column per party holding its share of the vote (fractions or percentages). The
+provinces are grouped into the regions the poll tracker reports, e.g. Saskatchewan into "Sask. & Man.".
+
+Polls move every riding of a region by the same swing relative to the region's previous result:
+    uniform: every party gains or loses the same number of points in every riding,
+    proportional: every party's share is scaled by the same factor in every riding.
+A poll is required for every region the poll tracker reports (the regions of SEATS_BY_PROVINCE). Ridings
+in other regions, like the territories, keep their baseline shares, with a warning.
+"""
+
+import csv
+import hashlib
+import os
+import warnings
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from config import SEATS_BY_PROVINCE, PROVINCE_MAP, RIDINGS_PATH
+
+# Ways of applying a regional poll to the ridings of the region
+SWING_METHODS = ("uniform", "proportional")
+
+# Columns of the riding CSV that are not party shares
+_ID_COLUMNS = ("riding_id", "province", "name")
+
+
+def region_of_province(province: str) -> str:
+    """
+    Return the polling region of a province, e.g. "Sask. & Man." for Saskatchewan.
+
+    >>> region_of_province("Nova Scotia")
+    'Atlantic Canada'
+    >>> region_of_province("Yukon")
+    'Yukon'
+    """
+    for region, names in PROVINCE_MAP.items():
+        if province == region or province in ([names] if isinstance(names, str) else names):
+            return region
+    return province
+
+
+class RidingTable:
+    """
+    Every riding with its region and previous-election party shares, stored as contiguous arrays.
+
+    Ridings are grouped by region, so the ridings of regions[i] are the rows from region_offsets[i] up to
+    region_offsets[i + 1].
+
+    Attributes:
+        riding_ids (List[str]): Identifier of each riding
+        regions (List[str]): Polling regions in table order
+        region_offsets (np.ndarray): Index of the first riding of each region, followed by the total
+        riding_region (np.ndarray): Index into regions of the region of every riding
+        parties (List[str]): Party of each column of baselines
+        baselines (np.ndarray): A (ridings, parties) array of previous-election shares, each row summing to 1.
+            Rows of ridings without a known result are NaN; those ridings take their region's poll as is.
+    """
+    riding_ids: List[str]
+    regions: List[str]
+    region_offsets: np.ndarray
+    riding_region: np.ndarray
+    parties: List[str]
+    baselines: np.ndarray
+
+    __slots__ = ("riding_ids", "regions", "region_offsets", "riding_region", "parties", "baselines")
+
+    def __init__(self, riding_ids: Sequence[str], regions: Sequence[str], parties: Sequence[str],
+                 baselines: np.ndarray) -> None:
+        """
+        Initialize a RidingTable, grouping the ridings by region.
+
+        Regions are ordered like SEATS_BY_PROVINCE, followed by any others in order of first appearance.
+        Ridings keep their order within a region.
+
+        Args:
+            riding_ids (Sequence[str]): Identifier of each riding
+            regions (Sequence[str]): Polling region of each riding
+            parties (Sequence[str]): Party of each column of baselines
+            baselines (np.ndarray): A (ridings, parties) array of previous-election shares
+        """
+        if len(set(riding_ids)) != len(riding_ids):
+            raise ValueError("Riding ids must be unique")
+        order = list(SEATS_BY_PROVINCE) + [r for r in dict.fromkeys(regions) if r not in SEATS_BY_PROVINCE]
+        self.regions = [r for r in order if r in set(regions)]
+        region_index = np.array([self.regions.index(r) for r in regions], dtype=np.int64)
+        rows = np.argsort(region_index, kind="stable")
+
+        self.riding_ids = [riding_ids[i] for i in rows]
+        self.riding_region = region_index[rows]
+        self.region_offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(self.riding_region, minlength=len(self.regions)))])
+        self.parties = list(parties)
+        baselines = np.asarray(baselines, dtype=np.float64).reshape(len(riding_ids), len(self.parties))
+        totals = baselines.sum(axis=1, keepdims=True)
+        self.baselines = np.ascontiguousarray(
+            np.divide(baselines, totals, out=np.full_like(baselines, np.nan), where=totals > 0)[rows])
+
+    @classmethod
+    def from_csv(cls, path: str) -> "RidingTable":
+        """
+        Read a riding table from a CSV file.
+
+        Args:
+            path (str): CSV with riding_id and province columns, an optional name column and one share
+             column per party
+
+        Returns:
+            RidingTable: The ridings of the file
+        """
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            columns = reader.fieldnames or []
+            if "riding_id" not in columns or "province" not in columns:
+                raise ValueError(f"{path} needs riding_id and province columns")
+            parties = [c for c in columns if c not in _ID_COLUMNS]
+            rows = list(reader)
+        shares = np.array([[float(row[p] or 0.0) for p in parties] for row in rows]).reshape(len(rows), len(parties))
+        return cls([row["riding_id"] for row in rows], [region_of_province(row["province"]) for row in rows],
+                   parties, shares)
+
+    @classmethod
+    def from_regional_results(cls, results: Dict[str, Dict[str, float]],
+                              seats_by_region: Dict[str, int]) -> "RidingTable":
+        """
+        Build a table of interchangeable ridings whose baseline is their region's result.
+
+        Args:
+            results (Dict[str, Dict[str, float]]): Previous-election shares by region. Regions missing
+             from it get ridings without a baseline.
+            seats_by_region (Dict[str, int]): Number of ridings of each region
+
+        Returns:
+            RidingTable: seats_by_region[region] ridings named like "Ontario_Seat_1" for every region
+        """
+        parties = list(dict.fromkeys(p for shares in results.values() for p in shares))
+        riding_ids, regions, baselines = [], [], []
+        for region, num_seats in seats_by_region.items():
+            row = [results[region].get(p, 0.0) for p in parties] if region in results else [0.0] * len(parties)
+            riding_ids += [f"{region}_Seat_{i + 1}" for i in range(num_seats)]
+            regions += [region] * num_seats
+            baselines += [row] * num_seats
+        return cls(riding_ids, regions, parties, np.array(baselines).reshape(len(riding_ids), len(parties)))
+
+    @property
+    def total_seats(self) -> int:
+        """
+        Return the number of ridings.
+        """
+        return int(self.region_offsets[-1])
+
+    def seats_by_region(self) -> Dict[str, int]:
+        """
+        Return the number of ridings of each region.
+        """
+        return dict(zip(self.regions, np.diff(self.region_offsets).tolist()))
+
+    def fingerprint(self) -> str:
+        """
+        Return a digest of the table, for cache keys.
+        """
+        digest = hashlib.sha256("\x1f".join(self.riding_ids + ["|"] + self.regions + ["|"] + self.parties).encode())
+        digest.update(self.riding_region.tobytes())
+        digest.update(self.baselines.tobytes())
+        return digest.hexdigest()
+
+    def swung_shares(self, plan: Dict[str, Dict[str, float]], parties: Sequence[str],
+                     method: str = "uniform") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply the regional polls to every riding's baseline in one vectorized step.
+
+        A region's previous result is the average of its ridings' baselines. Under a proportional swing a
+        party that got nothing in a region last time gets its whole polled share as a uniform swing.
+
+        Args:
+            plan (Dict[str, Dict[str, float]]): Polling by region, e.g. from compile_simulation_plan
+            parties (Sequence[str]): Party order of the result's columns
+            method (str, optional): Either "uniform" or "proportional". Defaults to "uniform".
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The (ridings, parties) array of expected shares in every riding,
+            and the (regions, parties) mask of the parties contesting each region: those in its poll, or
+            for regions without a poll, those with a baseline share
+
+        Raises:
+            ValueError: If a region of SEATS_BY_PROVINCE has no poll, or a riding has neither a poll nor a
+             baseline
+        """
+        if method not in SWING_METHODS:
+            raise ValueError(f"Unknown swing method: {method}")
+        column = {party: i for i, party in enumerate(self.parties)}
+        has_baseline = ~np.isnan(self.baselines).any(axis=1) if self.parties else np.zeros(self.total_seats, bool)
+        baselines = np.zeros((self.total_seats, len(parties)))
+        for i, party in enumerate(parties):
+            if party in column:
+                baselines[has_baseline, i] = self.baselines[has_baseline, column[party]]
+
+        polled = np.array([bool(plan.get(region)) for region in self.regions])
+        polls = np.array([[plan[region].get(p, 0.0) if polled[r] else np.nan for p in parties]
+                          for r, region in enumerate(self.regions)]).reshape(len(self.regions), len(parties))
+        present = np.array([[p in plan[region] for p in parties] if polled[r] else [False] * len(parties)
+                            for r, region in enumerate(self.regions)]).reshape(polls.shape)
+
+        unpolled = [region for region, is_polled in zip(self.regions, polled) if not is_polled]
+        missing = [region for region in unpolled if region in SEATS_BY_PROVINCE]
+        if missing:
+            raise ValueError(f"No polling data for province: {', '.join(missing)}")
+        if unpolled:
+            warnings.warn(f"No polling data for {', '.join(unpolled)}; keeping the previous election's shares")
+
+        uncovered = ~polled[self.riding_region] & ~has_baseline
+        if uncovered.any():
+            missing = sorted({self.regions[r] for r in self.riding_region[uncovered]})
+            raise ValueError(f"No polling data or baseline for region: {', '.join(missing)}")
+
+        sums = np.add.reduceat(baselines, self.region_offsets[:-1])
+        known = np.add.reduceat(has_baseline.astype(np.float64), self.region_offsets[:-1])[:, np.newaxis]
+        prior = np.divide(sums, known, out=np.zeros_like(sums), where=known > 0)
+        present |= ~polled[:, np.newaxis] & (prior > 0)
+
+        # Regions without a poll do not swing, and ridings without a baseline take their region's poll as is
+        region_polls = polls[self.riding_region]
+        region_prior = prior[self.riding_region]
+        if method == "uniform":
+            shares = baselines + (region_polls - region_prior)
+        else:
+            ratio = np.divide(region_polls, region_prior, out=np.full_like(region_polls, np.nan),
+                              where=region_prior > 0)
+            shares = np.where(np.isnan(ratio), baselines + region_polls, baselines * ratio)
+        shares = np.where(polled[self.riding_region][:, np.newaxis], shares, baselines)
+        shares = np.where(has_baseline[:, np.newaxis], shares, region_polls)
+        return np.clip(shares, 0.0, 1.0), present
+
+
+def load_riding_table(path: str = RIDINGS_PATH, seats_by_region: Optional[Dict[str, int]] = None) -> RidingTable:
+    """
+    Load the riding table, falling back to one built from the historical provincial results.
+
+    Without a riding CSV every riding of a region is identical, so simulating the fallback table gives the
+    same seat model as the province-level simulation.
+
+    Args:
+        path (str, optional): Riding CSV. Defaults to RIDINGS_PATH.
+        seats_by_region (Optional[Dict[str, int]], optional): Ridings of each region in the fallback table.
+         Defaults to SEATS_BY_PROVINCE.
+
+    Returns:
+        RidingTable: The ridings of the CSV, or the fallback table if it does not exist
+    """
+    if os.path.exists(path):
+        return RidingTable.from_csv(path)
+
+    from data_loader import load_election_results
+
+    # The latest election that reports a region gives its baseline
+    results = {}
+    for election in load_election_results().values():
+        results.update(election)
+    return RidingTable.from_regional_results(results, seats_by_region or SEATS_BY_PROVINCE)
+
+
+if __name__ == "__main__":
+    # Show the riding table and how a uniform swing moves the first riding of every region
+    from scraper import scrape_polling_data
+
+    table = load_riding_table()
+    print(f"{table.total_seats} ridings: {table.seats_by_region()}")
+    sample_polling = scrape_polling_data()
+    if sample_polling:
+        parties = sorted({p for polls in sample_polling.values() for p in polls})
+        shares, _ = table.swung_shares(sample_polling, parties)
+        for region, first in zip(table.regions, table.region_offsets[:-1].tolist()):
+            print(table.riding_ids[first], dict(zip(parties, np.round(shares[first], 3).tolist())))
+
+
+if __name__ == '__main__':
+    import doctest
+    import python_ta
+
+    doctest.testmod()
+
+    python_ta.check_all(config={
+        'extra-imports': [],
+        'allowed-io': ["open"],
+        'max-line-length': 120
+    })
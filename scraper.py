@@ -5,76 +5,260 @@ Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Z
 This module handles scraping polling data from the CBC Poll Tracker website.
 """
 
-import time
+import atexit
 import re
-from typing import Optional, Dict, Tuple
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Dict, Tuple
 import logging
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from poll_archive import PollArchive
+from instrumentation import instrumented
+
+# Selenium is imported where it is used, so that offline replay and the simulation core never load it
+if TYPE_CHECKING:
+    from selenium import webdriver
 
 logging.basicConfig(level=logging.INFO)
 
+POLL_TRACKER_URL = "https://newsinteractives.cbc.ca/elections/poll-tracker/canada/"
+
+# Offline copy of the poll tracker markup, for exercising the scraper without network access
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "poll_tracker.html"
+
+CONTAINER_SELECTOR = ".eachBreakdownChartInnerWrapper"
+HEADING_SELECTOR = ".MuiTypography-BreakDownsChartHeading"
+CHART_SELECTOR = ".recharts-surface"
+PARTIES = ["LIB", "CON", "NDP", "GRN", "BQ", "PPC", "OTH"]
+
+# Collects every province heading and chart label in a single WebDriver round trip
+_EXTRACT_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0])).map(function (container) {
+    var heading = container.querySelector(arguments[1]);
+    var chart = container.querySelector(arguments[2]);
+    return [heading ? heading.innerText || heading.textContent : null,
+            chart ? chart.getAttribute("aria-label") : null];
+});
+"""
+
+# Counts the province headings and the headings whose chart has rendered, which the scraper waits to be equal
+_COUNT_SCRIPT = """
+var counts = [0, 0];
+Array.from(document.querySelectorAll(arguments[0])).forEach(function (container) {
+    if (container.querySelector(arguments[1])) {
+        counts[0] += 1;
+        if (container.querySelector(arguments[2])) {
+            counts[1] += 1;
+        }
+    }
+});
+return counts;
+"""
+
 
-def process_province_container(container: WebElement) -> Optional[Tuple[str, Dict[str, float]]]:
+def parse_province_entry(province_name: Optional[str], aria_label: Optional[str]) \
+        -> Optional[Tuple[str, Dict[str, float]]]:
     """
-    Process a single province container to extract the province name and its polling data.
+    Parse a province heading and the aria-label of its breakdown chart into polling data.
 
     Args:
-        container (WebElement): The container element for a province.
+        province_name (Optional[str]): Text of the province heading
+        aria_label (Optional[str]): aria-label of the province's chart, e.g. "LIB: 42.1%, CON: 38.0%"
 
     Returns:
         Optional[Tuple[str, Dict[str, float]]]: A tuple containing the province name and a dictionary
-        of party polling data if successful, or None if an error occurs.
+        of party polling data, or None if the heading or chart is missing.
     """
-    try:
-        province_name = container.find_element(By.CSS_SELECTOR, ".MuiTypography-BreakDownsChartHeading").text
-        chart = container.find_element(By.CSS_SELECTOR, ".recharts-surface")
-        aria_label = chart.get_attribute("aria-label")
-        matches = re.findall(r"([\w\s]+):\s(\d+\.\d+)%", aria_label)
-        province_data = {p.strip(): float(percent) / 100 for p, percent in matches}
-        parties = ["LIB", "CON", "NDP", "GRN", "BQ", "PPC", "OTH"]
-        for party in parties:
-            province_data.setdefault(party, 0.0)
-        return province_name, province_data
-    except NoSuchElementException as e:
-        logging.error("Error processing province container: %s", e)
+    if not province_name or aria_label is None:
         return None
+    matches = re.findall(r"([\w\s]+):\s(\d+\.\d+)%", aria_label)
+    province_data = {p.strip(): float(percent) / 100 for p, percent in matches}
+    for party in PARTIES:
+        province_data.setdefault(party, 0.0)
+    return province_name.strip(), province_data
+
 
+class ScraperSession:
+    """
+    Keeps one headless browser alive across scrapes of the poll tracker.
+
+    The browser is launched on the first scrape and reused afterwards. If it dies, the next scrape
+    launches a new one.
 
-def scrape_polling_data() -> Optional[Dict[str, Dict[str, float]]]:
+    Attributes:
+        headless (bool): Whether the browser runs without a window
+        timeout (float): Seconds to wait for the breakdown chart of every province heading to appear
+    """
+    headless: bool
+    timeout: float
+
+    def __init__(self, headless: bool = True, timeout: float = 10.0) -> None:
+        """
+        Initialize a ScraperSession. The browser is not launched until the first scrape.
+
+        Args:
+            headless (bool, optional): Whether the browser runs without a window. Defaults to True.
+            timeout (float, optional): Seconds to wait for the breakdown charts. Defaults to 10.
+        """
+        self.headless = headless
+        self.timeout = timeout
+        self._driver: Optional["webdriver.Chrome"] = None
+
+    def _get_driver(self) -> "webdriver.Chrome":
+        """
+        Return the running browser, launching it if needed.
+        """
+        if self._driver is None:
+            from selenium import webdriver
+
+            options = webdriver.ChromeOptions()
+            if self.headless:
+                options.add_argument("--headless=new")
+            options.add_argument("--disable-gpu")
+            self._driver = webdriver.Chrome(options=options)
+        return self._driver
+
+    def scrape(self, url: str = POLL_TRACKER_URL) -> Optional[Dict[str, Dict[str, float]]]:
+        """
+        Scrape provincial polling data from the poll tracker, or from a local copy of it.
+
+        The charts render one by one, so the scrape waits until every province heading has its chart. If
+        that takes longer than the timeout, the provinces whose charts did render are returned.
+
+        Args:
+            url (str, optional): Page to scrape; use FIXTURE_PATH.as_uri() for the offline fixture.
+                Defaults to POLL_TRACKER_URL.
+
+        Returns:
+            Optional[Dict[str, Dict[str, float]]]: A dictionary with provinces as keys and party polling
+            percentages as values, or None if an error occurs.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+
+        def charts_loaded(driver: "webdriver.Chrome") -> bool:
+            headings, charts = driver.execute_script(_COUNT_SCRIPT, CONTAINER_SELECTOR, HEADING_SELECTOR,
+                                                     CHART_SELECTOR)
+            return 0 < headings == charts
+
+        try:
+            driver = self._get_driver()
+            driver.get(url)
+            try:
+                WebDriverWait(driver, self.timeout).until(charts_loaded)
+            except TimeoutException:
+                headings, charts = driver.execute_script(_COUNT_SCRIPT, CONTAINER_SELECTOR, HEADING_SELECTOR,
+                                                         CHART_SELECTOR)
+                if charts == 0:
+                    logging.error("Timed out waiting for polling charts at %s", url)
+                    return None
+                logging.warning("Only %d of %d polling charts loaded at %s", charts, headings, url)
+            entries: List[List[Optional[str]]] = driver.execute_script(
+                _EXTRACT_SCRIPT, CONTAINER_SELECTOR, HEADING_SELECTOR, CHART_SELECTOR)
+        except WebDriverException as e:
+            logging.error("Error scraping polling data: %s", e)
+            self.close()
+            return None
+
+        polling_data: Dict[str, Dict[str, float]] = {}
+        for province_name, aria_label in entries:
+            result = parse_province_entry(province_name, aria_label)
+            if result is None:
+                logging.error("Incomplete province container: %s", province_name)
+                continue
+            polling_data[result[0]] = result[1]
+        return polling_data
+
+    def close(self) -> None:
+        """
+        Quit the browser if it is running.
+        """
+        if self._driver is not None:
+            from selenium.common.exceptions import WebDriverException
+
+            try:
+                self._driver.quit()
+            except WebDriverException as e:
+                logging.error("Error closing browser: %s", e)
+            self._driver = None
+
+    def __enter__(self) -> "ScraperSession":
+        """
+        Return the session for use in a with statement.
+        """
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """
+        Quit the browser when the with statement ends.
+        """
+        self.close()
+
+
+_DEFAULT_SESSION: Optional[ScraperSession] = None
+_DEFAULT_ARCHIVE: Optional[PollArchive] = None
+
+
+def default_archive() -> PollArchive:
+    """
+    Return the shared archive at POLL_ARCHIVE_PATH, opening it on first use.
+    """
+    global _DEFAULT_ARCHIVE
+    if _DEFAULT_ARCHIVE is None:
+        _DEFAULT_ARCHIVE = PollArchive()
+    return _DEFAULT_ARCHIVE
+
+
+@instrumented()
+def scrape_polling_data(url: str = POLL_TRACKER_URL, archive: Optional[PollArchive] = None,
+                        offline: bool = False) -> Optional[Dict[str, Dict[str, float]]]:
     """
     Scrapes current polling data from CBC Poll Tracker website.
 
+    Uses a shared headless ScraperSession, so the browser is only launched on the first call. Every
+    successful scrape is appended to the poll archive, and in offline mode the latest archived
+    snapshot is returned without launching a browser at all.
+
+    Args:
+        url (str, optional): Page to scrape. Defaults to POLL_TRACKER_URL.
+        archive (Optional[PollArchive], optional): Archive to record to or read from. Defaults to the
+            shared archive for the live poll tracker, and to no archive for any other url.
+        offline (bool, optional): Whether to read the latest archived snapshot instead. Defaults to False.
+
     Returns:
         Optional[Dict[str, Dict[str, float]]]: A dictionary with provinces as keys and party polling
         percentages as values, or None if an error occurs.
     """
-    driver = webdriver.Chrome()
-    driver.get("https://newsinteractives.cbc.ca/elections/poll-tracker/canada/")
-    time.sleep(5)
-
-    polling_data: Dict[str, Dict[str, float]] = {}
-
-    try:
-        province_containers = driver.find_elements(By.CSS_SELECTOR, ".eachBreakdownChartInnerWrapper")
-        for container in province_containers:
-            result = process_province_container(container)
-            if result is not None:
-                province_name, province_data = result
-                polling_data[province_name] = province_data
-        return polling_data
-    except WebDriverException as e:
-        logging.error("Error scraping polling data: %s", e)
-        return None
-    finally:
-        driver.quit()
+    global _DEFAULT_SESSION
+    if archive is None and (offline or url == POLL_TRACKER_URL):
+        archive = default_archive()
+
+    if offline:
+        latest = archive.latest()
+        if latest is None:
+            logging.error("No archived polling data in %s", archive.path)
+            return None
+        return latest[1]
+
+    if _DEFAULT_SESSION is None:
+        _DEFAULT_SESSION = ScraperSession()
+        atexit.register(_DEFAULT_SESSION.close)
+    polling_data = _DEFAULT_SESSION.scrape(url)
+    if polling_data and archive is not None:
+        archive.append(polling_data)
+    return polling_data
 
 
 if __name__ == "__main__":
-    # Test the scraper
+    # Test the scraper against the offline fixture, then the live site
+    import time
+
+    with ScraperSession() as session:
+        logging.info("Fixture: %s", session.scrape(FIXTURE_PATH.as_uri()))
+        for attempt in range(2):
+            start = time.time()
+            session.scrape()
+            logging.info("Scrape %d took %.2f s", attempt + 1, time.time() - start)
+
     poll_data = scrape_polling_data()
     if poll_data:
         logging.info("Polling data by province:")
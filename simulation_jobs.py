@@ -0,0 +1,275 @@
+"""
+Canadian Election Simulator - Background Simulation Jobs
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+This module runs simulations on a small pool of background threads, so that dashboard callbacks return
+immediately with a job id and the page polls the job's progress instead of waiting on the result.
+
+Jobs for identical inputs are shared: submitting the same key while a job for it is queued or running
+returns the existing job. Every submitter holds a reference to its job, and a job nobody is waiting for
+any more is cancelled at its next progress report.
+
+Every job is recorded with instrumentation.record on its worker thread, so its timing report covers the
+simulation stages even though they do not run in the callback that displays the result.
+"""
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+from instrumentation import record
+from result_cache import SimulationCache
+from config import SIMULATION_JOB_WORKERS, SIMULATION_JOB_HISTORY
+
+# A job computation receives a progress function to call with (done, total); it raises JobCancelled
+# once the job has been cancelled
+ProgressFn = Callable[[int, int], None]
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's computation once the job has been cancelled."""
+
+
+class SimulationJob:
+    """
+    One background computation and its progress.
+
+    Attributes:
+        job_id (str): Identifier handed to the dashboard
+        key (Hashable): Cache key of the result
+        status (str): One of "queued", "running", "done", "failed" or "cancelled"
+        done (int): Units of work completed, e.g. trials
+        total (int): Units of work in the job
+        result (Any): The result, once the job is done
+        error (Optional[str]): Description of the failure, if the job failed
+        refs (int): Number of submitters still waiting for the job
+        inputs (Any): Whatever the submitter wants to keep alongside the result, e.g. the polls
+        submitted (float): Time the job was submitted
+        finished (Optional[float]): Time the job finished, failed or was cancelled
+        timing (Optional[Dict[str, Any]]): Timing report of the job's computation, once it has run
+    """
+    job_id: str
+    key: Hashable
+    status: str
+    done: int
+    total: int
+    result: Any
+    error: Optional[str]
+    refs: int
+    inputs: Any
+    submitted: float
+    finished: Optional[float]
+    timing: Optional[Dict[str, Any]]
+
+    def __init__(self, job_id: str, key: Hashable, total: int, inputs: Any = None) -> None:
+        """
+        Initialize a queued SimulationJob.
+
+        Args:
+            job_id (str): Identifier handed to the dashboard
+            key (Hashable): Cache key of the result
+            total (int): Units of work in the job
+            inputs (Any, optional): Whatever the submitter wants to keep alongside the result. Defaults to None.
+        """
+        self.job_id = job_id
+        self.key = key
+        self.status = "queued"
+        self.done = 0
+        self.total = total
+        self.result = None
+        self.error = None
+        self.refs = 1
+        self.inputs = inputs
+        self.submitted = time.time()
+        self.finished = None
+        self.timing = None
+        self.cancel_requested = threading.Event()
+
+    @property
+    def active(self) -> bool:
+        """
+        Return whether the job is still queued or running.
+        """
+        return self.status in ("queued", "running")
+
+    def fraction(self) -> float:
+        """
+        Return the fraction of the job that is done, between 0 and 1.
+        """
+        if self.status == "done":
+            return 1.0
+        return self.done / self.total if self.total else 0.0
+
+    def describe(self) -> str:
+        """
+        Return a one-line summary of the job for the dashboard.
+        """
+        if self.status == "running":
+            return f"Simulating: {self.done:,} of {self.total:,} trials ({100 * self.fraction():.0f}%)"
+        if self.status == "queued":
+            return "Simulation queued"
+        if self.status == "failed":
+            return f"Simulation failed: {self.error}"
+        if self.status == "cancelled":
+            return "Simulation cancelled"
+        return f"Simulation completed in {self.finished - self.submitted:.2f} seconds"
+
+
+class SimulationJobQueue:
+    """
+    Runs simulation jobs on background threads, sharing jobs and results for identical inputs.
+
+    Finished results go into a SimulationCache, so resubmitting an already computed key finishes at once.
+
+    Attributes:
+        cache (SimulationCache): Cache of finished results
+        history (int): Number of finished jobs kept so that their results can still be fetched by id
+        profile (bool): Whether job timing reports include the slowest functions from cProfile
+    """
+    cache: SimulationCache
+    history: int
+    profile: bool
+
+    def __init__(self, cache: SimulationCache, workers: int = SIMULATION_JOB_WORKERS,
+                 history: int = SIMULATION_JOB_HISTORY, profile: bool = False) -> None:
+        """
+        Initialize a SimulationJobQueue.
+
+        Args:
+            cache (SimulationCache): Cache of finished results
+            workers (int, optional): Number of jobs run at the same time. Defaults to SIMULATION_JOB_WORKERS.
+            history (int, optional): Number of finished jobs kept. Defaults to SIMULATION_JOB_HISTORY.
+            profile (bool, optional): Whether to profile jobs with cProfile. Defaults to False.
+        """
+        self.cache = cache
+        self.history = history
+        self.profile = profile
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="simulation-job")
+        self._jobs: Dict[str, SimulationJob] = {}
+        self._active_by_key: Dict[Hashable, SimulationJob] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, key: Hashable, compute: Callable[[ProgressFn], Any], total: int, inputs: Any = None) -> str:
+        """
+        Start a job computing the result for key, or join the job already computing it.
+
+        Every call takes a reference to the job, which the caller gives back with release.
+
+        Args:
+            key (Hashable): Cache key of the result, usually from simulation_key
+            compute (Callable[[ProgressFn], Any]): Function producing the result. It is passed a progress
+             function to call with (done, total) as it advances.
+            total (int): Units of work in the job, e.g. trials
+            inputs (Any, optional): Kept on the job for the submitter, e.g. the polls. Defaults to None.
+
+        Returns:
+            str: Id of the job
+        """
+        with self._lock:
+            existing = self._active_by_key.get(key)
+            if existing is not None:
+                existing.refs += 1
+                return existing.job_id
+            job = SimulationJob(f"job-{next(self._ids)}", key, total, inputs)
+            self._jobs[job.job_id] = job
+            self._active_by_key[key] = job
+            self._prune()
+        self._executor.submit(self._run, job, compute)
+        return job.job_id
+
+    def get(self, job_id: Optional[str]) -> Optional[SimulationJob]:
+        """
+        Return the job with the given id, or None if it is unknown or was pruned.
+        """
+        with self._lock:
+            return self._jobs.get(job_id) if job_id else None
+
+    def release(self, job_id: Optional[str]) -> None:
+        """
+        Drop one submitter's interest in a job, cancelling it if nobody else is waiting for it.
+
+        Args:
+            job_id (Optional[str]): Id returned by submit; None is ignored
+        """
+        with self._lock:
+            job = self._jobs.get(job_id) if job_id else None
+            if job is None or not job.active:
+                return
+            job.refs -= 1
+            if job.refs <= 0:
+                job.cancel_requested.set()
+                if self._active_by_key.get(job.key) is job:
+                    del self._active_by_key[job.key]
+
+    def _run(self, job: SimulationJob, compute: Callable[[ProgressFn], Any]) -> None:
+        """
+        Run a job on a worker thread and record its outcome.
+        """
+        def progress(done: int, total: int) -> None:
+            if job.cancel_requested.is_set():
+                raise JobCancelled()
+            job.done, job.total = done, total
+
+        try:
+            if job.cancel_requested.is_set():
+                raise JobCancelled()
+            job.status = "running"
+            with record(profile=self.profile) as recorder:
+                try:
+                    job.result = self.cache.get_or_compute(job.key, lambda: compute(progress))
+                finally:
+                    job.timing = recorder.report()
+            job.done = job.total
+            status = "done"
+        except JobCancelled:
+            status = "cancelled"
+        except Exception as e:  # A failed job is reported to the dashboard rather than crashing the worker
+            job.error = str(e)
+            status = "failed"
+
+        with self._lock:
+            job.status = status
+            job.finished = time.time()
+            if self._active_by_key.get(job.key) is job:
+                del self._active_by_key[job.key]
+
+    def _prune(self) -> None:
+        """
+        Forget the oldest finished jobs beyond the history limit. Called with the lock held.
+        """
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def describe(self) -> str:
+        """
+        Return a one-line summary of the queue for the dashboard status line.
+        """
+        with self._lock:
+            running = sum(job.status == "running" for job in self._jobs.values())
+            queued = sum(job.status == "queued" for job in self._jobs.values())
+        return f"Jobs: {running} running, {queued} queued"
+
+    def shutdown(self) -> None:
+        """
+        Cancel every active job and stop the worker threads.
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancel_requested.set()
+        self._executor.shutdown(wait=False)
+
+
+if __name__ == '__main__':
+    import doctest
+    import python_ta
+
+    doctest.testmod()
+
+    python_ta.check_all(config={
+        'extra-imports': [],
+        'allowed-io': [],
+        'max-line-length': 120
+    })
@@ -0,0 +1,355 @@
+"""
+Canadian Election Simulator - Simulation Results
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+This module defines the compact container used to hold the seat counts of every simulation trial, and
+the outcome counts classified from them.
+"""
+
+import functools
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from config import MAJORITY_THRESHOLD, COALITION_MAX_PARTIES
+
+# Seat counts never exceed the size of the House, so 16-bit integers are enough
+SEAT_DTYPE = np.int16
+
+# Trials classified at once by OutcomeStatistics, which bounds the (trials, coalitions) array it builds
+_OUTCOME_CHUNK_TRIALS = 2048
+
+
+def classify_trials(seat_counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Classify the outcome of every trial, for whole arrays at once. Every engine counts wins with this.
+
+    The party with the most seats wins a majority if it reaches MAJORITY_THRESHOLD and a minority
+    otherwise. A tie for the most seats is a win for nobody.
+
+    Args:
+        seat_counts (np.ndarray): Array of seat counts whose last axis is the party
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Boolean arrays of the same shape, marking the party that won a
+        majority and the party that won a minority in each trial
+    """
+    top_seats = seat_counts.max(axis=-1, keepdims=True)
+    is_top = seat_counts == top_seats
+    winner = is_top & (is_top.sum(axis=-1, keepdims=True) == 1)
+    majority = winner & (top_seats >= MAJORITY_THRESHOLD)
+    return majority, winner & ~majority
+
+
+@functools.lru_cache(maxsize=None)
+def _coalition_members(num_parties: int) -> np.ndarray:
+    """
+    Return the (parties, coalitions) 0/1 matrix whose column m marks the parties of bitmask m.
+
+    >>> _coalition_members(2).tolist()
+    [[0.0, 1.0, 0.0, 1.0], [0.0, 0.0, 1.0, 1.0]]
+    """
+    masks = np.arange(2 ** num_parties)
+    members = ((masks[np.newaxis, :] >> np.arange(num_parties)[:, np.newaxis]) & 1).astype(np.float64)
+    members.setflags(write=False)
+    return members
+
+
+class OutcomeStatistics:
+    """
+    Counts of the outcomes of many trials, classified from a trials x parties seat matrix in one vectorized
+    pass per block of trials. Counts of separate blocks add up with merge, so blocks simulated in worker
+    processes are classified where they are simulated.
+
+    The party with the most seats wins a majority or a minority as in classify_trials. A party finishes
+    first when no party has more seats than it and second when exactly one party does, so tied parties
+    share a place; parties without seats have no place. A coalition is a set of parties, numbered by the
+    bitmask of their positions in parties, and wins a majority when its seats together reach
+    MAJORITY_THRESHOLD.
+
+    Attributes:
+        parties (List[str]): Party of each column
+        trials (int): Number of trials counted
+        majority (np.ndarray): Number of trials each party won with a majority
+        minority (np.ndarray): Number of trials each party won with a minority
+        first (np.ndarray): Number of trials each party finished first
+        second (np.ndarray): Number of trials each party finished second
+        coalition_majority (Optional[np.ndarray]): Number of trials each coalition held a majority, indexed
+            by bitmask, or None when there are more than COALITION_MAX_PARTIES parties
+        seat_histograms (np.ndarray): A (parties, seats + 1) array of how many trials ended with each seat count
+    """
+    parties: List[str]
+    trials: int
+    majority: np.ndarray
+    minority: np.ndarray
+    first: np.ndarray
+    second: np.ndarray
+    coalition_majority: Optional[np.ndarray]
+    seat_histograms: np.ndarray
+
+    __slots__ = ("parties", "trials", "majority", "minority", "first", "second", "coalition_majority",
+                 "seat_histograms")
+
+    def __init__(self, parties: Sequence[str]) -> None:
+        """
+        Initialize OutcomeStatistics with no trials counted.
+
+        Args:
+            parties (Sequence[str]): Party of each column
+        """
+        self.parties = list(parties)
+        self.trials = 0
+        self.majority, self.minority, self.first, self.second = (np.zeros(len(self.parties), dtype=np.int64)
+                                                                 for _ in range(4))
+        self.coalition_majority = None
+        if len(self.parties) <= COALITION_MAX_PARTIES:
+            self.coalition_majority = np.zeros(2 ** len(self.parties), dtype=np.int64)
+        self.seat_histograms = np.zeros((len(self.parties), 1), dtype=np.int64)
+
+    @classmethod
+    def from_seat_counts(cls, parties: Sequence[str], seat_counts: np.ndarray) -> "OutcomeStatistics":
+        """
+        Count the outcomes of a block of trials.
+
+        >>> seat_counts = np.array([[180, 100, 63], [150, 150, 43]])
+        >>> outcomes = OutcomeStatistics.from_seat_counts(["A", "B", "C"], seat_counts)
+        >>> outcomes.win_stats()["A"]
+        {'majority': 0.5, 'minority': 0.0, 'no_win': 0.5, 'first': 1.0, 'second': 0.0}
+        >>> outcomes.coalition_majorities()[("B", "C")]
+        0.5
+
+        Args:
+            parties (Sequence[str]): Party of each column
+            seat_counts (np.ndarray): A (trials, parties) array of seat counts
+
+        Returns:
+            OutcomeStatistics: The outcome counts of the trials
+        """
+        outcomes = cls(parties)
+        seat_counts = np.asarray(seat_counts).reshape(-1, len(outcomes.parties))
+        for start in range(0, len(seat_counts), _OUTCOME_CHUNK_TRIALS):
+            outcomes._count(seat_counts[start:start + _OUTCOME_CHUNK_TRIALS])
+        return outcomes
+
+    def _count(self, seat_counts: np.ndarray) -> None:
+        """
+        Add the outcomes of a chunk of trials to the counts.
+        """
+        if not len(seat_counts):
+            return
+        majority, minority = classify_trials(seat_counts)
+        self.majority += majority.sum(axis=0)
+        self.minority += minority.sum(axis=0)
+
+        # Number of parties with more seats than each party, in every trial
+        ahead = (seat_counts[:, np.newaxis, :] > seat_counts[:, :, np.newaxis]).sum(axis=2)
+        seated = seat_counts > 0
+        self.first += (seated & (ahead == 0)).sum(axis=0)
+        self.second += (seated & (ahead == 1)).sum(axis=0)
+
+        if self.coalition_majority is not None:
+            # Seats of every coalition in every trial, as one matrix product with the bitmask membership matrix
+            coalition_seats = seat_counts.astype(np.float64) @ _coalition_members(len(self.parties))
+            self.coalition_majority += np.count_nonzero(coalition_seats >= MAJORITY_THRESHOLD, axis=0)
+
+        seats = int(seat_counts.max()) + 1
+        if seats > self.seat_histograms.shape[1]:
+            self.seat_histograms = np.pad(self.seat_histograms, ((0, 0), (0, seats - self.seat_histograms.shape[1])))
+        offsets = np.arange(len(self.parties)) * self.seat_histograms.shape[1]
+        self.seat_histograms += np.bincount((seat_counts + offsets).ravel(),
+                                            minlength=self.seat_histograms.size).reshape(self.seat_histograms.shape)
+        self.trials += len(seat_counts)
+
+    def merge(self, other: "OutcomeStatistics") -> None:
+        """
+        Add the counts of another block of trials of the same parties.
+
+        Args:
+            other (OutcomeStatistics): Counts to add
+        """
+        if other.parties != self.parties:
+            raise ValueError("Outcome statistics of different parties cannot be merged")
+        self.majority += other.majority
+        self.minority += other.minority
+        self.first += other.first
+        self.second += other.second
+        if self.coalition_majority is not None:
+            self.coalition_majority += other.coalition_majority
+        width = max(self.seat_histograms.shape[1], other.seat_histograms.shape[1])
+        self.seat_histograms = (np.pad(self.seat_histograms, ((0, 0), (0, width - self.seat_histograms.shape[1])))
+                                + np.pad(other.seat_histograms, ((0, 0), (0, width - other.seat_histograms.shape[1]))))
+        self.trials += other.trials
+
+    def win_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return each party's majority, minority and no-win probabilities, and its probability of finishing
+        first and second, in the format of run_simulation's win statistics.
+        """
+        trials = max(self.trials, 1)
+        return {party: {"majority": int(self.majority[i]) / trials, "minority": int(self.minority[i]) / trials,
+                        "no_win": (self.trials - int(self.majority[i]) - int(self.minority[i])) / trials,
+                        "first": int(self.first[i]) / trials, "second": int(self.second[i]) / trials}
+                for i, party in enumerate(self.parties)}
+
+    def coalition_majorities(self, max_parties: Optional[int] = None) -> Dict[Tuple[str, ...], float]:
+        """
+        Return the probability that each coalition holds a majority.
+
+        Args:
+            max_parties (Optional[int], optional): Only return coalitions of at most this many parties.
+             Defaults to None (every coalition).
+
+        Returns:
+            Dict[Tuple[str, ...], float]: Majority probability of every non-empty coalition, keyed by its
+            parties in party order; empty when there were too many parties to count coalitions
+        """
+        if self.coalition_majority is None:
+            return {}
+        trials = max(self.trials, 1)
+        coalitions = {}
+        for mask in range(1, len(self.coalition_majority)):
+            members = tuple(party for i, party in enumerate(self.parties) if mask >> i & 1)
+            if max_parties is None or len(members) <= max_parties:
+                coalitions[members] = int(self.coalition_majority[mask]) / trials
+        return coalitions
+
+    def seat_quantiles(self, qs: Sequence[float] = (0.05, 0.5, 0.95)) -> Dict[str, Tuple[int, ...]]:
+        """
+        Return seat count quantiles of each party: for each q, the smallest seat count that at least a
+        fraction q of the trials do not exceed.
+
+        Args:
+            qs (Sequence[float], optional): Quantiles to compute, between 0 and 1. Defaults to
+             (0.05, 0.5, 0.95).
+
+        Returns:
+            Dict[str, Tuple[int, ...]]: The requested quantiles of each party, in order
+        """
+        cumulative = np.cumsum(self.seat_histograms, axis=1)
+        # Even q = 0 needs one trial at or below the seat count
+        targets = np.maximum(np.asarray(qs, dtype=np.float64) * self.trials, 1)
+        return {party: tuple(np.searchsorted(cumulative[i], targets, side="left").tolist())
+                for i, party in enumerate(self.parties)}
+
+
+class SeatDistribution(Mapping):
+    """
+    Seat counts of every party in every trial, stored as a single trials x parties array.
+
+    It behaves like the Dict[str, List[int]] that run_simulation used to return: indexing it with a
+    party gives that party's seat count in every trial (as a NumPy array), and to_dict() gives the
+    plain dictionary of lists. Summary statistics are computed directly on the array.
+
+    Attributes:
+        parties (List[str]): Party of each column
+        seat_counts (np.ndarray): A (trials, parties) array of seat counts
+        metadata (Dict[str, Any]): How the trials were produced, e.g. the master seed under "seed"
+        outcomes (Optional[OutcomeStatistics]): Outcome counts of the trials, when the simulation classified them
+    """
+    parties: List[str]
+    seat_counts: np.ndarray
+    metadata: Dict[str, Any]
+    outcomes: Optional[OutcomeStatistics]
+
+    def __init__(self, parties: Sequence[str], seat_counts: np.ndarray,
+                 metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Initialize a SeatDistribution.
+
+        Args:
+            parties (Sequence[str]): Party of each column
+            seat_counts (np.ndarray): A (trials, parties) array of seat counts
+            metadata (Optional[Dict[str, Any]], optional): How the trials were produced. Defaults to None.
+        """
+        self.parties = list(parties)
+        self.seat_counts = np.asarray(seat_counts, dtype=SEAT_DTYPE).reshape(-1, len(self.parties))
+        self.metadata = dict(metadata or {})
+        self.outcomes = None
+        self._columns = {party: i for i, party in enumerate(self.parties)}
+
+    def __getitem__(self, party: str) -> np.ndarray:
+        """
+        Return the seat count of a party in every trial.
+        """
+        return self.seat_counts[:, self._columns[party]]
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Iterate over the parties.
+        """
+        return iter(self.parties)
+
+    def __len__(self) -> int:
+        """
+        Return the number of parties.
+        """
+        return len(self.parties)
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Return whether two distributions hold the same parties and seat counts.
+        """
+        if not isinstance(other, SeatDistribution):
+            return NotImplemented
+        return self.parties == other.parties and np.array_equal(self.seat_counts, other.seat_counts)
+
+    __hash__ = None
+
+    @property
+    def trials(self) -> int:
+        """
+        Return the number of trials.
+        """
+        return self.seat_counts.shape[0]
+
+    def means(self) -> Dict[str, float]:
+        """
+        Return the mean seat count of each party.
+        """
+        if self.trials == 0:
+            return {party: 0.0 for party in self.parties}
+        return dict(zip(self.parties, self.seat_counts.mean(axis=0, dtype=np.float64).tolist()))
+
+    def quantiles(self, qs: Sequence[float]) -> Dict[str, Tuple[float, ...]]:
+        """
+        Return seat count quantiles of each party.
+
+        Args:
+            qs (Sequence[float]): Quantiles to compute, between 0 and 1
+
+        Returns:
+            Dict[str, Tuple[float, ...]]: The requested quantiles of each party, in order
+        """
+        values = np.quantile(self.seat_counts, qs, axis=0)
+        return {party: tuple(values[:, i].tolist()) for i, party in enumerate(self.parties)}
+
+    def histograms(self, total_seats: int) -> Dict[str, np.ndarray]:
+        """
+        Return how many trials ended with each seat count, for each party.
+
+        Args:
+            total_seats (int): Number of seats in the House
+
+        Returns:
+            Dict[str, np.ndarray]: Arrays of length total_seats + 1 indexed by seat count
+        """
+        return {party: np.bincount(self.seat_counts[:, i], minlength=total_seats + 1)
+                for i, party in enumerate(self.parties)}
+
+    def to_dict(self) -> Dict[str, List[int]]:
+        """
+        Return the legacy dictionary of seat count lists keyed by party.
+        """
+        return {party: self.seat_counts[:, i].tolist() for i, party in enumerate(self.parties)}
+
+
+if __name__ == '__main__':
+    import doctest
+    import python_ta
+
+    doctest.testmod()
+
+    python_ta.check_all(config={
+        'extra-imports': [],
+        'allowed-io': [],
+        'max-line-length': 120
+    })
@@ -0,0 +1,123 @@
+"""
+Canadian Election Simulator - Data Loader Tests
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+Tests of when the cleaned results cache is used and when a CSV is parsed again, on small synthetic
+results files. Run with python -m pytest.
+"""
+
+import os
+import pickle
+from typing import List
+import pytest
+
+import data_loader
+from data_loader import load_election_results
+
+RESULTS_2019 = "Party,Ontario,Quebec\nLIB,40,30\nCON,60,20\nBQ,0,50\n"
+RESULTS_2021 = "Party,Ontario,Quebec\nLIB,50,30\nCON,50,30\nBQ,0,40\n"
+
+
+@pytest.fixture
+def files(tmp_path) -> dict:
+    """
+    Two synthetic results CSVs and the paths of their pattern and cache.
+    """
+    (tmp_path / "2019.csv").write_text(RESULTS_2019)
+    (tmp_path / "2021.csv").write_text(RESULTS_2021)
+    return {"pattern": str(tmp_path / "[0-9][0-9][0-9][0-9].csv"), "cache_path": str(tmp_path / "cache.pkl"),
+            "dir": tmp_path}
+
+
+@pytest.fixture
+def parsed(monkeypatch) -> List[str]:
+    """
+    Record the Ontario LIB share of every CSV the loader parses, in order.
+    """
+    calls = []
+    clean_and_merge = data_loader.clean_and_merge
+
+    def recording_clean_and_merge(df):
+        result = clean_and_merge(df)
+        calls.append(result["Ontario"]["LIB"])
+        return result
+
+    monkeypatch.setattr(data_loader, "clean_and_merge", recording_clean_and_merge)
+    return calls
+
+
+def test_results_are_cleaned_by_year(files, parsed) -> None:
+    """
+    Every CSV is parsed into shares by province, keyed by its year in chronological order.
+    """
+    results = load_election_results(files["pattern"], files["cache_path"])
+    assert list(results) == [2019, 2021]
+    assert results[2019]["Ontario"] == {"LIB": 0.4, "CON": 0.6, "BQ": 0.0}
+    assert results[2021]["Quebec"]["BQ"] == pytest.approx(0.4)
+    assert len(parsed) == 2
+
+
+def test_unchanged_files_come_from_the_cache(files, parsed) -> None:
+    """
+    A second load parses nothing and returns the same results.
+    """
+    first = load_election_results(files["pattern"], files["cache_path"])
+    del parsed[:]
+    assert load_election_results(files["pattern"], files["cache_path"]) == first
+    assert parsed == []
+
+
+def test_touched_file_with_same_content_is_not_parsed(files, parsed) -> None:
+    """
+    A new modification time alone only rehashes the file; it is not parsed again.
+    """
+    load_election_results(files["pattern"], files["cache_path"])
+    del parsed[:]
+    path = files["dir"] / "2019.csv"
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10 ** 9))
+    load_election_results(files["pattern"], files["cache_path"])
+    assert parsed == []
+
+
+def test_changed_file_is_parsed_again(files, parsed) -> None:
+    """
+    Changing a CSV's content parses that file again, and only that file.
+    """
+    load_election_results(files["pattern"], files["cache_path"])
+    del parsed[:]
+    (files["dir"] / "2021.csv").write_text(RESULTS_2021.replace("LIB,50", "LIB,70"))
+    results = load_election_results(files["pattern"], files["cache_path"])
+    assert results[2021]["Ontario"]["LIB"] == pytest.approx(70 / 120)
+    assert parsed == [pytest.approx(70 / 120)]
+
+
+def test_stale_or_corrupt_cache_is_ignored(files, parsed) -> None:
+    """
+    A cache of another format version, or one that cannot be read, is rebuilt from the CSVs.
+    """
+    first = load_election_results(files["pattern"], files["cache_path"])
+    with open(files["cache_path"], "rb") as f:
+        cache = pickle.load(f)
+    cache["version"] = -1
+    with open(files["cache_path"], "wb") as f:
+        pickle.dump(cache, f)
+    del parsed[:]
+    assert load_election_results(files["pattern"], files["cache_path"]) == first
+    assert len(parsed) == 2
+
+    with open(files["cache_path"], "wb") as f:
+        f.write(b"not a pickle")
+    del parsed[:]
+    assert load_election_results(files["pattern"], files["cache_path"]) == first
+    assert len(parsed) == 2
+
+
+def test_removed_file_is_dropped(files, parsed) -> None:
+    """
+    A CSV that no longer exists is dropped from the results and from the cache.
+    """
+    load_election_results(files["pattern"], files["cache_path"])
+    (files["dir"] / "2019.csv").unlink()
+    assert list(load_election_results(files["pattern"], files["cache_path"])) == [2021]
+    with open(files["cache_path"], "rb") as f:
+        assert len(pickle.load(f)["entries"]) == 1
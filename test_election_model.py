@@ -0,0 +1,189 @@
+"""
+Canadian Election Simulator - Election Model Tests
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+Equality checks between the simulation entry points on fixed synthetic polls. Every entry point draws
+trial t of a province from the same random stream, so they must agree exactly for the same seed.
+Run with python -m pytest.
+"""
+
+import itertools
+import networkx as nx
+import numpy as np
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from election_model import run_simulation, simulate_trial_range, iter_simulation, win_statistics
+from exact_model import exact_seat_distribution
+from incremental_simulation import IncrementalSimulator
+from ridings import load_riding_table
+from simulation_results import SeatDistribution, OutcomeStatistics
+
+POLLS = {
+    "British Columbia": {"LIB": 0.40, "CON": 0.38, "NDP": 0.14, "GRN": 0.04, "BQ": 0.0, "PPC": 0.02, "OTH": 0.02},
+    "Alberta": {"LIB": 0.28, "CON": 0.60, "NDP": 0.08, "GRN": 0.01, "BQ": 0.0, "PPC": 0.02, "OTH": 0.01},
+    "Sask. & Man.": {"LIB": 0.35, "CON": 0.50, "NDP": 0.11, "GRN": 0.01, "BQ": 0.0, "PPC": 0.02, "OTH": 0.01},
+    "Ontario": {"LIB": 0.45, "CON": 0.40, "NDP": 0.09, "GRN": 0.03, "BQ": 0.0, "PPC": 0.02, "OTH": 0.01},
+    "Quebec": {"LIB": 0.42, "CON": 0.20, "NDP": 0.06, "GRN": 0.02, "BQ": 0.28, "PPC": 0.01, "OTH": 0.01},
+    "Atlantic Canada": {"LIB": 0.55, "CON": 0.35, "NDP": 0.06, "GRN": 0.02, "BQ": 0.0, "PPC": 0.01, "OTH": 0.01},
+}
+
+SEED = 7
+TRIALS = 2500
+
+
+def synthetic_graph() -> nx.DiGraph:
+    """
+    Return a voter transition graph with a small flow between every pair of the main parties.
+    """
+    graph = nx.DiGraph()
+    for i, (u, v) in enumerate(itertools.permutations(["LIB", "CON", "NDP", "GRN", "BQ"], 2)):
+        graph.add_edge(u, v, weight=0.01 * (1 + i % 4))
+    return graph
+
+
+def without_errors(win_stats: dict) -> dict:
+    """
+    Drop the standard errors, which only run_simulation and IncrementalSimulator report.
+    """
+    return {party: {k: v for k, v in stats.items() if not k.endswith("_se")} for party, stats in win_stats.items()}
+
+
+@pytest.fixture(scope="module")
+def reference():
+    """
+    The vectorized run that the other entry points are compared with.
+    """
+    return run_simulation(POLLS, TRIALS, synthetic_graph(), engine="vectorized", seed=SEED)
+
+
+def test_workers_do_not_change_results(reference) -> None:
+    """
+    Spreading the blocks over worker processes gives the same seat counts and win statistics.
+    """
+    seats, win_stats = run_simulation(POLLS, TRIALS, synthetic_graph(), engine="vectorized", seed=SEED, workers=2)
+    assert seats == reference[0]
+    assert win_stats == reference[1]
+
+
+@settings(max_examples=10, deadline=None)
+@given(first_trial=st.integers(0, TRIALS - 1), size=st.integers(1, 300))
+def test_trial_range_matches_run(reference, first_trial: int, size: int) -> None:
+    """
+    Any range of trials regenerates the same rows of the full run.
+    """
+    size = min(size, TRIALS - first_trial)
+    regenerated = simulate_trial_range(POLLS, SEED, first_trial, size, synthetic_graph())
+    assert np.array_equal(regenerated.seat_counts, reference[0].seat_counts[first_trial:first_trial + size])
+
+
+@pytest.mark.parametrize("batch_size", [300, 1000])
+def test_iter_simulation_matches_run(reference, batch_size: int) -> None:
+    """
+    The running summaries end at the win statistics and mean seats of the full run, whatever the batch size.
+    """
+    summaries = list(iter_simulation(POLLS, synthetic_graph(), max_trials=TRIALS, batch_size=batch_size, seed=SEED))
+    assert summaries[-1]["trials"] == TRIALS
+    assert summaries[-1]["win_stats"] == without_errors(reference[1])
+    assert summaries[-1]["seat_means"] == pytest.approx(reference[0].means())
+
+
+def test_tree_engine_iter_matches_run() -> None:
+    """
+    The tree engine also draws the same trials in run_simulation and iter_simulation.
+    """
+    _, win_stats = run_simulation(POLLS, 200, synthetic_graph(), engine="tree", seed=SEED)
+    summaries = list(iter_simulation(POLLS, synthetic_graph(), max_trials=200, batch_size=70, engine="tree",
+                                     seed=SEED))
+    assert summaries[-1]["win_stats"] == without_errors(win_stats)
+
+
+def test_incremental_matches_run(reference) -> None:
+    """
+    The incremental simulator matches run_simulation, both from scratch and after one province moves.
+    """
+    simulator = IncrementalSimulator(synthetic_graph(), seed=SEED)
+    seats, win_stats = simulator.run(POLLS, TRIALS)
+    assert seats == reference[0]
+    assert win_stats == reference[1]
+
+    moved = {province: dict(poll) for province, poll in POLLS.items()}
+    moved["Ontario"]["LIB"] -= 0.02
+    moved["Ontario"]["CON"] += 0.02
+    seats, win_stats = simulator.run(moved, TRIALS)
+    assert simulator.last_resimulated == ["Ontario"]
+    expected = run_simulation(moved, TRIALS, synthetic_graph(), engine="vectorized", seed=SEED)
+    assert seats == expected[0]
+    assert win_stats == expected[1]
+
+
+def test_fallback_riding_table_matches_province_model(reference, tmp_path) -> None:
+    """
+    Without a riding CSV every riding of a region is its region's poll, so the riding model is the province model.
+    """
+    ridings = load_riding_table(str(tmp_path / "missing.csv"))
+    seats, win_stats = run_simulation(POLLS, TRIALS, synthetic_graph(), engine="vectorized", seed=SEED,
+                                      ridings=ridings)
+    assert seats == reference[0]
+    assert win_stats == reference[1]
+
+
+def test_iter_simulation_passes_options(tmp_path) -> None:
+    """
+    iter_simulation simulates with the margin, ridings and swing it is given, as run_simulation does.
+    """
+    ridings = load_riding_table(str(tmp_path / "missing.csv"))
+    options = {"margin": 0.05, "ridings": ridings, "swing": "proportional"}
+    seats, win_stats = run_simulation(POLLS, 1000, synthetic_graph(), engine="vectorized", seed=SEED, **options)
+    summaries = list(iter_simulation(POLLS, synthetic_graph(), max_trials=1000, batch_size=400, seed=SEED, **options))
+    assert summaries[-1]["win_stats"] == without_errors(win_stats)
+    assert summaries[-1]["seat_means"] == pytest.approx(seats.means())
+
+
+def test_exact_engine_matches_monte_carlo(reference) -> None:
+    """
+    The exact engine's probabilities lie within the Monte Carlo run's sampling error.
+    """
+    _, exact = exact_seat_distribution(POLLS, synthetic_graph())
+    for party, stats in reference[1].items():
+        for stat in ("majority", "minority", "no_win"):
+            # Four standard errors, plus slack for the exact engine's own estimate of the per-seat probabilities
+            assert abs(exact[party][stat] - stats[stat]) <= 4 * stats[f"{stat}_se"] + 0.01, (party, stat)
+
+
+def test_random_sampling_errors_are_binomial(reference) -> None:
+    """
+    With independent trials the standard error of a probability p over N trials is sqrt(p (1 - p) / (N - 1)).
+    """
+    for stats in reference[1].values():
+        for stat in ("majority", "minority", "no_win"):
+            p = stats[stat]
+            assert stats[f"{stat}_se"] == pytest.approx((p * (1 - p) / (TRIALS - 1)) ** 0.5, abs=1e-12)
+
+
+def test_antithetic_errors_use_pair_means() -> None:
+    """
+    Antithetic pairs are the independent units, so perfectly anticorrelated pairs have no error while
+    identical pairs have the error of half as many independent trials.
+    """
+    win, lose = [200, 143], [143, 200]
+    for seat_counts, expected in (([win, lose] * 50, 0.0), ([win, win, lose, lose] * 25, (0.25 / 49) ** 0.5)):
+        distribution = SeatDistribution(["A", "B"], np.array(seat_counts))
+        distribution.outcomes = OutcomeStatistics.from_seat_counts(["A", "B"], distribution.seat_counts)
+        win_stats = win_statistics(distribution, "antithetic", [100])
+        assert win_stats["A"]["majority"] == 0.5
+        assert win_stats["A"]["majority_se"] == pytest.approx(expected, abs=1e-12)
+
+
+@pytest.mark.parametrize("sampling", ["antithetic", "lhs", "sobol"])
+def test_variance_reduction_agrees_within_errors(reference, sampling: str) -> None:
+    """
+    Every sampling method estimates the same probabilities, within their combined standard errors.
+    """
+    _, win_stats = run_simulation(POLLS, TRIALS, synthetic_graph(), engine="vectorized", seed=SEED + 1,
+                                  sampling=sampling)
+    for party, stats in win_stats.items():
+        for stat in ("majority", "minority", "no_win"):
+            error = (stats[f"{stat}_se"] ** 2 + reference[1][party][f"{stat}_se"] ** 2) ** 0.5
+            assert np.isfinite(stats[f"{stat}_se"])
+            assert abs(stats[stat] - reference[1][party][stat]) <= 4 * error + 1e-9, (party, stat)
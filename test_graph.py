@@ -0,0 +1,110 @@
+"""
+Canadian Election Simulator - Voter Transition Graph Tests
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+Checks the matrix form of the voter transition adjustment against the original adjustment, which walked the
+graph's edges one party at a time. Run with python -m pytest.
+"""
+
+from typing import Dict
+import networkx as nx
+import numpy as np
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from graph import VoterTransitionMatrix
+from election_model import adjust_polling_graph
+
+PARTIES = ["LIB", "CON", "NDP", "GRN", "BQ", "PPC", "OTH", "IND"]
+
+
+def graph_walk_adjust(original_polling: Dict[str, float], graph: nx.DiGraph,
+                      influence_factor: float = 0.2) -> Dict[str, float]:
+    """
+    The adjustment as it was before VoterTransitionMatrix, one graph walk per party.
+    """
+    adjusted_polling = original_polling.copy()
+    for p in original_polling:
+        if p == "OTH" or p not in graph.nodes:
+            continue
+        incoming_influence = 0.0
+        for neighbor in graph.predecessors(p):
+            if neighbor in original_polling and graph[neighbor][p]['weight'] > 0:
+                incoming_influence += original_polling[neighbor] * graph[neighbor][p]['weight']
+        adjusted_polling[p] += influence_factor * incoming_influence
+    total = sum(adjusted_polling.values())
+    for p in adjusted_polling:
+        adjusted_polling[p] /= total
+    return adjusted_polling
+
+
+@st.composite
+def graphs(draw: st.DrawFn) -> nx.DiGraph:
+    """
+    Voter transition graphs over some of PARTIES, with negative weights and isolated nodes among them.
+    """
+    graph = nx.DiGraph()
+    graph.add_nodes_from(draw(st.lists(st.sampled_from(PARTIES), unique=True)))
+    for u, v in draw(st.lists(st.tuples(st.sampled_from(PARTIES), st.sampled_from(PARTIES)), max_size=20)):
+        if u != v:
+            graph.add_edge(u, v, weight=draw(st.floats(-0.2, 0.5)))
+    return graph
+
+
+polls = st.dictionaries(st.sampled_from(PARTIES), st.floats(0.01, 0.6), min_size=1)
+
+
+@settings(max_examples=100, deadline=None)
+@given(graph=graphs(), polling=polls, influence_factor=st.floats(0.0, 1.0))
+def test_matrix_adjust_matches_graph_walk(graph: nx.DiGraph, polling: Dict[str, float],
+                                          influence_factor: float) -> None:
+    """
+    VoterTransitionMatrix.adjust gives the graph walk's adjusted poll, for any graph and poll.
+    """
+    matrix = VoterTransitionMatrix.from_graph(graph, PARTIES)
+    present = np.array([p in polling for p in matrix.parties])
+    adjusted = matrix.adjust(matrix.poll_vector(polling), present, influence_factor)
+    expected = graph_walk_adjust(polling, graph, influence_factor)
+    assert {p: adjusted[matrix.index[p]] for p in polling} == pytest.approx(expected)
+    assert adjusted[~present] == pytest.approx(0.0)
+
+
+@settings(max_examples=100, deadline=None)
+@given(graph=graphs(), polling=polls, influence_factor=st.floats(0.0, 1.0))
+def test_adjust_polling_graph_matches_graph_walk(graph: nx.DiGraph, polling: Dict[str, float],
+                                                 influence_factor: float) -> None:
+    """
+    adjust_polling_graph also matches the graph walk, including for parties outside the default party index.
+    """
+    assert adjust_polling_graph(polling, graph, influence_factor) == pytest.approx(
+        graph_walk_adjust(polling, graph, influence_factor))
+
+
+def test_adjust_many_polls_at_once() -> None:
+    """
+    Adjusting a matrix of polls adjusts every row as if it were adjusted on its own.
+    """
+    graph = nx.DiGraph()
+    graph.add_edge("NDP", "LIB", weight=0.3)
+    graph.add_edge("LIB", "CON", weight=0.1)
+    matrix = VoterTransitionMatrix.from_graph(graph)
+    rows = [{"LIB": 0.4, "CON": 0.35, "NDP": 0.25}, {"LIB": 0.3, "NDP": 0.2, "BQ": 0.5}]
+    vectors = np.array([matrix.poll_vector(row) for row in rows])
+    present = np.array([[p in row for p in matrix.parties] for row in rows])
+    adjusted = matrix.adjust(vectors, present)
+    for row, vector, mask in zip(adjusted, vectors, present):
+        assert row == pytest.approx(matrix.adjust(vector, mask))
+
+
+def test_matrix_round_trips_to_graph() -> None:
+    """
+    Converting a graph to a matrix and back keeps its nodes and edge weights.
+    """
+    graph = nx.DiGraph()
+    graph.add_node("GRN")
+    graph.add_edge("NDP", "LIB", weight=0.3)
+    graph.add_edge("LIB", "CON", weight=-0.1)
+    round_trip = VoterTransitionMatrix.from_graph(graph).to_graph()
+    assert set(round_trip.nodes) == set(graph.nodes)
+    assert {(u, v): d["weight"] for u, v, d in round_trip.edges(data=True)} == \
+        {(u, v): d["weight"] for u, v, d in graph.edges(data=True)}
@@ -0,0 +1,94 @@
+"""
+Canadian Election Simulator - Parameter Sweep Tests
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+Tests of the batched parameter sweep. Every grid point draws trial t from the same random streams as
+run_simulation, so a grid point must agree exactly with a run of the same margin and influence factor.
+Run with python -m pytest.
+"""
+
+import pytest
+
+from election_model import run_simulation
+from parameter_sweep import run_parameter_sweep, SWEEP_COLUMNS
+from ridings import load_riding_table
+from test_election_model import POLLS, SEED, synthetic_graph
+
+MARGINS = [0.03, 0.05]
+INFLUENCE_FACTORS = [0.2, 0.4]
+TRIALS = [500, 1500]
+
+
+@pytest.fixture(scope="module")
+def sweep():
+    """
+    A sweep over two margins, two influence factors and two trial counts.
+    """
+    return run_parameter_sweep(POLLS, MARGINS, INFLUENCE_FACTORS, TRIALS, synthetic_graph(), seed=SEED)
+
+
+def test_table_covers_the_grid(sweep) -> None:
+    """
+    The table has one row per margin, influence factor, trial count and party.
+    """
+    assert list(sweep.columns) == SWEEP_COLUMNS
+    assert len(sweep) == len(MARGINS) * len(INFLUENCE_FACTORS) * len(TRIALS) * len(POLLS["Ontario"])
+    rows = sweep[sweep["party"] == "LIB"]
+    assert sorted(set(zip(rows["margin"], rows["influence_factor"], rows["trials"]))) == sorted(
+        (m, f, t) for m in MARGINS for f in INFLUENCE_FACTORS for t in TRIALS)
+    assert (sweep["majority"] + sweep["minority"] + sweep["no_win"]).to_numpy() == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("margin", MARGINS)
+@pytest.mark.parametrize("trials", TRIALS)
+def test_grid_point_matches_run(sweep, margin: float, trials: int) -> None:
+    """
+    A grid point at run_simulation's influence factor gives the same probabilities and mean seats as
+    run_simulation with the same margin, whichever trial count it is summarized at.
+    """
+    seats, win_stats = run_simulation(POLLS, trials, synthetic_graph(), engine="vectorized", seed=SEED,
+                                      margin=margin)
+    rows = sweep[(sweep["margin"] == margin) & (sweep["influence_factor"] == 0.2) & (sweep["trials"] == trials)]
+    means = seats.means()
+    for row in rows.itertuples():
+        assert row.majority == win_stats[row.party]["majority"]
+        assert row.minority == win_stats[row.party]["minority"]
+        assert row.mean_seats == pytest.approx(means[row.party])
+
+
+def test_workers_do_not_change_results(sweep) -> None:
+    """
+    Spreading the grid over worker processes gives the same table.
+    """
+    parallel = run_parameter_sweep(POLLS, MARGINS, INFLUENCE_FACTORS, TRIALS, synthetic_graph(), workers=2,
+                                   seed=SEED)
+    assert parallel.equals(sweep)
+
+
+def test_fallback_ridings_match_province_model(sweep, tmp_path) -> None:
+    """
+    The fallback riding table, whose ridings are their region's poll, gives the province-level table.
+    """
+    ridings = load_riding_table(str(tmp_path / "missing.csv"))
+    with_ridings = run_parameter_sweep(POLLS, MARGINS, INFLUENCE_FACTORS, TRIALS, synthetic_graph(), seed=SEED,
+                                       ridings=ridings)
+    assert with_ridings.equals(sweep)
+
+
+def test_progress_reaches_the_largest_trial_count() -> None:
+    """
+    Progress is reported after every block and ends at the largest trial count.
+    """
+    reports = []
+    run_parameter_sweep(POLLS, [0.03], [0.2], [500, 2500], seed=SEED,
+                        progress=lambda done, total: reports.append((done, total)))
+    assert reports == [(1000, 2500), (2000, 2500), (2500, 2500)]
+
+
+@pytest.mark.parametrize("margins, factors, trials", [([], [0.2], 100), ([0.03], [], 100), ([0.03], [0.2], 0)])
+def test_empty_grid_is_rejected(margins: list, factors: list, trials: int) -> None:
+    """
+    A sweep without margins, influence factors or a positive trial count raises ValueError.
+    """
+    with pytest.raises(ValueError):
+        run_parameter_sweep(POLLS, margins, factors, trials)
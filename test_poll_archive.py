@@ -0,0 +1,94 @@
+"""
+Canadian Election Simulator - Poll Archive Tests
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+Tests of the SQLite poll archive on a temporary file. Run with python -m pytest.
+"""
+
+import sqlite3
+import pytest
+
+import poll_archive
+from poll_archive import PollArchive
+
+FIRST = {"Ontario": {"LIB": 0.45, "CON": 0.40}, "Quebec": {"LIB": 0.40, "BQ": 0.30}}
+SECOND = {"Ontario": {"LIB": 0.42, "CON": 0.43}, "Quebec": {"LIB": 0.38, "BQ": 0.33}}
+
+
+@pytest.fixture
+def archive(tmp_path) -> PollArchive:
+    """
+    An empty archive in a temporary directory.
+    """
+    return PollArchive(str(tmp_path / "polls.db"))
+
+
+def test_empty_archive(archive) -> None:
+    """
+    An empty archive has no latest snapshot, timestamps or range.
+    """
+    assert archive.latest() is None
+    assert archive.timestamps() == []
+    assert archive.range() == []
+
+
+def test_snapshots_round_trip(archive) -> None:
+    """
+    Snapshots come back as they were stored, the latest one by itself and all of them oldest first.
+    """
+    archive.append(SECOND, timestamp=200.0)
+    archive.append(FIRST, timestamp=100.0)
+    assert archive.latest() == (200.0, SECOND)
+    assert archive.timestamps() == [100.0, 200.0]
+    assert archive.range() == [(100.0, FIRST), (200.0, SECOND)]
+
+
+def test_range_bounds_are_inclusive(archive) -> None:
+    """
+    A range includes the snapshots taken exactly at its start and end.
+    """
+    for timestamp in (100.0, 200.0, 300.0):
+        archive.append(FIRST, timestamp=timestamp)
+    assert [ts for ts, _ in archive.range(100.0, 200.0)] == [100.0, 200.0]
+    assert [ts for ts, _ in archive.range(start=150.0)] == [200.0, 300.0]
+    assert [ts for ts, _ in archive.range(end=150.0)] == [100.0]
+
+
+def test_same_timestamp_replaces_shares(archive) -> None:
+    """
+    Storing a snapshot again under the same timestamp overwrites its shares.
+    """
+    archive.append(FIRST, timestamp=100.0)
+    archive.append(SECOND, timestamp=100.0)
+    assert archive.range() == [(100.0, SECOND)]
+
+
+def test_archive_is_shared_by_path(archive) -> None:
+    """
+    A second archive on the same file sees the snapshots of the first.
+    """
+    archive.append(FIRST, timestamp=100.0)
+    assert PollArchive(archive.path).latest() == (100.0, FIRST)
+
+
+def test_every_connection_is_closed(archive, monkeypatch) -> None:
+    """
+    Every operation closes the connection it opens.
+    """
+    opened = []
+    original_connect = sqlite3.connect
+
+    def connect(*args, **kwargs) -> sqlite3.Connection:
+        opened.append(original_connect(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(poll_archive.sqlite3, "connect", connect)
+    PollArchive(archive.path)
+    archive.append(FIRST, timestamp=100.0)
+    archive.latest()
+    archive.range()
+    archive.timestamps()
+    assert len(opened) == 5
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
@@ -0,0 +1,98 @@
+"""
+Canadian Election Simulator - Poll Store Tests
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+Tests of the poll store and the retry backoff of the background refresher. The refresher's loop is run on
+the test thread with its waits recorded instead of slept. Run with python -m pytest.
+"""
+
+from typing import List, Optional
+
+from poll_store import PollStore, PollRefresher, PollSnapshot
+
+POLLS = {"Ontario": {"LIB": 0.45, "CON": 0.40}}
+
+
+def run_refresher(outcomes: List[Optional[PollSnapshot]], store: Optional[PollStore] = None,
+                  interval: float = 10.0, retry_delay: float = 1.0) -> List[float]:
+    """
+    Run a refresher whose scrapes return outcomes in turn, with None for a failure and an exception to
+    raise it, and return the delay it waited after each scrape.
+    """
+    store = PollStore() if store is None else store
+    scrapes = iter(outcomes)
+
+    def fetch() -> Optional[PollSnapshot]:
+        outcome = next(scrapes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    refresher = PollRefresher(store, fetch, interval, retry_delay)
+    delays = []
+
+    def wait(timeout: float) -> bool:
+        delays.append(timeout)
+        if len(delays) == len(outcomes):
+            refresher.stop()
+        return refresher._stopped.is_set()
+
+    refresher._stopped.wait = wait
+    refresher.run()
+    return delays
+
+
+def test_successful_scrapes_wait_the_interval() -> None:
+    """
+    After a successful scrape the refresher waits the regular interval.
+    """
+    assert run_refresher([POLLS, POLLS]) == [10.0, 10.0]
+
+
+def test_failures_back_off_up_to_the_interval() -> None:
+    """
+    Consecutive failures double the retry delay until it reaches the interval.
+    """
+    assert run_refresher([None] * 6) == [1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+
+
+def test_success_resets_the_backoff() -> None:
+    """
+    A successful scrape resets the retry delay of the next failure.
+    """
+    assert run_refresher([None, None, POLLS, None]) == [1.0, 2.0, 10.0, 1.0]
+
+
+def test_exceptions_count_as_failures() -> None:
+    """
+    A scraper that raises backs off like one that returns nothing, and the refresher keeps running.
+    """
+    store = PollStore()
+    assert run_refresher([RuntimeError("timed out"), {}, POLLS], store) == [1.0, 2.0, 10.0]
+    assert store.failures == 0
+    assert store.latest()[0] == POLLS
+
+
+def test_failures_keep_the_last_good_snapshot() -> None:
+    """
+    After failed refreshes the store still serves its last good snapshot and reports the failures.
+    """
+    store = PollStore()
+    run_refresher([POLLS, None, RuntimeError("timed out")], store)
+    assert store.latest()[0] == POLLS
+    assert store.failures == 2
+    assert store.last_error == "timed out"
+    assert "2 failed refreshes" in store.describe()
+    assert store.last_refresh is not None
+
+
+def test_wait_returns_once_published() -> None:
+    """
+    wait times out on an empty store and returns at once after a publish.
+    """
+    store = PollStore()
+    assert not store.wait(timeout=0.01)
+    assert store.age() is None
+    store.publish(POLLS, timestamp=100.0)
+    assert store.wait(timeout=0.01)
+    assert store.latest() == (POLLS, 100.0)
@@ -0,0 +1,72 @@
+"""
+Canadian Election Simulator - Result Cache Tests
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+Tests of the LRU simulation cache and its keys. Run with python -m pytest.
+"""
+
+import networkx as nx
+
+from result_cache import SimulationCache, simulation_key
+
+POLLS = {"Ontario": {"LIB": 0.45, "CON": 0.40}, "Quebec": {"LIB": 0.40, "BQ": 0.30}}
+
+
+def test_hits_and_misses_are_counted() -> None:
+    """
+    The first lookup of a key computes it and counts a miss; later lookups count hits without computing.
+    """
+    cache = SimulationCache()
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute("a", lambda: calls.append("a") or 1) == 1
+    assert calls == ["a"]
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 1, 0)
+    assert cache.hit_rate() == 2 / 3
+
+
+def test_get_and_contains() -> None:
+    """
+    get counts a lookup and returns None for a missing key, while "in" does not count anything.
+    """
+    cache = SimulationCache()
+    assert cache.get("a") is None
+    cache.get_or_compute("a", lambda: 1)
+    assert "a" in cache and "b" not in cache
+    assert cache.get("a") == 1
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_is_evicted() -> None:
+    """
+    When full, the cache drops the result looked up least recently, not the one stored first.
+    """
+    cache = SimulationCache(max_entries=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get("a")
+    cache.get_or_compute("c", lambda: 3)
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert "1 evictions" in cache.describe()
+
+
+def test_keys_change_with_every_input() -> None:
+    """
+    Keys are equal for equal inputs and differ when the polls, graph or any extra parameter change.
+    """
+    graph = nx.DiGraph()
+    graph.add_edge("LIB", "CON", weight=0.1)
+    other_graph = nx.DiGraph()
+    other_graph.add_edge("LIB", "CON", weight=0.2)
+    moved = {province: dict(poll) for province, poll in POLLS.items()}
+    moved["Ontario"]["LIB"] += 0.01
+
+    key = simulation_key(POLLS, 1000, 0.03, graph, "vectorized")
+    assert key == simulation_key({province: dict(poll) for province, poll in POLLS.items()}, 1000, 0.03, graph,
+                                 "vectorized")
+    assert key != simulation_key(moved, 1000, 0.03, graph, "vectorized")
+    assert key != simulation_key(POLLS, 1000, 0.03, other_graph, "vectorized")
+    assert key != simulation_key(POLLS, 1000, 0.03, graph, "tree")
+    assert key != simulation_key(POLLS, 1000, 0.03, graph, "vectorized", 7)
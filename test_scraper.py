@@ -0,0 +1,102 @@
+"""
+Canadian Election Simulator - Scraper Tests
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+Tests of the poll tracker scraper against the offline fixture. Run with python -m pytest.
+"""
+
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+import pytest
+
+from config import SEATS_BY_PROVINCE
+from scraper import (FIXTURE_PATH, PARTIES, CONTAINER_SELECTOR, HEADING_SELECTOR, CHART_SELECTOR,
+                     ScraperSession, parse_province_entry)
+
+
+class FixtureParser(HTMLParser):
+    """
+    Collects the heading and chart aria-label of every province container, as the scraper's script does.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.entries: List[List[Optional[str]]] = []
+        self._in_heading = False
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        classes = (dict(attrs).get("class") or "").split()
+        if CONTAINER_SELECTOR[1:] in classes:
+            self.entries.append([None, None])
+        elif self.entries and HEADING_SELECTOR[1:] in classes:
+            self._in_heading = True
+            self.entries[-1][0] = ""
+        elif self.entries and CHART_SELECTOR[1:] in classes:
+            self.entries[-1][1] = dict(attrs).get("aria-label")
+
+    def handle_endtag(self, tag: str) -> None:
+        self._in_heading = False
+
+    def handle_data(self, data: str) -> None:
+        if self._in_heading:
+            self.entries[-1][0] += data
+
+
+def fixture_entries() -> List[List[Optional[str]]]:
+    """
+    Return the (heading, aria-label) pair of every province container of the fixture.
+    """
+    parser = FixtureParser()
+    parser.feed(FIXTURE_PATH.read_text(encoding="utf-8"))
+    return parser.entries
+
+
+def expected_polls() -> Dict[str, Dict[str, float]]:
+    """
+    Return the polling data of the fixture, parsed the way ScraperSession.scrape parses a page.
+    """
+    return dict(parse_province_entry(heading, aria_label) for heading, aria_label in fixture_entries())
+
+
+def test_fixture_has_every_polling_region() -> None:
+    """
+    The fixture has one complete container per polling region.
+    """
+    entries = fixture_entries()
+    assert all(heading and aria_label for heading, aria_label in entries)
+    assert sorted(expected_polls()) == sorted(SEATS_BY_PROVINCE)
+
+
+def test_fixture_polls_parse() -> None:
+    """
+    Every region of the fixture parses into shares of every party that add up to 1.
+    """
+    polls = expected_polls()
+    for poll in polls.values():
+        assert set(PARTIES) <= set(poll)
+        assert sum(poll.values()) == pytest.approx(1.0)
+    assert polls["Quebec"]["BQ"] == pytest.approx(0.28)
+    assert polls["Ontario"]["BQ"] == 0.0
+
+
+def test_incomplete_entries_are_skipped() -> None:
+    """
+    A container without a heading or chart gives no polling data.
+    """
+    assert parse_province_entry(None, "LIB: 40.0%") is None
+    assert parse_province_entry("Ontario", None) is None
+
+
+def test_browser_scrapes_fixture() -> None:
+    """
+    A real browser scraping the fixture finds the same polls. Skipped where Chrome is unavailable.
+    """
+    from selenium.common.exceptions import WebDriverException
+
+    session = ScraperSession(timeout=5.0)
+    try:
+        session._get_driver()
+    except WebDriverException as e:
+        pytest.skip(f"Chrome is unavailable: {e.msg}")
+    with session:
+        assert session.scrape(FIXTURE_PATH.as_uri()) == expected_polls()
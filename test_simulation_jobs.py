@@ -0,0 +1,173 @@
+"""
+Canadian Election Simulator - Simulation Job Tests
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+Tests of the background job queue: sharing jobs for identical inputs, releasing and cancelling them,
+and serving finished results from the cache. Run with python -m pytest.
+"""
+
+import threading
+import time
+from typing import Any, Callable, List
+import pytest
+
+from result_cache import SimulationCache
+from simulation_jobs import SimulationJob, SimulationJobQueue, ProgressFn
+
+TIMEOUT = 5.0
+
+
+@pytest.fixture
+def queue() -> SimulationJobQueue:
+    """
+    A queue with one worker thread, shut down after the test.
+    """
+    jobs = SimulationJobQueue(SimulationCache(), workers=1)
+    yield jobs
+    jobs.shutdown()
+
+
+def blocking_compute(started: threading.Event, proceed: threading.Event, calls: List[int],
+                     result: Any = "result") -> Callable[[ProgressFn], Any]:
+    """
+    Return a computation that reports progress until proceed is set, then reports once more and returns result.
+    """
+    def compute(progress: ProgressFn) -> Any:
+        calls.append(1)
+        started.set()
+        while not proceed.wait(0.01):
+            progress(1, 10)
+        progress(10, 10)
+        return result
+
+    return compute
+
+
+def wait_until_finished(job: SimulationJob) -> None:
+    """
+    Wait for a job to leave the queued and running states.
+    """
+    deadline = time.monotonic() + TIMEOUT
+    while job.active:
+        assert time.monotonic() < deadline, "job did not finish"
+        time.sleep(0.01)
+
+
+def test_identical_submissions_share_a_job(queue) -> None:
+    """
+    Submitting a key that is already running joins its job, which computes once and finishes for both.
+    """
+    started, proceed, calls = threading.Event(), threading.Event(), []
+    first = queue.submit("key", blocking_compute(started, proceed, calls), 10)
+    assert started.wait(TIMEOUT)
+    second = queue.submit("key", blocking_compute(started, proceed, calls), 10)
+    assert second == first
+    assert queue.get(first).refs == 2
+
+    proceed.set()
+    job = queue.get(first)
+    wait_until_finished(job)
+    assert (job.status, job.result, job.fraction()) == ("done", "result", 1.0)
+    assert job.timing is not None
+    assert calls == [1]
+
+
+def test_finished_results_come_from_the_cache(queue) -> None:
+    """
+    Resubmitting a finished key starts a new job that is answered by the cache without computing again.
+    """
+    calls = []
+    first = queue.submit("key", lambda progress: calls.append(1) or "result", 1)
+    wait_until_finished(queue.get(first))
+    second = queue.submit("key", lambda progress: calls.append(1) or "other", 1)
+    assert second != first
+    wait_until_finished(queue.get(second))
+    assert queue.get(second).result == "result"
+    assert calls == [1]
+    assert queue.cache.hits == 1
+
+
+def test_release_cancels_only_when_nobody_waits(queue) -> None:
+    """
+    A shared job keeps running until every submitter has released it, then stops at its next progress report.
+    """
+    started, proceed, calls = threading.Event(), threading.Event(), []
+    job_id = queue.submit("key", blocking_compute(started, proceed, calls), 10)
+    queue.submit("key", blocking_compute(started, proceed, calls), 10)
+    assert started.wait(TIMEOUT)
+
+    queue.release(job_id)
+    time.sleep(0.05)
+    job = queue.get(job_id)
+    assert job.status == "running"
+
+    queue.release(job_id)
+    wait_until_finished(job)
+    assert job.status == "cancelled"
+    assert "key" not in queue.cache
+
+
+def test_cancelled_key_can_be_submitted_again(queue) -> None:
+    """
+    After its job is released, a key is computed by a fresh job instead of joining the cancelled one.
+    """
+    started, proceed, calls = threading.Event(), threading.Event(), []
+    cancelled = queue.submit("key", blocking_compute(started, proceed, calls), 10)
+    assert started.wait(TIMEOUT)
+    queue.release(cancelled)
+
+    proceed.set()
+    fresh = queue.submit("key", lambda progress: "fresh", 1)
+    assert fresh != cancelled
+    wait_until_finished(queue.get(fresh))
+    assert queue.get(cancelled).status == "cancelled"
+    assert queue.get(fresh).result == "fresh"
+
+
+def test_queued_job_released_before_it_runs(queue) -> None:
+    """
+    A job released while still queued behind another never runs its computation.
+    """
+    started, proceed, calls = threading.Event(), threading.Event(), []
+    running = queue.submit("running", blocking_compute(started, proceed, calls), 10)
+    assert started.wait(TIMEOUT)
+    queued_calls = []
+    queued = queue.submit("queued", lambda progress: queued_calls.append(1), 1)
+    assert queue.get(queued).status == "queued"
+    queue.release(queued)
+
+    proceed.set()
+    wait_until_finished(queue.get(running))
+    wait_until_finished(queue.get(queued))
+    assert queue.get(queued).status == "cancelled"
+    assert queued_calls == []
+
+
+def test_failures_are_reported(queue) -> None:
+    """
+    An exception in the computation fails the job with its message and caches nothing.
+    """
+    def compute(progress: ProgressFn) -> None:
+        raise ValueError("bad polls")
+
+    job_id = queue.submit("key", compute, 1)
+    job = queue.get(job_id)
+    wait_until_finished(job)
+    assert job.status == "failed"
+    assert job.describe() == "Simulation failed: bad polls"
+    assert "key" not in queue.cache
+
+
+def test_old_jobs_are_pruned() -> None:
+    """
+    Only the most recent finished jobs are kept, up to the history limit.
+    """
+    jobs = SimulationJobQueue(SimulationCache(), workers=1, history=2)
+    try:
+        ids = []
+        for i in range(4):
+            ids.append(jobs.submit(i, lambda progress: None, 1))
+            wait_until_finished(jobs.get(ids[-1]))
+        assert [jobs.get(job_id) is not None for job_id in ids] == [False, True, True, True]
+    finally:
+        jobs.shutdown()
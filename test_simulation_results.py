@@ -0,0 +1,131 @@
+"""
+Canadian Election Simulator - Simulation Results Tests
+Copyright (c) 2025 [Amin Behbudov, Fares Abdulmajeed Alabdulhadi, Tahmid Wasif Zaman, Dimural Murat]
+
+Checks the vectorized outcome counts against direct counts over every trial of random seat matrices.
+Run with python -m pytest.
+"""
+
+import itertools
+import numpy as np
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from config import MAJORITY_THRESHOLD
+from simulation_results import OutcomeStatistics, SeatDistribution, SEAT_DTYPE, _OUTCOME_CHUNK_TRIALS
+
+PARTIES = ["LIB", "CON", "NDP", "BQ", "GRN"]
+
+
+def random_seat_counts(seed: int, trials: int) -> np.ndarray:
+    """
+    Return trials random splits of 343 seats between PARTIES, with frequent ties and majorities.
+    """
+    rng = np.random.default_rng(seed)
+    shares = rng.dirichlet([4.0, 4.0, 1.0, 0.5, 0.2], size=trials)
+    return np.array([rng.multinomial(343, row) for row in shares])
+
+
+@settings(max_examples=20, deadline=None)
+@given(seed=st.integers(0, 2 ** 32 - 1), trials=st.integers(1, 300))
+def test_coalition_majorities_match_direct_count(seed: int, trials: int) -> None:
+    """
+    Every coalition's majority probability is the fraction of trials its seats reach the threshold.
+    """
+    seat_counts = random_seat_counts(seed, trials)
+    coalitions = OutcomeStatistics.from_seat_counts(PARTIES, seat_counts).coalition_majorities()
+    assert len(coalitions) == 2 ** len(PARTIES) - 1
+    for size in range(1, len(PARTIES) + 1):
+        for members in itertools.combinations(range(len(PARTIES)), size):
+            expected = np.mean(seat_counts[:, list(members)].sum(axis=1) >= MAJORITY_THRESHOLD)
+            assert coalitions[tuple(PARTIES[i] for i in members)] == expected
+
+
+def test_coalitions_limited_by_size() -> None:
+    """
+    max_parties keeps only the coalitions of at most that many parties.
+    """
+    outcomes = OutcomeStatistics.from_seat_counts(PARTIES, random_seat_counts(0, 100))
+    pairs = outcomes.coalition_majorities(max_parties=2)
+    assert len(pairs) == len(PARTIES) + len(PARTIES) * (len(PARTIES) - 1) // 2
+    assert all(pairs[c] == p for c, p in outcomes.coalition_majorities().items() if len(c) <= 2)
+
+
+@settings(max_examples=20, deadline=None)
+@given(seed=st.integers(0, 2 ** 32 - 1), trials=st.integers(1, 300))
+def test_seat_quantiles_match_inverted_cdf(seed: int, trials: int) -> None:
+    """
+    Seat quantiles from the histograms are the inverted empirical CDF of the seat counts.
+    """
+    seat_counts = random_seat_counts(seed, trials)
+    qs = [0.0, 0.05, 0.25, 0.5, 0.9, 1.0]
+    quantiles = OutcomeStatistics.from_seat_counts(PARTIES, seat_counts).seat_quantiles(qs)
+    expected = np.quantile(seat_counts, qs, axis=0, method="inverted_cdf")
+    for i, party in enumerate(PARTIES):
+        assert quantiles[party] == tuple(expected[:, i].astype(int).tolist())
+
+
+@settings(max_examples=20, deadline=None)
+@given(seed=st.integers(0, 2 ** 32 - 1), trials=st.integers(1, 300))
+def test_win_stats_match_direct_count(seed: int, trials: int) -> None:
+    """
+    Majority, minority, first and second place probabilities match a count of every trial.
+    """
+    seat_counts = random_seat_counts(seed, trials)
+    win_stats = OutcomeStatistics.from_seat_counts(PARTIES, seat_counts).win_stats()
+    for i, party in enumerate(PARTIES):
+        top = seat_counts.max(axis=1)
+        sole_top = (seat_counts[:, i] == top) & ((seat_counts == top[:, None]).sum(axis=1) == 1)
+        ahead = (seat_counts > seat_counts[:, [i]]).sum(axis=1)
+        seated = seat_counts[:, i] > 0
+        assert win_stats[party]["majority"] == np.mean(sole_top & (top >= MAJORITY_THRESHOLD))
+        assert win_stats[party]["minority"] == np.mean(sole_top & (top < MAJORITY_THRESHOLD))
+        assert win_stats[party]["first"] == np.mean(seated & (ahead == 0))
+        assert win_stats[party]["second"] == np.mean(seated & (ahead == 1))
+
+
+def test_merged_blocks_match_one_pass() -> None:
+    """
+    Merging the counts of separate blocks gives the counts of all their trials at once, across chunks.
+    """
+    seat_counts = random_seat_counts(1, 2 * _OUTCOME_CHUNK_TRIALS + 300)
+    whole = OutcomeStatistics.from_seat_counts(PARTIES, seat_counts)
+    merged = OutcomeStatistics(PARTIES)
+    for start in range(0, len(seat_counts), 1000):
+        merged.merge(OutcomeStatistics.from_seat_counts(PARTIES, seat_counts[start:start + 1000]))
+    assert merged.trials == whole.trials == len(seat_counts)
+    assert merged.win_stats() == whole.win_stats()
+    assert merged.coalition_majorities() == whole.coalition_majorities()
+    assert merged.seat_quantiles() == whole.seat_quantiles()
+
+
+def test_merging_other_parties_fails() -> None:
+    """
+    Counts of different parties cannot be merged.
+    """
+    with pytest.raises(ValueError):
+        OutcomeStatistics(PARTIES).merge(OutcomeStatistics(PARTIES[:2]))
+
+
+def test_too_many_parties_for_coalitions() -> None:
+    """
+    Beyond COALITION_MAX_PARTIES no coalitions are counted, but the other statistics still are.
+    """
+    parties = [f"P{i}" for i in range(13)]
+    seat_counts = np.zeros((4, len(parties)), dtype=int)
+    seat_counts[:, 0] = 200
+    seat_counts[:, 1] = 143
+    outcomes = OutcomeStatistics.from_seat_counts(parties, seat_counts)
+    assert outcomes.coalition_majorities() == {}
+    assert outcomes.win_stats()["P0"]["majority"] == 1.0
+
+
+def test_seat_distribution_is_compact() -> None:
+    """
+    A SeatDistribution stores its seat counts as SEAT_DTYPE and compares equal by content.
+    """
+    seat_counts = random_seat_counts(2, 50)
+    distribution = SeatDistribution(PARTIES, seat_counts)
+    assert distribution.seat_counts.dtype == SEAT_DTYPE
+    assert distribution == SeatDistribution(PARTIES, seat_counts.astype(np.int64))
+    assert distribution.means()["LIB"] == pytest.approx(seat_counts[:, 0].mean())
@@ -6,32 +6,44 @@ This module handles data visualization for the election simulator.
 """
 
 import json
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, Optional, Union
 import logging
-import pandas as pd
-import plotly.express as px
-from plotly.graph_objects import Figure
 from config import PARTY_COLORS
+from simulation_results import SeatDistribution
+from instrumentation import instrumented
+
+# Plotting libraries are imported on first use, so that importing the dashboard stays fast
+if TYPE_CHECKING:
+    from pandas import DataFrame
+    from plotly.graph_objects import Figure
 
 logging.basicConfig(level=logging.INFO)
 
 
-def make_bar_chart(seat_dist: Dict[str, list]) -> Figure:
+@instrumented()
+def make_bar_chart(seat_dist: Union[SeatDistribution, Dict[str, list]]) -> "Figure":
     """
     Create a bar chart of average seat distribution.
 
     Args:
-        seat_dist (Dict[str, list]): Dictionary of seat distributions by party.
+        seat_dist (Union[SeatDistribution, Dict[str, list]]): Seat distributions by party.
 
     Returns:
         Figure: Bar chart figure.
     """
-    avg = {p: sum(v) / len(v) for p, v in seat_dist.items()}
+    import pandas as pd
+    import plotly.express as px
+
+    if isinstance(seat_dist, SeatDistribution):
+        avg = seat_dist.means()
+    else:
+        avg = {p: sum(v) / len(v) for p, v in seat_dist.items()}
     df = pd.DataFrame({"Party": list(avg.keys()), "Seats": list(avg.values())})
     return px.bar(df, x="Party", y="Seats", color="Party", color_discrete_map=PARTY_COLORS)
 
 
-def make_choropleth(polling_data: Dict[str, Dict[str, float]]) -> Figure:
+@instrumented()
+def make_choropleth(polling_data: Dict[str, Dict[str, float]]) -> "Figure":
     """
     Create a choropleth map of polling leaders by province.
 
@@ -41,6 +53,9 @@ def make_choropleth(polling_data: Dict[str, Dict[str, float]]) -> Figure:
     Returns:
         Figure: Choropleth map figure.
     """
+    import pandas as pd
+    import plotly.express as px
+
     winners = {prov: max(polls, key=polls.get) for prov, polls in polling_data.items()}
     df = pd.DataFrame({"Province": list(winners.keys()), "Winner": list(winners.values())})
     try:
@@ -85,6 +100,32 @@ def make_choropleth(polling_data: Dict[str, Dict[str, float]]) -> Figure:
         )
 
 
+@instrumented()
+def make_sweep_heatmap(sweep_table: "DataFrame", party: str, trials: Optional[int] = None) -> "Figure":
+    """
+    Create a heatmap of a party's win probability over the grid of a parameter sweep.
+
+    Args:
+        sweep_table (DataFrame): Result of parameter_sweep.run_parameter_sweep
+        party (str): Party to show
+        trials (Optional[int]): Trial count to show, if the sweep has several. Defaults to the largest.
+
+    Returns:
+        Figure: Heatmap with the margin across and the influence factor down.
+    """
+    import plotly.express as px
+
+    if trials is None:
+        trials = sweep_table["trials"].max()
+    rows = sweep_table[(sweep_table["party"] == party) & (sweep_table["trials"] == trials)]
+    grid = (rows.assign(win=rows["majority"] + rows["minority"])
+            .pivot(index="influence_factor", columns="margin", values="win"))
+    fig = px.imshow(grid, zmin=0, zmax=1, origin="lower", aspect="auto", color_continuous_scale="Viridis",
+                    labels={"x": "Polling margin", "y": "Influence factor", "color": "Win probability"})
+    fig.update_layout(title=f"{party} win probability ({trials:,} trials per point)")
+    return fig
+
+
 if __name__ == "__main__":
     # Test visualization with sample data
     from scraper import scrape_polling_data